@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark: sequential story -> audio vs. the streaming story/TTS pipeline.
+
+Runs both paths against the local mock server, which streams the story at a
+fixed per-token delay and answers TTS after a delay proportional to the input
+length, and reports time-to-first-audio and total latency.
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.mock_openai_server import MockOpenAIServer
+
+VOCAB = [("rendez-vous", "Verabredung", ""), ("grenier", "Dachboden", ""), ("hausser", "zucken", ""),
+         ("précaution", "Vorsicht", ""), ("chêne", "Eiche", "")]
+
+
+def run_sequential(text_generator, audio_generator, audio_path: str) -> tuple:
+    start = time.perf_counter()
+    story = text_generator.generate_story(VOCAB, "French")
+    audio_generator.generate_audio(story, audio_path)
+    total = time.perf_counter() - start
+    # Playback can only start once the single audio file exists
+    return total, total, 1
+
+
+def run_pipelined(text_generator, audio_generator, audio_path: str) -> tuple:
+    from src.gentexter_mode.story_pipeline import StoryAudioPipeline
+
+    result = StoryAudioPipeline(text_generator, audio_generator).run(VOCAB, audio_path, "French")
+    if result.audio_error:
+        raise result.audio_error
+    return result.first_audio_seconds, result.total_seconds, len(result.chunks)
+
+
+def main(token_delay: float = 0.02, tts_delay: float = 0.002):
+    server = MockOpenAIServer(latency=0.3, token_delay=token_delay,
+                              tts_seconds_per_char=tts_delay).start_background()
+    os.environ["OPENAI_BASE_URL"] = server.base_url
+    os.environ["OPENAI_API_KEY"] = "mock-key"
+
+    from src.gentexter_mode.text_generator import TextGenerator
+    from src.gentexter_mode.audio_generator import AudioGenerator
+    from src.gentexter_mode.tts_cache import TTSCache
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        # A fresh cache: mock audio stays out of TTS_CACHE_DIR and every run synthesizes everything
+        text_generator = TextGenerator()
+        audio_generator = AudioGenerator(cache=TTSCache(os.path.join(out_dir, "tts")))
+        sequential = run_sequential(text_generator, audio_generator, os.path.join(out_dir, "sequential.mp3"))
+        # Let the TTS rate limiter refill so both runs start from the same state
+        time.sleep(5)
+        pipelined = run_pipelined(text_generator, audio_generator, os.path.join(out_dir, "pipelined.mp3"))
+
+    print(f"Mock: 300 ms latency, {token_delay * 1000:.0f} ms/token, {tts_delay * 1000:.1f} ms TTS/char")
+    print(f"{'':12} {'first audio':>12} {'total':>9} {'TTS calls':>10}")
+    for name, (first_audio, total, calls) in (("Sequential", sequential), ("Pipelined", pipelined)):
+        print(f"{name:12} {first_audio:11.2f}s {total:8.2f}s {calls:10}")
+    print(f"Time-to-first-audio reduction: {(1 - pipelined[0] / sequential[0]) * 100:.0f}%")
+    print(f"Total latency reduction: {(1 - pipelined[1] / sequential[1]) * 100:.0f}%")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main(*(float(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Benchmark: combined single-request word analysis vs. the two-request path.
+
+Runs GPTTranslator.analyze_word_comprehensive against the local mock server
+with a fresh cache for each mode and reports mean latency and request count.
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.mock_openai_server import MockOpenAIServer
+
+WORDS = ["parlons", "mangeait", "maisons", "rapidement", "voulu", "chevaux", "finissent", "belles"]
+
+
+def run_mode(server: MockOpenAIServer, combined: bool, cache_dir: str) -> tuple:
+    from src.shared.gpt_translator import GPTTranslator
+    from src.shared.translation_cache import TranslationCache
+
+    cache = TranslationCache(os.path.join(cache_dir, f"cache_{combined}.sqlite3"))
+    translator = GPTTranslator(api_key="mock-key", cache=cache)
+    translator.use_combined_analysis = combined
+
+    server.request_counts.clear()
+    timings = []
+    for word in WORDS:
+        start = time.perf_counter()
+        translator.analyze_word_comprehensive(word, "fr", "de", context=f"Nous {word} ensemble.")
+        timings.append(time.perf_counter() - start)
+    return sum(timings) / len(timings), sum(server.request_counts.values())
+
+
+def main(latency: float = 0.3):
+    server = MockOpenAIServer(latency=latency).start_background()
+    os.environ["OPENAI_BASE_URL"] = server.base_url
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        two_call_mean, two_call_requests = run_mode(server, combined=False, cache_dir=cache_dir)
+        combined_mean, combined_requests = run_mode(server, combined=True, cache_dir=cache_dir)
+
+    print(f"Mock latency per request: {latency * 1000:.0f} ms, {len(WORDS)} words")
+    print(f"Two-call path:  {two_call_mean * 1000:7.1f} ms/word, {two_call_requests} requests")
+    print(f"Combined path:  {combined_mean * 1000:7.1f} ms/word, {combined_requests} requests")
+    print(f"Latency reduction: {(1 - combined_mean / two_call_mean) * 100:.0f}%")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 0.3)
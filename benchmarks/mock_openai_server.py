@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Local mock of the OpenAI HTTP API for latency benchmarks.
+
+Answers chat completions with canned JSON after a fixed artificial latency,
+so request counts and round trips can be measured without network or cost.
+Story prompts get a canned story, generated (or streamed with stream=true) at
+a fixed per-token delay, and TTS requests get silent MP3 frames after a delay
+proportional to the input length.
+Point the app at it with OPENAI_BASE_URL=http://127.0.0.1:<port>/v1.
+"""
+
+import re
+import json
+import time
+import struct
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+COMBINED_ANALYSIS = {
+    "root_word": "parler",
+    "grammatical_relation": "1st person plural present",
+    "part_of_speech": "verb",
+    "primary_translation": "sprechen",
+    "secondary_translation": "reden",
+    "context_translation": None
+}
+LEMMA = {"root_word": "parler", "grammatical_relation": "1st person plural present", "part_of_speech": "verb"}
+TRANSLATION = {"primary_translation": "sprechen", "secondary_translation": "reden", "context_translation": None}
+STORY = (
+    "Ce matin-là, Claire se réveilla avant le lever du soleil. Elle avait rendez-vous au marché "
+    "avec son vieil ami Paul, qui voulait lui parler d'un projet étrange. « Tu es sûre que tu veux "
+    "venir ? » lui avait-il demandé la veille. Bien sûr qu'elle voulait venir ! Elle prit son "
+    "manteau, ferma la porte doucement et descendit la rue encore silencieuse. Au marché, les "
+    "marchands installaient déjà leurs étals. L'odeur du pain chaud se mêlait à celle des fleurs. "
+    "Paul l'attendait près de la fontaine, une tasse de café à la main. « Voilà, dit-il, j'ai "
+    "trouvé une vieille carte dans le grenier de ma grand-mère. » Il sortit un papier jauni de sa "
+    "poche et le déplia avec précaution. On y voyait une rivière, une colline et une petite croix "
+    "rouge. Claire fronça les sourcils. « Et tu crois vraiment que c'est un trésor ? » Paul haussa "
+    "les épaules en souriant. « Je n'en sais rien. Mais ce serait dommage de ne pas vérifier, non ? » "
+    "Ils décidèrent de partir le samedi suivant. Pendant toute la semaine, Claire ne pensa qu'à "
+    "cette carte. Au travail, elle regardait par la fenêtre et imaginait la colline, la rivière, la "
+    "croix rouge. Le samedi, ils prirent le train jusqu'au village le plus proche, puis marchèrent "
+    "pendant deux heures à travers les champs. Enfin, ils arrivèrent au pied de la colline. Sous un "
+    "grand chêne, Paul remarqua une pierre plate qui ne ressemblait pas aux autres. Ensemble, ils "
+    "la soulevèrent. Dessous, il n'y avait ni or ni bijoux, seulement une boîte en métal. À "
+    "l'intérieur, ils trouvèrent des lettres d'amour écrites par la grand-mère de Paul, il y a "
+    "soixante ans. Paul resta longtemps silencieux. « C'est peut-être mieux qu'un trésor », dit "
+    "enfin Claire. Il hocha la tête, les yeux brillants, et ils reprirent lentement le chemin du "
+    "retour."
+)
+MP3_FRAME = b'\xff\xfb\x90\x64' + bytes(413)  # Silent MPEG-1 Layer III frame, 128 kbps, 44.1 kHz
+MP3_FRAMES_PER_SECOND = 44100 / 1152
+SPOKEN_CHARS_PER_SECOND = 15
+
+
+def fake_mp3(text: str) -> bytes:
+    """Build an MP3 of silence as long as reading the text aloud would take."""
+    frames = max(1, round(len(text) / SPOKEN_CHARS_PER_SECOND * MP3_FRAMES_PER_SECOND))
+    # Like encoder output: an ID3v2.4 tag and an Info header frame before the audio
+    id3_tag = b'ID3\x04\x00\x00\x00\x00\x00\x00'
+    info = MP3_FRAME[:36] + b'Info' + struct.pack('>II', 0x1, frames)
+    info_frame = info + bytes(len(MP3_FRAME) - len(info))
+    return id3_tag + info_frame + MP3_FRAME * frames
+
+
+class MockOpenAIHandler(BaseHTTPRequestHandler):
+    """Request handler; latency and counters live on the server object."""
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output readable
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        body = json.loads(self.rfile.read(length) or b'{}')
+        self.server.record_request(self.path)
+        time.sleep(self.server.latency)
+
+        if self.path.endswith('/chat/completions'):
+            prompt = body["messages"][-1]["content"]
+            if body.get("stream"):
+                self._stream_chat_completion(body, self._content_for(prompt))
+            else:
+                self._send_json(self._chat_completion(body))
+        elif self.path.endswith('/audio/speech'):
+            text = body.get("input", "")
+            time.sleep(len(text) * self.server.tts_seconds_per_char)
+            self._send_bytes(fake_mp3(text), 'audio/mpeg')
+        else:
+            self.send_error(404)
+
+    def _content_for(self, prompt: str) -> str:
+        """Pick the canned answer for a prompt."""
+        repair = re.search(r"(?:Rewrite this paragraph|Write one or two sentences)[^:]*: (.*)", prompt)
+        if repair:
+            # Story repair: the original paragraph (if rewritten) plus a sentence with the words
+            words = [word.split(" (")[0] for word in repair.group(1).split(", ")]
+            sentence = f"Il y avait {', '.join(words)}."
+            if prompt.startswith("Here is a paragraph"):
+                paragraph = prompt.split("\n\n")[1]
+                return f"{paragraph} {sentence}"
+            return sentence
+        if "short story" in prompt:
+            return STORY
+        if '"primary_translation"' in prompt and '"root_word"' in prompt:
+            content = COMBINED_ANALYSIS
+        elif '"root_word"' in prompt:
+            content = LEMMA
+        else:
+            content = TRANSLATION
+        return json.dumps(content)
+
+    def _chat_completion(self, body: dict) -> dict:
+        content = self._content_for(body["messages"][-1]["content"])
+        # A complete answer takes as long as streaming all of its tokens
+        time.sleep(len(_tokens(content)) * self.server.token_delay)
+        return {
+            "id": "chatcmpl-mock",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "mock"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+        }
+
+    def _stream_chat_completion(self, body: dict, content: str):
+        """Send the answer as server-sent events, one token per event."""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+
+        def event(delta: dict, finish_reason=None):
+            payload = {
+                "id": "chatcmpl-mock",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": body.get("model", "mock"),
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+            }
+            self.wfile.write(f"data: {json.dumps(payload)}\n\n".encode('utf-8'))
+            self.wfile.flush()
+
+        event({"role": "assistant", "content": ""})
+        for token in _tokens(content):
+            time.sleep(self.server.token_delay)
+            event({"content": token})
+        event({}, finish_reason="stop")
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+    def _send_json(self, payload: dict):
+        self._send_bytes(json.dumps(payload).encode('utf-8'), 'application/json')
+
+    def _send_bytes(self, data: bytes, content_type: str):
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def _tokens(content: str) -> list:
+    """Split text roughly like a tokenizer would: words with their leading space."""
+    return re.findall(r'\s*\S+', content)
+
+
+class MockOpenAIServer(ThreadingHTTPServer):
+    """Threaded mock server with a fixed per-request latency."""
+
+    daemon_threads = True
+
+    def __init__(self, port: int = 0, latency: float = 0.3, token_delay: float = 0.0,
+                 tts_seconds_per_char: float = 0.0):
+        """
+        Args:
+            port: Port to listen on (0 picks a free one)
+            latency: Seconds before any response starts
+            token_delay: Seconds per generated token of a chat answer
+            tts_seconds_per_char: Seconds of TTS processing per input character
+        """
+        super().__init__(('127.0.0.1', port), MockOpenAIHandler)
+        self.latency = latency
+        self.token_delay = token_delay
+        self.tts_seconds_per_char = tts_seconds_per_char
+        self.request_counts = {}
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+    def record_request(self, path: str):
+        with self._lock:
+            self.request_counts[path] = self.request_counts.get(path, 0) + 1
+
+    def start_background(self) -> 'MockOpenAIServer':
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local mock OpenAI API")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.3, help="Seconds added to every request")
+    parser.add_argument('--token-delay', type=float, default=0.0, help="Seconds per generated chat token")
+    parser.add_argument('--tts-delay', type=float, default=0.0, help="Seconds of TTS work per input character")
+    args = parser.parse_args()
+
+    server = MockOpenAIServer(args.port, args.latency, args.token_delay, args.tts_delay)
+    print(f"Mock OpenAI API on {server.base_url} (latency {args.latency}s)")
+    server.serve_forever()
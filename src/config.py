@@ -15,6 +15,8 @@ ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_DIR = os.path.join(ROOT_DIR, 'data')
 TRANSCRIPTIONS_DIR = os.path.join(DATA_DIR, 'transcriptions_and_audio')
 WORD_TRACKING_FILE = os.path.join(DATA_DIR, 'word_tracking.json')
+CACHE_DIR = os.path.join(DATA_DIR, 'cache')
+SRT_CACHE_DIR = os.path.join(CACHE_DIR, 'srt')
 
 # Transcriber Configuration
 TRANSCRIBER_MODELS = {
@@ -28,12 +30,60 @@ TRANSCRIBER_MODELS = {
 DEFAULT_TRANSCRIBER_MODEL = 'base'
 DEFAULT_TRANSCRIBER_LANGUAGE = 'fr'
 
+# Model calibration (measured real-time factors per installed model)
+TRANSCRIBER_CALIBRATION_FILE = os.path.join(CACHE_DIR, 'transcriber_calibration.json')
+TRANSCRIBER_CALIBRATION_SECONDS = 30  # Length of the benchmark clip
+TRANSCRIBER_RUN_HISTORY_SIZE = 50  # Real runs kept per model
+DEFAULT_TRANSCRIBER_TIME_BUDGET_MINUTES = 10
+
+# Language vocabulary is translated into (code, as used for cached lookups)
+TRANSLATION_TARGET_LANGUAGE = 'de'
+
+# Translation cache (lemma and translation results from GPT)
+TRANSLATION_CACHE_FILE = os.path.join(CACHE_DIR, 'translations.sqlite3')
+TRANSLATION_CACHE_MAX_ENTRIES = 50000
+TRANSLATION_CACHE_TTL_DAYS = 90
+
+# TTS audio cache (MP3s keyed by hash of text, voice, model and speed)
+TTS_CACHE_DIR = os.path.join(CACHE_DIR, 'tts')
+TTS_CACHE_MAX_MB = 500  # Least recently used clips are evicted above this size
+
+# Word frequency tables (exported from wordfreq, memory-mapped at runtime)
+FREQUENCY_TABLE_DIR = os.path.join(CACHE_DIR, 'frequency')
+
+# Corpus index of the transcription library (per-file term counts)
+CORPUS_INDEX_FILE = os.path.join(CACHE_DIR, 'corpus_index.sqlite3')
+
+# Full-text search index over transcription cues
+TRANSCRIPT_SEARCH_FILE = os.path.join(CACHE_DIR, 'transcript_search.sqlite3')
+
+# OpenAI client (shared by translation, story generation and TTS)
+OPENAI_MAX_CONCURRENT_REQUESTS = 4  # Requests in flight across the whole app
+OPENAI_INTERACTIVE_SLOTS = 1  # Of those, kept free of background work (pre-translation, prefetching, TTS)
+OPENAI_MAX_CONNECTIONS = 10  # Keep-alive connection pool size
+OPENAI_REQUEST_TIMEOUT = 60  # Seconds
+OPENAI_MAX_RETRIES = 4
+OPENAI_RATE_LIMITS = {  # Requests per minute per endpoint
+    'chat': 300,
+    'speech': 50
+}
+
 # Gentexter Configuration
 DEFAULT_RANDOM_SAMPLE_SIZE = 40
 DEFAULT_FINAL_SELECTION_SIZE = 20
 DEFAULT_USE_DATABANK = True
 DEFAULT_USE_TEST_MODE = False
 
+# Gentexter session prefetching (ready-made sessions for instant "Generate Text")
+SESSION_PREFETCH_DIR = os.path.join(CACHE_DIR, 'sessions')
+SESSION_PREFETCH_DEPTH = 2  # Ready sessions kept in the buffer (0 disables prefetching)
+SESSION_PREFETCH_TIME_BUDGET = 180  # Seconds one background session may take before it is discarded
+SESSION_PREFETCH_STALE_FRACTION = 0.25  # Share of changed words that makes a buffered session stale
+
+# Session store (story, words, audio and cues of recent sessions, reopened without regenerating)
+SESSION_STORE_DIR = os.path.join(DATA_DIR, 'sessions')
+SESSION_STORE_MAX_MB = 300  # Least recently opened sessions are pruned above this size
+
 # UI Configuration
 MAIN_WINDOW_SIZE = "600x450"
 TRANSCRIBER_WINDOW_SIZE = "700x600"
@@ -65,4 +115,5 @@ SUPPORTED_AUDIO_FORMATS = [
 
 # Ensure data directories exist
 os.makedirs(DATA_DIR, exist_ok=True)
-os.makedirs(TRANSCRIPTIONS_DIR, exist_ok=True)
\ No newline at end of file
+os.makedirs(TRANSCRIPTIONS_DIR, exist_ok=True)
+os.makedirs(CACHE_DIR, exist_ok=True)
\ No newline at end of file
@@ -6,28 +6,295 @@ Handles text-to-speech audio generation using OpenAI API.
 """
 
 import os
-from typing import Optional
+import re
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, List, Optional
 from dotenv import load_dotenv
-import openai
+
+from ..shared.openai_client import background_requests, get_client
+from .mp3_tools import stitch_mp3
+from .tts_cache import TTSCache
 
 # Load environment variables from .env file
 load_dotenv()
 
+TTS_MAX_INPUT_CHARS = 4096  # Input limit of the speech endpoint
+
+# Sentence end: terminal punctuation plus closing quotes/brackets (French style
+# puts a space before »), followed by whitespace
+SENTENCE_END = re.compile(r'[.!?…]+(?:\s?["»”’)\]])*(?=\s)')
+
+
+def write_mp3_parts(parts: Iterable[bytes], output_path: str) -> List[float]:
+    """
+    Join MP3 segments into one file, in order.
+    
+    Tags and header frames of the segments are dropped and one Info header
+    with the total frame count is written, so the joined file plays without
+    gaps between segments and reports its full duration.
+    
+    Args:
+        parts: MP3 data of each segment
+        output_path: Path of the combined file
+    
+    Returns:
+        list: Duration of each segment in seconds
+    
+    Raises:
+        ValueError: If the segments contain no audio
+    """
+    directory = os.path.dirname(output_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    return stitch_mp3(parts, output_path)
+
+
+def subtitle_path(audio_path: str) -> str:
+    """Get the path of the SRT cue file belonging to a generated audio file."""
+    return os.path.splitext(audio_path)[0] + '.srt'
+
+
+def sentence_cues(chunks: List[str], durations: List[float]) -> List[Dict]:
+    """
+    Build sentence-level cues from per-chunk audio durations.
+    
+    Each chunk's duration is shared among its sentences in proportion to
+    their length, which is close enough for reading along since the TTS
+    voice speaks at a steady rate within a chunk.
+    
+    Args:
+        chunks: Text of each synthesized chunk, in order
+        durations: Audio duration of each chunk in seconds
+    
+    Returns:
+        list: {'start', 'end', 'text'} per sentence, times in seconds
+    """
+    cues = []
+    position = 0.0
+    for chunk, duration in zip(chunks, durations):
+        sentences = []
+        for paragraph in re.split(r'\n\s*\n', chunk):
+            cuts = [0] + [match.end() for match in SENTENCE_END.finditer(paragraph)] + [len(paragraph)]
+            sentences.extend(' '.join(paragraph[start:end].split()) for start, end in zip(cuts, cuts[1:]))
+        sentences = [sentence for sentence in sentences if sentence]
+        
+        total_chars = sum(len(sentence) for sentence in sentences)
+        chunk_start = position
+        chars = 0
+        for sentence in sentences:
+            chars += len(sentence)
+            end = chunk_start + duration * chars / total_chars
+            cues.append({'start': position, 'end': end, 'text': sentence})
+            position = end
+        position = chunk_start + duration
+    return cues
+
+
+def split_text_for_tts(text: str, max_chars: int = TTS_MAX_INPUT_CHARS) -> List[str]:
+    """
+    Split text into chunks of at most max_chars characters.
+    
+    Chunks end at paragraph breaks where possible, otherwise at sentence
+    ends; only sentences longer than max_chars are split between words.
+    
+    Args:
+        text: Text to split
+        max_chars: Maximum chunk length
+    
+    Returns:
+        list: Chunks in text order
+    """
+    # (piece, starts_paragraph) with every piece at most max_chars long
+    pieces = []
+    for paragraph in re.split(r'\n\s*\n', text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        cuts = [0] + [match.end() for match in SENTENCE_END.finditer(paragraph)] + [len(paragraph)]
+        first = True
+        for start, end in zip(cuts, cuts[1:]):
+            sentence = paragraph[start:end].strip()
+            while len(sentence) > max_chars:
+                cut = sentence.rfind(' ', 0, max_chars + 1)
+                cut = cut if cut > 0 else max_chars
+                pieces.append((sentence[:cut].strip(), first))
+                sentence = sentence[cut:].strip()
+                first = False
+            if sentence:
+                pieces.append((sentence, first))
+                first = False
+    
+    chunks = []
+    current = ""
+    for piece, starts_paragraph in pieces:
+        separator = "\n\n" if starts_paragraph else " "
+        # Prefer ending a well-filled chunk at a paragraph break
+        if current and (len(current) + len(separator) + len(piece) > max_chars
+                        or (starts_paragraph and len(current) >= max_chars // 2)):
+            chunks.append(current)
+            current = ""
+        current = f"{current}{separator}{piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
 
 class AudioGenerator:
     """Handles audio generation using OpenAI TTS API."""
     
-    def __init__(self):
+    def __init__(self, cache: TTSCache = None):
+        """
+        Args:
+            cache: Cache for synthesized clips (default: the shared TTS cache directory)
+        """
         self.api_key = os.getenv('OPENAI_API_KEY')
         if not self.api_key:
             raise ValueError("OPENAI_API_KEY not found in environment variables")
         
-        self.client = openai.OpenAI(api_key=self.api_key)
+        self.client = get_client(self.api_key)
+        self.cache = cache or TTSCache()  # Identical requests are only synthesized once
         
         # Available voices: alloy, echo, fable, onyx, nova, shimmer
         self.available_voices = ["alloy", "echo", "fable", "onyx", "nova", "shimmer"]
         self.default_voice = "onyx"
     
+    def synthesize(self, text: str, voice: str = None, model: str = "tts-1", speed: float = 1.0) -> bytes:
+        """
+        Convert text to MP3 data without writing a file (served from the cache when possible).
+        
+        Args:
+            text: Text to convert to speech
+            voice: Voice to use (default: onyx)
+            model: TTS model to use (tts-1 or tts-1-hd)
+            speed: Speech speed (0.25 to 4.0)
+        
+        Returns:
+            bytes: MP3 data
+        """
+        
+        if not text or not text.strip():
+            raise ValueError("No text provided for audio generation")
+        
+        voice = self._resolve_voice(voice)
+        speed = max(0.25, min(4.0, speed))  # Validate speed
+        key = TTSCache.make_key(text, voice, model, speed)
+        audio = self.cache.get(key)
+        if audio is not None:
+            return audio
+        
+        # TTS is bulk work: leave a request slot free for word lookups
+        with background_requests():
+            audio_response = self.client.speech(
+                model=model,
+                voice=voice,
+                input=text,
+                response_format="mp3",
+                speed=speed
+            )
+        self.cache.put(key, audio_response.content)
+        return audio_response.content
+    
+    def _resolve_voice(self, voice: Optional[str]) -> str:
+        """Get the voice to use, falling back to the default for unknown voices."""
+        if voice is None:
+            return self.default_voice
+        if voice not in self.available_voices:
+            print(f"⚠️ Voice '{voice}' not available. Using default '{self.default_voice}'")
+            return self.default_voice
+        return voice
+    
+    def generate_audio_chunked(self, text: str, output_path: str, 
+                               voice: str = None, 
+                               model: str = "tts-1", 
+                               speed: float = 1.0,
+                               chunk_chars: int = 1000,
+                               max_workers: int = 3,
+                               progress_callback: Optional[Callable[[int, int], None]] = None) -> Optional[List[Dict]]:
+        """
+        Generate TTS audio for a long text by synthesizing chunks concurrently.
+        
+        The text is split at paragraph/sentence boundaries, each chunk is
+        streamed to its own file by a bounded pool, and the parts are joined
+        into one MP3.
+        
+        Args:
+            text: Text to convert to speech
+            output_path: Path where to save the audio file
+            voice: Voice to use (default: onyx)
+            model: TTS model to use (tts-1 or tts-1-hd)
+            speed: Speech speed (0.25 to 4.0)
+            chunk_chars: Maximum chunk length (capped at the endpoint's input limit)
+            max_workers: Chunks synthesized at the same time
+            progress_callback: Optional callback receiving (chunks done, total chunks)
+        
+        Returns:
+            list: Per-chunk {'text', 'start', 'end'} timings in seconds, or None if generation failed
+        """
+        
+        if not text or not text.strip():
+            raise ValueError("No text provided for audio generation")
+        
+        chunks = split_text_for_tts(text, min(chunk_chars, TTS_MAX_INPUT_CHARS))
+        voice = self._resolve_voice(voice)
+        speed = max(0.25, min(4.0, speed))
+        directory = os.path.dirname(output_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        def synthesize_part(chunk: str, path: str):
+            key = TTSCache.make_key(chunk, voice, model, speed)
+            cached_path = self.cache.lookup(key)
+            if cached_path is not None:
+                try:
+                    shutil.copyfile(cached_path, path)
+                    return
+                except OSError:
+                    pass  # Evicted meanwhile
+            with background_requests():
+                self.client.speech_to_file(path, model=model, voice=voice, input=chunk,
+                                           response_format="mp3", speed=speed)
+            self.cache.put_file(key, path)
+        
+        try:
+            print(f"🎵 Generating audio in {len(chunks)} chunks with voice '{voice}'...")
+            
+            with tempfile.TemporaryDirectory(dir=directory or None) as part_dir:
+                part_paths = [os.path.join(part_dir, f"{i:04d}.mp3") for i in range(len(chunks))]
+                
+                with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                    futures = [pool.submit(synthesize_part, chunk, path) for chunk, path in zip(chunks, part_paths)]
+                    try:
+                        for done, future in enumerate(as_completed(futures), 1):
+                            future.result()
+                            if progress_callback:
+                                progress_callback(done, len(chunks))
+                    except Exception:
+                        for future in futures:
+                            future.cancel()
+                        raise
+                
+                def read_parts():
+                    for path in part_paths:
+                        with open(path, "rb") as part:
+                            yield part.read()
+                
+                durations = write_mp3_parts(read_parts(), output_path)
+            
+            timings = []
+            position = 0.0
+            for chunk, duration in zip(chunks, durations):
+                timings.append({'text': chunk, 'start': round(position, 3), 'end': round(position + duration, 3)})
+                position += duration
+            
+            print(f"✅ Audio generated successfully: {output_path} ({position:.1f}s)")
+            return timings
+            
+        except Exception as e:
+            print(f"❌ Error generating audio: {e}")
+            return None
+    
     def generate_audio(self, text: str, output_path: str, 
                       voice: str = None, 
                       model: str = "tts-1", 
@@ -49,33 +316,17 @@ class AudioGenerator:
         if not text or not text.strip():
             raise ValueError("No text provided for audio generation")
         
-        if voice is None:
-            voice = self.default_voice
-        
-        if voice not in self.available_voices:
-            print(f"⚠️ Voice '{voice}' not available. Using default '{self.default_voice}'")
-            voice = self.default_voice
-        
-        # Validate speed
-        speed = max(0.25, min(4.0, speed))
+        if len(text) > TTS_MAX_INPUT_CHARS:
+            # Too long for one request
+            return self.generate_audio_chunked(text, output_path, voice=voice, model=model, speed=speed) is not None
         
         try:
-            print(f"🎵 Generating audio with voice '{voice}'...")
-            
-            audio_response = self.client.audio.speech.create(
-                model=model,
-                voice=voice,
-                input=text,
-                response_format="mp3",
-                speed=speed
-            )
+            print(f"🎵 Generating audio with voice '{voice or self.default_voice}'...")
             
-            # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            audio = self.synthesize(text, voice=voice, model=model, speed=speed)
             
             # Save audio file
-            with open(output_path, "wb") as audio_file:
-                audio_file.write(audio_response.content)
+            write_mp3_parts([audio], output_path)
             
             print(f"✅ Audio generated successfully: {output_path}")
             return True
@@ -117,26 +368,33 @@ class AudioGenerator:
         return self.generate_audio(text_with_pauses, output_path, voice=voice)
     
     def generate_vocabulary_audio(self, vocab_list: list, output_dir: str, 
-                                 voice: str = None) -> list:
+                                 voice: str = None,
+                                 max_workers: int = 4,
+                                 progress_callback: Optional[Callable[[int, int], None]] = None) -> list:
         """
         Generate individual audio files for each vocabulary word.
         
+        Words are synthesized concurrently; the shared OpenAI client still
+        enforces the app-wide request and rate limits, so max_workers only
+        bounds how many of this call's requests wait for a slot at once.
+        
         Args:
             vocab_list: List of (word, translation, pronunciation) tuples
             output_dir: Directory to save audio files
             voice: Voice to use
+            max_workers: Words synthesized at the same time
+            progress_callback: Optional callback receiving (words done, total words)
         
         Returns:
-            list: List of generated file paths
+            list: List of generated file paths, in vocab_list order
         """
         
         if not vocab_list:
             return []
         
         os.makedirs(output_dir, exist_ok=True)
-        generated_files = []
         
-        for i, (word, translation, pronunciation) in enumerate(vocab_list, 1):
+        def generate_word(index: int, word: str, translation: str, pronunciation: str) -> Optional[str]:
             # Create text for pronunciation
             if pronunciation:
                 text = f"{word}. {pronunciation}. {translation}."
@@ -145,18 +403,31 @@ class AudioGenerator:
             
             # Generate filename
             safe_word = "".join(c for c in word if c.isalnum() or c in (' ', '-', '_')).strip()
-            filename = f"{i:02d}_{safe_word}.mp3"
+            filename = f"{index:02d}_{safe_word}.mp3"
             file_path = os.path.join(output_dir, filename)
             
             try:
                 if self.generate_audio(text, file_path, voice=voice):
-                    generated_files.append(file_path)
                     print(f"  ✓ Generated: {filename}")
-                else:
-                    print(f"  ✗ Failed: {filename}")
+                    return file_path
+                print(f"  ✗ Failed: {filename}")
             except Exception as e:
                 print(f"  ✗ Error generating {filename}: {e}")
+            return None
+        
+        results = [None] * len(vocab_list)
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            futures = {
+                pool.submit(generate_word, i, word, translation, pronunciation): i - 1
+                for i, (word, translation, pronunciation) in enumerate(vocab_list, 1)
+            }
+            # Each file is written by its worker as soon as it is synthesized
+            for done, future in enumerate(as_completed(futures), 1):
+                results[futures[future]] = future.result()
+                if progress_callback:
+                    progress_callback(done, len(vocab_list))
         
+        generated_files = [path for path in results if path]
         print(f"🎵 Generated {len(generated_files)} vocabulary audio files")
         return generated_files
     
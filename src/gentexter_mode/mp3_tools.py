@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+MP3 Tools
+
+Frame-level MP3 handling for joining TTS segments: strips the ID3 tags and
+Xing/Info header frames of each segment, concatenates the audio frames and
+writes one new Info header so players see the correct total duration.
+Only MPEG Layer III (what the TTS API produces) is supported.
+"""
+
+import os
+import struct
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+# Bitrates in kbps by bitrate index, for MPEG-1 and MPEG-2/2.5 Layer III
+_BITRATES_V1 = (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320)
+_BITRATES_V2 = (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160)
+# Sample rates by version id (3 = MPEG-1, 2 = MPEG-2, 0 = MPEG-2.5) and index
+_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+_XING_FRAMES_FLAG = 0x1
+_XING_BYTES_FLAG = 0x2
+
+
+@dataclass
+class FrameHeader:
+    """Decoded 4-byte MPEG audio frame header."""
+    raw: bytes
+    version_id: int
+    bitrate_index: int
+    bitrate: int  # kbps
+    sample_rate: int
+    padding: int
+    mono: bool
+
+    @property
+    def mpeg1(self) -> bool:
+        return self.version_id == 3
+
+    @property
+    def samples(self) -> int:
+        """Samples per frame."""
+        return 1152 if self.mpeg1 else 576
+
+    @property
+    def length(self) -> int:
+        """Frame length in bytes, header included."""
+        return (144 if self.mpeg1 else 72) * self.bitrate * 1000 // self.sample_rate + self.padding
+
+    @property
+    def side_info_size(self) -> int:
+        if self.mpeg1:
+            return 17 if self.mono else 32
+        return 9 if self.mono else 17
+
+    @property
+    def duration(self) -> float:
+        """Frame duration in seconds."""
+        return self.samples / self.sample_rate
+
+
+def parse_frame_header(data: bytes, offset: int = 0) -> Optional[FrameHeader]:
+    """
+    Decode the Layer III frame header at an offset.
+
+    Returns:
+        FrameHeader, or None if there is no valid header there
+    """
+    if offset + 4 > len(data):
+        return None
+    b0, b1, b2, b3 = data[offset:offset + 4]
+    if b0 != 0xFF or b1 & 0xE0 != 0xE0:
+        return None
+    version_id = (b1 >> 3) & 0x3
+    layer = (b1 >> 1) & 0x3
+    bitrate_index = b2 >> 4
+    sample_rate_index = (b2 >> 2) & 0x3
+    if version_id == 1 or layer != 1 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+    bitrates = _BITRATES_V1 if version_id == 3 else _BITRATES_V2
+    return FrameHeader(
+        raw=bytes(data[offset:offset + 4]),
+        version_id=version_id,
+        bitrate_index=bitrate_index,
+        bitrate=bitrates[bitrate_index],
+        sample_rate=_SAMPLE_RATES[version_id][sample_rate_index],
+        padding=(b2 >> 1) & 0x1,
+        mono=(b3 >> 6) == 3,
+    )
+
+
+def strip_tags(data: bytes) -> bytes:
+    """Remove a leading ID3v2 tag and a trailing ID3v1 tag."""
+    start, end = 0, len(data)
+    if data[:3] == b'ID3' and len(data) >= 10:
+        size = 0
+        for byte in data[6:10]:  # Syncsafe integer
+            size = (size << 7) | (byte & 0x7F)
+        start = 10 + size + (10 if data[5] & 0x10 else 0)  # Optional footer
+    if end - start >= 128 and data[end - 128:end - 125] == b'TAG':
+        end -= 128
+    return data[start:end]
+
+
+def iter_frames(data: bytes) -> Iterator[Tuple[int, FrameHeader]]:
+    """Yield (offset, header) of each complete frame, skipping bytes that are not frames."""
+    pos = 0
+    while pos + 4 <= len(data):
+        header = parse_frame_header(data, pos)
+        if header is None or pos + header.length > len(data):
+            pos += 1
+            continue
+        yield pos, header
+        pos += header.length
+
+
+def is_info_frame(data: bytes, offset: int, header: FrameHeader) -> bool:
+    """Check whether a frame is a Xing/Info/VBRI header frame rather than audio."""
+    tag_offset = offset + 4 + header.side_info_size
+    return (data[tag_offset:tag_offset + 4] in (b'Xing', b'Info')
+            or data[offset + 36:offset + 40] == b'VBRI')
+
+
+def audio_frames(data: bytes) -> Tuple[bytes, List[FrameHeader]]:
+    """
+    Extract the audio frames of one MP3 file.
+
+    Returns:
+        Tuple of (concatenated audio frame bytes, header of each frame)
+    """
+    data = strip_tags(data)
+    chunks, headers = [], []
+    for offset, header in iter_frames(data):
+        if not headers and is_info_frame(data, offset, header):
+            continue
+        chunks.append(data[offset:offset + header.length])
+        headers.append(header)
+    return b''.join(chunks), headers
+
+
+def build_info_frame(template: FrameHeader, frame_count: int, audio_bytes: int, vbr: bool) -> bytes:
+    """
+    Build a Xing/Info header frame describing the stream that follows it.
+
+    Args:
+        template: Header of the first audio frame (version, sample rate, channels)
+        frame_count: Number of audio frames
+        audio_bytes: Size of the audio frames in bytes
+        vbr: Whether frame bitrates differ ("Xing") or not ("Info")
+
+    Returns:
+        The frame bytes
+    """
+    bitrates = _BITRATES_V1 if template.mpeg1 else _BITRATES_V2
+    needed = 4 + template.side_info_size + 16
+    bitrate_index = template.bitrate_index
+    while True:
+        header = FrameHeader(template.raw, template.version_id, bitrate_index, bitrates[bitrate_index],
+                             template.sample_rate, 0, template.mono)
+        if header.length >= needed or bitrate_index == 14:
+            break
+        bitrate_index += 1
+
+    b0, b1, b2, b3 = template.raw
+    frame = bytearray(header.length)
+    # No CRC, no padding, the chosen bitrate
+    frame[0:4] = bytes((b0, b1 | 0x1, (bitrate_index << 4) | (b2 & 0x0C), b3))
+    tag_offset = 4 + header.side_info_size
+    frame[tag_offset:tag_offset + 16] = struct.pack(
+        '>4sIII', b'Xing' if vbr else b'Info', _XING_FRAMES_FLAG | _XING_BYTES_FLAG,
+        frame_count, header.length + audio_bytes
+    )
+    return bytes(frame)
+
+
+def stitch_mp3(parts: Iterable[bytes], output_path: str) -> List[float]:
+    """
+    Join MP3 files into one stream with a single, correct Info header.
+
+    The tags and header frames of every part are dropped, so no silent
+    header frames or metadata end up between the segments. Parts are
+    written as they come, only one is held in memory at a time.
+
+    Args:
+        parts: MP3 data of each segment, in order
+        output_path: Path of the joined file
+
+    Returns:
+        Duration of each part in seconds
+
+    Raises:
+        ValueError: If the parts contain no audio frames (the output file is removed)
+    """
+    durations = []
+    template, frame_count, audio_bytes, bitrates = None, 0, 0, set()
+    with open(output_path, 'wb') as f:
+        for part in parts:
+            audio, headers = audio_frames(part)
+            if headers and template is None:
+                template = headers[0]
+                # Placeholder; the totals are only known at the end
+                f.write(bytes(len(build_info_frame(template, 0, 0, False))))
+            f.write(audio)
+            frame_count += len(headers)
+            audio_bytes += len(audio)
+            bitrates.update(header.bitrate for header in headers)
+            durations.append(sum(header.duration for header in headers))
+
+        if template is not None:
+            f.seek(0)
+            f.write(build_info_frame(template, frame_count, audio_bytes, len(bitrates) > 1))
+
+    if not frame_count:
+        os.remove(output_path)
+        raise ValueError("No MP3 audio frames in the given parts")
+    return durations
+
+
+def mp3_duration(data: bytes) -> float:
+    """Get the playing time of MP3 data in seconds (by counting frames)."""
+    return sum(header.duration for header in audio_frames(data)[1])
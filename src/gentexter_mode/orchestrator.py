@@ -8,11 +8,19 @@ Coordinates all the components for a complete vocabulary learning session.
 import os
 import tempfile
 import json
-from typing import List, Tuple, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple, Optional
 from .database import GitManager, DatabaseManager, VocabularyImporter
 from .selector import VocabularySelector
 from .text_generator import TextGenerator
-from .audio_generator import AudioGenerator
+from .audio_generator import AudioGenerator, sentence_cues, subtitle_path, write_mp3_parts
+from .story_pipeline import StoryAudioPipeline, replace_in_chunks
+from .session_store import SessionStore
+from ..config import TRANSLATION_TARGET_LANGUAGE
+from ..shared.corpus_mining import CorpusIndex, CachedLemmatizer
+from ..shared.gpt_translator import GPTTranslator, language_code
+from ..shared.srt_parser import write_srt
+from ..shared.translation_cache import get_cache
 
 
 class VocabularyApp:
@@ -46,6 +54,11 @@ class VocabularyApp:
         except ValueError as e:
             print(f"⚠️ Audio generator not available: {e}")
             self.audio_generator = None
+        
+        # Generated sessions are kept so they can be opened again without regenerating
+        self.session_store = SessionStore()
+        if self.session_store.last_session_id() is None:
+            self._import_legacy_session()
     
     def import_vocabulary_from_file(self, file_path: str) -> int:
         """
@@ -80,6 +93,77 @@ class VocabularyApp:
             print("3. Run import again")
             return 0
     
+    def find_corpus_vocabulary(self, language_from: str = "fr", language_to: str = TRANSLATION_TARGET_LANGUAGE,
+                               limit: int = 30, progress_callback=None) -> List[Dict]:
+        """
+        Mine the transcription library for vocabulary worth learning.
+        
+        Args:
+            language_from: Language of the transcriptions
+            language_to: Translation language (selects cached lemmas)
+            limit: Maximum number of candidates
+            progress_callback: Optional callback function for progress updates
+        
+        Returns:
+            List of candidate dicts (see CorpusIndex.mine_candidates), best first
+        """
+        index = CorpusIndex()
+        try:
+            summary = index.update(progress_callback)
+            if progress_callback:
+                progress_callback(f"📚 Corpus index: {summary['indexed']} files indexed, "
+                                  f"{summary['unchanged']} unchanged, {summary['removed']} removed")
+            
+            known_words = [word for word, _ in self.database_manager.get_all_words()]
+            lemmatizer = CachedLemmatizer(get_cache(), language_from, language_to)
+            return index.mine_candidates(language_from, known_words, lemmatizer, limit=limit)
+        finally:
+            index.close()
+    
+    def import_corpus_vocabulary(self, candidates: List[Dict], language_from: str = "fr",
+                                 language_to: str = TRANSLATION_TARGET_LANGUAGE, progress_callback=None) -> int:
+        """
+        Translate corpus candidates and add them to the database.
+        
+        Args:
+            candidates: Candidates from find_corpus_vocabulary
+            language_from: Language of the candidates
+            language_to: Translation language
+            progress_callback: Optional callback function for progress updates
+        
+        Returns:
+            int: Number of new words imported
+        """
+        try:
+            translator = GPTTranslator()
+        except ValueError as e:
+            print(f"❌ Cannot translate corpus vocabulary: {e}")
+            return 0
+        
+        words = [candidate['word'] for candidate in candidates]
+        analyses = {}
+        missing = []
+        for word in words:
+            cached = translator.cache.get("analysis", word, language_from, language_to)
+            if cached is not None:
+                analyses[word] = cached
+            else:
+                missing.append(word)
+        
+        if progress_callback and missing:
+            progress_callback(f"🌐 Translating {len(missing)} corpus words...")
+        for i in range(0, len(missing), 40):
+            analyses.update(translator.analyze_words_batch(missing[i:i + 40], language_from, language_to))
+        
+        new_words = [
+            (analyses[word]['root_word'], analyses[word]['primary_translation'])
+            for word in words if word in analyses
+        ]
+        imported_count = self.database_manager.add_words(new_words)
+        if progress_callback:
+            progress_callback(f"✅ Imported {imported_count} words from your transcriptions")
+        return imported_count
+    
     def get_vocabulary_count(self) -> int:
         """Get the total number of words in the database."""
         return len(self.database_manager.get_all_words())
@@ -90,7 +174,8 @@ class VocabularyApp:
                            language: str = "French",
                            generate_audio: bool = True,
                            import_from_downloads: bool = False,
-                           progress_callback=None) -> dict:
+                           progress_callback=None,
+                           text_callback=None) -> dict:
         """
         Run a complete vocabulary learning session.
         
@@ -101,9 +186,12 @@ class VocabularyApp:
             generate_audio: Whether to generate audio
             import_from_downloads: Whether to import new vocabulary first
             progress_callback: Optional callback function for progress updates
+            text_callback: Optional callback receiving story text fragments as they are generated
+                (called from this thread)
         
         Returns:
-            dict: Session results with selected_words, story, audio_path, and session_word_updates
+            dict: Session results with selected_words, story, audio_path, srt_path (sentence cues
+                of the audio, empty if there are none), and session_word_updates
         """
         
         if progress_callback:
@@ -125,7 +213,7 @@ class VocabularyApp:
         if vocab_count < final_selection_size:
             if progress_callback:
                 progress_callback(f"❌ Not enough vocabulary words. Need at least {final_selection_size}, have {vocab_count}")
-            return {"selected_words": [], "story": "", "audio_path": "", "session_word_updates": []}
+            return {"selected_words": [], "story": "", "audio_path": "", "srt_path": "", "session_word_updates": []}
         
         # Select words using priority system
         if progress_callback:
@@ -138,7 +226,7 @@ class VocabularyApp:
         if not selected_words:
             if progress_callback:
                 progress_callback("❌ No words selected")
-            return {"selected_words": [], "story": "", "audio_path": "", "session_word_updates": []}
+            return {"selected_words": [], "story": "", "audio_path": "", "srt_path": "", "session_word_updates": []}
         
         if progress_callback:
             progress_callback(f"✅ Selected {len(selected_words)} words for the session")
@@ -157,161 +245,314 @@ class VocabularyApp:
         audio_path = ""
         
         if self.text_generator:
+            session_id = self.session_store.reserve()
             try:
                 if progress_callback:
                     progress_callback(f"📝 Generating story in {language}...")
-                generated_text = self.text_generator.generate_story(selected_words, language)
+                if self.audio_generator and generate_audio:
+                    # Audio is produced while the story streams in
+                    generated_text, audio_path = self.generate_story_and_audio(
+                        selected_words, language, progress_callback, text_callback,
+                        audio_path=self.session_store.audio_path(session_id)
+                    )
+                elif text_callback:
+                    fragments = []
+                    for fragment in self.text_generator.stream_story(selected_words, language):
+                        fragments.append(fragment)
+                        text_callback(fragment)
+                    generated_text = "".join(fragments).strip()
+                    generated_text = self._repair_story(generated_text, selected_words, language,
+                                                        progress_callback)['story']
+                else:
+                    generated_text = self.text_generator.generate_story(selected_words, language)
+                    generated_text = self._repair_story(generated_text, selected_words, language,
+                                                        progress_callback)['story']
                 if progress_callback:
                     progress_callback("✅ Story generated successfully")
                 
-                # Save the generated text persistently
-                if generated_text:
-                    text_path = os.path.join(tempfile.gettempdir(), "infiniling_text.txt")
-                    try:
-                        with open(text_path, 'w', encoding='utf-8') as f:
-                            f.write(generated_text)
-                    except Exception as e:
-                        if progress_callback:
-                            progress_callback(f"⚠️ Could not save text file: {e}")
-                
-                # Save the selected vocabulary words for vocabulary review
-                self._save_selected_words(selected_words, progress_callback)
+                # Save the session so it can be opened again (see load_session)
+                audio_path = self.save_last_session(generated_text, selected_words, audio_path,
+                                                    progress_callback, language, session_id)
                 
             except Exception as e:
                 if progress_callback:
                     progress_callback(f"❌ Error generating story: {e}")
                 generated_text = ""
-        
-        if self.audio_generator and generated_text and generate_audio:
-            try:
-                if progress_callback:
-                    progress_callback("🎵 Generating audio...")
-                audio_path = os.path.join(tempfile.gettempdir(), "infiniling_audio.mp3")
-                success = self.audio_generator.generate_audio(generated_text, audio_path)
-                if success and progress_callback:
-                    progress_callback("✅ Audio generated successfully")
-                elif not success:
-                    audio_path = ""
-            except Exception as e:
-                if progress_callback:
-                    progress_callback(f"⚠️ Error generating audio: {e}")
                 audio_path = ""
+                self.session_store.delete(session_id)
         
         return {
             "selected_words": selected_words,
             "story": generated_text,
             "audio_path": audio_path,
+            "srt_path": self.get_subtitle_path(audio_path),
             "session_word_updates": session_word_updates
         }
     
-    def _save_selected_words(self, selected_words: List[Tuple[str, str, str]], progress_callback=None):
-        """Save the selected vocabulary words to a JSON file for later use."""
+    def generate_story_and_audio(self, selected_words: List[Tuple[str, str, str]], language: str,
+                                 progress_callback=None, text_callback=None, audio_path: str = None,
+                                 fallback: bool = True) -> Tuple[str, str]:
+        """
+        Generate the story and its audio, overlapping TTS with story streaming.
+        
+        Sentence cues for the audio are written as an SRT next to it (see subtitle_path),
+        so the reader can highlight the story in sync with playback. Vocabulary words
+        the story missed are worked in afterwards (see _repair_story) and only the
+        audio of the changed paragraphs is regenerated.
+        
+        Args:
+            selected_words: List of (word, translation, pronunciation) tuples
+            language: Language of the story
+            progress_callback: Optional callback function for progress updates
+            text_callback: Optional callback receiving story text fragments
+            audio_path: Where to write the audio (default: a new directory in the session store)
+            fallback: Whether to generate story and audio in sequence if streaming fails
+                (otherwise the error is raised)
+        
+        Returns:
+            Tuple of (story, audio path); the audio path is empty if audio generation failed
+        """
+        audio_path = audio_path or self.session_store.audio_path(self.session_store.reserve())
+        pipeline = StoryAudioPipeline(self.text_generator, self.audio_generator)
+        
+        # Cues of an earlier story must not be paired with this one
+        if os.path.exists(subtitle_path(audio_path)):
+            os.remove(subtitle_path(audio_path))
+        
         try:
-            words_path = os.path.join(tempfile.gettempdir(), "infiniling_words.json")
-            
-            # Convert tuples to dictionaries for JSON serialization
-            words_data = []
-            for word, translation, pronunciation in selected_words:
-                words_data.append({
-                    "word": word,
-                    "translation": translation,
-                    "pronunciation": pronunciation or ""
-                })
-            
-            # Save to JSON file
-            with open(words_path, 'w', encoding='utf-8') as f:
-                json.dump(words_data, f, indent=2, ensure_ascii=False)
-            
             if progress_callback:
-                progress_callback(f"💾 Saved {len(selected_words)} vocabulary words")
-            
+                progress_callback("🎵 Generating audio while the story is written...")
+            result = pipeline.run(selected_words, audio_path, language, text_callback=text_callback)
         except Exception as e:
+            if not fallback:
+                raise
             if progress_callback:
-                progress_callback(f"⚠️ Could not save vocabulary words: {e}")
-            print(f"Error saving vocabulary words: {e}")
-
-    def _load_saved_words(self, progress_callback=None) -> List[Tuple[str, str, str]]:
-        """Load the saved vocabulary words from JSON file."""
-        try:
-            words_path = os.path.join(tempfile.gettempdir(), "infiniling_words.json")
-            
-            if not os.path.exists(words_path):
+                progress_callback(f"⚠️ Streaming failed ({e}), generating story and audio in sequence...")
+            story = self.text_generator.generate_story(selected_words, language)
+            story = self._repair_story(story, selected_words, language, progress_callback)['story']
+            try:
+                timings = self.audio_generator.generate_audio_chunked(story, audio_path)
+            except Exception as audio_error:
                 if progress_callback:
-                    progress_callback("⚠️ No saved vocabulary words found")
-                return []
-            
-            with open(words_path, 'r', encoding='utf-8') as f:
-                words_data = json.load(f)
-            
-            # Convert dictionaries back to tuples
-            selected_words = []
-            for word_info in words_data:
-                word = word_info.get("word", "")
-                translation = word_info.get("translation", "")
-                pronunciation = word_info.get("pronunciation", "")
-                selected_words.append((word, translation, pronunciation))
-            
+                    progress_callback(f"⚠️ Error generating audio: {audio_error}")
+                timings = None
+            if timings is None:
+                return story, ""
+            self._write_subtitles([timing['text'] for timing in timings],
+                                  [timing['end'] - timing['start'] for timing in timings], audio_path)
             if progress_callback:
-                progress_callback(f"📚 Loaded {len(selected_words)} vocabulary words")
-            
-            return selected_words
-            
-        except Exception as e:
+                progress_callback("✅ Audio generated successfully")
+            return story, audio_path
+        
+        if result.audio_error is not None:
             if progress_callback:
-                progress_callback(f"⚠️ Error loading vocabulary words: {e}")
-            print(f"Error loading vocabulary words: {e}")
-            return []
-
-    def load_last_session(self, progress_callback=None) -> dict:
+                progress_callback(f"⚠️ Error generating audio: {result.audio_error}")
+            return result.story, result.audio_path
+        
+        self._write_subtitles(result.chunks, result.chunk_durations, result.audio_path)
+        if progress_callback:
+            progress_callback(
+                f"✅ Audio generated successfully ({len(result.chunks)} parts, first audio after "
+                f"{result.first_audio_seconds:.1f}s, total {result.total_seconds:.1f}s)"
+            )
+        
+        repair = self._repair_story(result.story, selected_words, language, progress_callback)
+        if repair['replacements']:
+            try:
+                self._revoice_repairs(result.chunks, repair['replacements'], repair['story'], result.audio_path)
+            except Exception as e:
+                # The unrepaired audio and cues stay in place
+                if progress_callback:
+                    progress_callback(f"⚠️ Could not update the audio: {e}")
+                return result.story, result.audio_path
+            if progress_callback:
+                progress_callback("✅ Audio updated for the repaired story")
+        return repair['story'], result.audio_path
+    
+    def _repair_story(self, story: str, selected_words: List[Tuple[str, str, str]], language: str,
+                      progress_callback=None) -> dict:
         """
-        Load the last generated text and audio files.
+        Work vocabulary words the story missed into it (see TextGenerator.repair_story).
+        
+        Returns:
+            dict: Result of repair_story; on failure the story is returned unchanged
+        """
+        # Lemmas cached by lookups and pre-translation in the session's language
+        lemmatize = CachedLemmatizer(get_cache(), language_code(language), TRANSLATION_TARGET_LANGUAGE).lemmatize
+        try:
+            repair = self.text_generator.repair_story(story, selected_words, language, lemmatize)
+        except Exception as e:
+            print(f"⚠️ Story repair failed: {e}")
+            return {'story': story, 'coverage': None, 'replacements': [], 'requests': 0}
+        if repair['requests'] and progress_callback:
+            progress_callback(
+                f"🩹 Worked missing words into the story ({repair['coverage']['coverage_percentage']:.0f}% "
+                f"of the words used)"
+            )
+        return repair
+    
+    def _revoice_repairs(self, chunks: List[str], replacements: List[Tuple[str, str]], story: str,
+                         audio_path: str):
+        """
+        Regenerate the audio of a repaired story.
+        
+        Chunks that did not change are served from the TTS cache, so only the
+        rewritten paragraphs are synthesized again.
         
         Args:
+            chunks: Chunks the audio was generated from
+            replacements: (old paragraph, new paragraph) pairs, in the order applied
+            story: Repaired story (voiced as a whole if the chunks cannot be matched)
+            audio_path: Audio file to rewrite
+        """
+        chunks = list(chunks)
+        if all(replace_in_chunks(chunks, old, new) for old, new in replacements):
+            with ThreadPoolExecutor(max_workers=3) as pool:
+                parts = list(pool.map(self.audio_generator.synthesize, chunks))
+            durations = write_mp3_parts(parts, audio_path)
+        else:
+            timings = self.audio_generator.generate_audio_chunked(story, audio_path)
+            if timings is None:
+                raise RuntimeError("audio generation failed")
+            chunks = [timing['text'] for timing in timings]
+            durations = [timing['end'] - timing['start'] for timing in timings]
+        self._write_subtitles(chunks, durations, audio_path)
+    
+    def _write_subtitles(self, chunks: List[str], durations: List[float], audio_path: str):
+        """Write sentence cues for generated audio next to it (failures only lose highlighting)."""
+        try:
+            write_srt(sentence_cues(chunks, durations), subtitle_path(audio_path))
+        except Exception as e:
+            print(f"⚠️ Could not write sentence timings: {e}")
+    
+    def get_subtitle_path(self, audio_path: str) -> str:
+        """Get the cue file of an audio file, or empty if there is none."""
+        if audio_path and os.path.exists(subtitle_path(audio_path)):
+            return subtitle_path(audio_path)
+        return ""
+    
+    def save_last_session(self, story: str, selected_words: List[Tuple[str, str, str]],
+                          audio_source: str = "", progress_callback=None, language: str = "French",
+                          session_id: str = None) -> str:
+        """
+        Store a session in the session store as the last session, so it can be opened again offline.
+        
+        Args:
+            story: Generated story
+            selected_words: Vocabulary words of the session
+            audio_source: Audio file of the session (e.g., from the prefetch buffer), if any;
+                it is moved into the session directory along with its cue file
             progress_callback: Optional callback function for progress updates
+            language: Language of the story
+            session_id: Session reserved for the story (see SessionStore.reserve), if any
         
         Returns:
-            dict: Session results with story and audio_path, or empty if not found
+            str: Path of the stored audio, or empty if the session has no audio
         """
+        if not story:
+            if session_id:
+                self.session_store.delete(session_id)
+            return ""
+        
+        try:
+            entry = self.session_store.save(story, selected_words, audio_source, language, session_id)
+        except OSError as e:
+            if progress_callback:
+                progress_callback(f"⚠️ Could not save session: {e}")
+            return audio_source
+        
         if progress_callback:
-            progress_callback("📂 Loading last session...")
+            progress_callback(f"💾 Saved session with {entry['word_count']} vocabulary words")
+        return self.session_store.audio_path(entry['id']) if entry['has_audio'] else ""
+    
+    def _import_legacy_session(self):
+        """Move the last session of older versions (fixed files in the temp directory) into the store."""
+        temp_dir = tempfile.gettempdir()
+        text_path = os.path.join(temp_dir, "infiniling_text.txt")
+        words_path = os.path.join(temp_dir, "infiniling_words.json")
+        audio_path = os.path.join(temp_dir, "infiniling_audio.mp3")
+        if not os.path.exists(text_path):
+            return
+        try:
+            with open(text_path, 'r', encoding='utf-8') as f:
+                story = f.read()
+            selected_words = []
+            if os.path.exists(words_path):
+                with open(words_path, 'r', encoding='utf-8') as f:
+                    selected_words = [(info.get("word", ""), info.get("translation", ""),
+                                       info.get("pronunciation", "")) for info in json.load(f)]
+            if story:
+                self.session_store.save(story, selected_words,
+                                        audio_path if os.path.exists(audio_path) else "")
+            for path in (text_path, words_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            print("📦 Moved the last session into the session store")
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not import the last session: {e}")
+    
+    def list_recent_sessions(self, limit: int = 20) -> List[Dict]:
+        """
+        List recent sessions that can be opened again (see load_session).
         
-        # Check for saved text file
-        text_path = os.path.join(tempfile.gettempdir(), "infiniling_text.txt")
-        generated_text = ""
+        Args:
+            limit: Maximum number of sessions
         
-        if os.path.exists(text_path):
-            try:
-                with open(text_path, 'r', encoding='utf-8') as f:
-                    generated_text = f.read()
-                if progress_callback:
-                    progress_callback("✅ Last text loaded successfully")
-            except Exception as e:
-                if progress_callback:
-                    progress_callback(f"❌ Error loading text file: {e}")
-                generated_text = ""
-        else:
-            if progress_callback:
-                progress_callback("❌ No saved text found")
+        Returns:
+            list: Session entries (id, created, preview, word_count, has_audio, ...), most recent first
+        """
+        return self.session_store.recent(limit)
+    
+    def load_session(self, session_id: str, progress_callback=None) -> dict:
+        """
+        Load a stored session and make it the last session.
         
-        # Check for saved audio file
-        audio_path = os.path.join(tempfile.gettempdir(), "infiniling_audio.mp3")
-        if not os.path.exists(audio_path):
-            audio_path = ""
-            if progress_callback:
-                progress_callback("⚠️ No saved audio found")
-        else:
+        Args:
+            session_id: ID of the session (see list_recent_sessions)
+            progress_callback: Optional callback function for progress updates
+        
+        Returns:
+            dict: Session results with selected_words, story, audio_path and srt_path,
+                or empty values if the session was not found
+        """
+        session = self.session_store.load(session_id)
+        if session is None:
             if progress_callback:
-                progress_callback("✅ Last audio found")
+                progress_callback("❌ Session not found")
+            return {"selected_words": [], "story": "", "audio_path": "", "srt_path": ""}
         
-        # Load saved vocabulary words
-        saved_words = self._load_saved_words(progress_callback)
+        if progress_callback:
+            progress_callback("✅ Text loaded successfully")
+            progress_callback("✅ Audio found" if session['audio_path'] else "⚠️ No saved audio found")
+            progress_callback(f"📚 Loaded {len(session['selected_words'])} vocabulary words")
         
         return {
-            "selected_words": saved_words,  # Load saved vocabulary words for review
-            "story": generated_text,
-            "audio_path": audio_path
+            "selected_words": session['selected_words'],  # Saved vocabulary words for review
+            "story": session['story'],
+            "audio_path": session['audio_path'],
+            "srt_path": session['srt_path']
         }
     
+    def load_last_session(self, progress_callback=None) -> dict:
+        """
+        Load the most recently generated or opened session.
+        
+        Args:
+            progress_callback: Optional callback function for progress updates
+        
+        Returns:
+            dict: Session results with story, audio_path and srt_path, or empty if not found
+        """
+        if progress_callback:
+            progress_callback("📂 Loading last session...")
+        
+        session_id = self.session_store.last_session_id()
+        if session_id is None:
+            if progress_callback:
+                progress_callback("❌ No saved session found")
+            return {"selected_words": [], "story": "", "audio_path": "", "srt_path": ""}
+        return self.load_session(session_id, progress_callback)
+    
     def get_database_statistics(self) -> dict:
         """Get statistics about the vocabulary database."""
         word_stats = self.database_manager.word_stats
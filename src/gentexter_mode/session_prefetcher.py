@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Session Prefetcher
+
+Keeps a few learning sessions (selected words, story, MP3) ready in a cache
+directory so "Generate Text" can open one immediately. Sessions are generated
+by a background thread, which also does the Git pull that used to run on every
+click (also when prefetching is disabled). A buffered session is dropped as stale once the vocabulary database
+changed enough that its word selection no longer reflects current priorities.
+"""
+
+import os
+import json
+import time
+import uuid
+import shutil
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from ..config import (SESSION_PREFETCH_DIR, SESSION_PREFETCH_DEPTH, SESSION_PREFETCH_TIME_BUDGET,
+                      SESSION_PREFETCH_STALE_FRACTION)
+from ..shared.openai_client import background_requests
+
+_POLL_SECONDS = 30  # How often an idle prefetcher checks the database for changes
+_SESSION_FILE = "session.json"
+_AUDIO_FILE = "audio.mp3"
+
+
+class PrefetchBudgetExceeded(Exception):
+    """Raised to abort a background session that exceeded its time budget."""
+
+
+class SessionPrefetcher:
+    """Background buffer of ready-to-use learning sessions."""
+
+    def __init__(self, vocab_app, random_sample_size: int = 40, final_selection_size: int = 20,
+                 language: str = "French", depth: int = SESSION_PREFETCH_DEPTH,
+                 time_budget: float = SESSION_PREFETCH_TIME_BUDGET,
+                 stale_fraction: float = SESSION_PREFETCH_STALE_FRACTION,
+                 cache_dir: str = SESSION_PREFETCH_DIR, sync_git: bool = True):
+        """
+        Args:
+            vocab_app: VocabularyApp providing word selection and generation
+            random_sample_size: Size of random sample for priority calculation
+            final_selection_size: Number of words per session
+            language: Language of the stories
+            depth: Ready sessions to keep (0 disables prefetching, not the Git pull)
+            time_budget: Seconds one session may take before it is discarded
+            stale_fraction: Share of changed words that makes a session stale
+            cache_dir: Directory holding the buffered sessions
+            sync_git: Whether to pull the vocabulary repository before generating
+        """
+        self.vocab_app = vocab_app
+        self.random_sample_size = random_sample_size
+        self.final_selection_size = final_selection_size
+        self.language = language
+        self.depth = depth
+        self.time_budget = time_budget
+        self.stale_fraction = stale_fraction
+        self.cache_dir = cache_dir
+        self.sync_git = sync_git
+
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._pull_requested = sync_git
+        self._pull_lock = threading.Lock()
+        # Set once the requested pull is done; generation waits for it (see wait_for_sync)
+        self._synced = threading.Event()
+        if not sync_git:
+            self._synced.set()
+        self._thread = None
+        self._database_mtime = self._database_file_mtime()
+        self.sessions = self._load_sessions()  # Oldest first
+
+    # Buffer on disk
+    def _load_sessions(self) -> List[Dict]:
+        """Load the sessions finished by earlier runs; remove abandoned unfinished ones."""
+        sessions = []
+        if not os.path.isdir(self.cache_dir):
+            return sessions
+        for name in os.listdir(self.cache_dir):
+            directory = os.path.join(self.cache_dir, name)
+            try:
+                with open(os.path.join(directory, _SESSION_FILE), 'r', encoding='utf-8') as f:
+                    session = json.load(f)
+                session['directory'] = directory
+                sessions.append(session)
+            except (OSError, ValueError):
+                # A recent one may still be written by a prefetcher that is shutting down
+                try:
+                    abandoned = time.time() - os.path.getmtime(directory) > self.time_budget
+                except OSError:
+                    continue
+                if abandoned:
+                    shutil.rmtree(directory, ignore_errors=True)
+        sessions.sort(key=lambda session: session['created'])
+        return sessions
+
+    def _discard(self, session: Dict):
+        """Delete a session's files."""
+        shutil.rmtree(session['directory'], ignore_errors=True)
+
+    def ready_count(self) -> int:
+        """Get the number of buffered sessions."""
+        with self._lock:
+            return len(self.sessions)
+
+    # Staleness
+    def _database_file_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.vocab_app.database_manager.tracking_file_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _refresh_if_database_changed(self) -> bool:
+        """Reload word stats if the database file changed (e.g., after a Git pull)."""
+        mtime = self._database_file_mtime()
+        if mtime == self._database_mtime:
+            return False
+        self._database_mtime = mtime
+        self.vocab_app.database_manager._refresh_word_stats()
+        return True
+
+    def _priorities(self, words: List[Tuple[str, str, str]]) -> Dict[str, int]:
+        """Get the current selection priority of each word."""
+        selector = self.vocab_app.vocabulary_selector
+        return {f"{word}|{translation}": selector.calculate_word_priority(word, translation)
+                for word, translation, _ in words}
+
+    def is_stale(self, session: Dict) -> bool:
+        """
+        Check whether a session no longer matches the settings or the database.
+
+        A session is stale when too many of its words were deleted or became
+        less urgent (e.g., reviewed in another session) since it was selected,
+        or when enough new words were added that they would have been picked.
+        """
+        if ((session['random_sample_size'], session['final_selection_size'], session['language'])
+                != (self.random_sample_size, self.final_selection_size, self.language)):
+            return True
+
+        word_stats = self.vocab_app.database_manager.word_stats
+        words = [tuple(entry) for entry in session['selected_words']]
+        current = self._priorities(words)
+        changed = sum(1 for key, priority in session['priorities'].items()
+                      if key not in word_stats or current[key] < priority)
+        added = max(0, len(word_stats) - session['vocabulary_size'])
+
+        limit = self.stale_fraction * max(1, len(words))
+        return changed > limit or added > limit
+
+    def _drop_stale(self):
+        """Remove stale sessions from the buffer."""
+        with self._lock:
+            stale = [session for session in self.sessions if self.is_stale(session)]
+            self.sessions = [session for session in self.sessions if session not in stale]
+        for session in stale:
+            print(f"🗑️ Dropping stale prefetched session {session['id']}")
+            self._discard(session)
+
+    # Generation
+    def _select_words(self) -> List[Tuple[str, str, str]]:
+        """Select words for a new session, avoiding words of buffered sessions."""
+        vocab_list = self.vocab_app.database_manager.get_vocabulary_list()
+        with self._lock:
+            reserved = {(entry[0], entry[1]) for session in self.sessions for entry in session['selected_words']}
+        available = [entry for entry in vocab_list if (entry[0], entry[1]) not in reserved]
+        if len(available) < self.final_selection_size:
+            available = vocab_list
+        return self.vocab_app.vocabulary_selector.select_words_by_priority(
+            available, self.random_sample_size, self.final_selection_size
+        )
+
+    def _generate_session(self) -> bool:
+        """Generate one session into the buffer; returns True on success."""
+        words = self._select_words()
+        if not words:
+            return False
+
+        session_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        directory = os.path.join(self.cache_dir, session_id)
+        os.makedirs(directory, exist_ok=True)
+        session = {
+            'id': session_id,
+            'created': time.time(),
+            'language': self.language,
+            'random_sample_size': self.random_sample_size,
+            'final_selection_size': self.final_selection_size,
+            'selected_words': [list(entry) for entry in words],
+            # Snapshot for staleness checks, taken when the words were selected
+            'priorities': self._priorities(words),
+            'vocabulary_size': len(self.vocab_app.database_manager.word_stats),
+            'audio_file': _AUDIO_FILE,
+        }
+
+        start = time.monotonic()
+
+        def check_budget(fragment: str):
+            if self._stopped.is_set() or time.monotonic() - start > self.time_budget:
+                raise PrefetchBudgetExceeded(f"Session took longer than {self.time_budget}s")
+
+        try:
+            print(f"📦 Prefetching session {session_id}...")
+            # The story stream holds a request slot for its whole duration; keep it in the background
+            with background_requests():
+                story, audio_path = self.vocab_app.generate_story_and_audio(
+                    words, self.language, text_callback=check_budget,
+                    audio_path=os.path.join(directory, _AUDIO_FILE), fallback=False
+                )
+            if not story or not audio_path:
+                raise ValueError("Story or audio generation failed")
+            check_budget("")
+
+            session['story'] = story
+            tmp_path = os.path.join(directory, f"{_SESSION_FILE}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(session, f, ensure_ascii=False)
+            os.replace(tmp_path, os.path.join(directory, _SESSION_FILE))
+        except Exception as e:
+            shutil.rmtree(directory, ignore_errors=True)
+            print(f"⚠️ Session prefetch failed: {e}")
+            return False
+
+        session['directory'] = directory
+        with self._lock:
+            self.sessions.append(session)
+            ready = len(self.sessions)
+        print(f"✅ Prefetched session ready ({ready}/{self.depth}, {time.monotonic() - start:.0f}s)")
+        return True
+
+    def _can_generate(self) -> bool:
+        return (self.vocab_app.text_generator is not None and self.vocab_app.audio_generator is not None
+                and self.vocab_app.get_vocabulary_count() >= self.final_selection_size)
+
+    def _pull(self):
+        """Pull the vocabulary repository and mark the database as synced."""
+        with self._pull_lock:
+            print("🔄 Pulling latest vocabulary from Git...")
+            if self.vocab_app.git_manager.pull_latest():
+                print("✅ Git pull successful")
+            else:
+                print("⚠️ Git pull failed. Using local vocabulary.")
+            self._refresh_if_database_changed()
+            self._synced.set()
+
+    def _run(self):
+        """Background loop: sync, drop stale sessions, refill the buffer, then wait."""
+        while not self._stopped.is_set():
+            if self._pull_requested:
+                self._pull_requested = False
+                self._pull()
+
+            self._refresh_if_database_changed()
+            self._drop_stale()
+
+            if self.ready_count() < self.depth and self._can_generate():
+                if self._generate_session():
+                    continue
+
+            self._wake.wait(_POLL_SECONDS)
+            self._wake.clear()
+
+    # Public API
+    def start(self):
+        """Start the background thread (no-op if running); with depth 0 it only pulls."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread; a session being generated is discarded."""
+        self._stopped.set()
+        self._wake.set()
+
+    def wait_for_sync(self, timeout: float = None) -> bool:
+        """
+        Wait until the vocabulary is pulled before generating a story.
+
+        Waits for the first pull after start() and, with prefetching disabled,
+        for the pull requested by take(). Pulls on the calling thread if the
+        background thread is not running.
+
+        Args:
+            timeout: Seconds to wait for the background pull (default: no limit)
+
+        Returns:
+            True if the pull finished
+        """
+        if self._synced.is_set():
+            return True
+        if not (self._thread and self._thread.is_alive()):
+            self._pull_requested = False
+            self._pull()
+            return True
+        return self._synced.wait(timeout)
+
+    def configure(self, random_sample_size: int, final_selection_size: int, language: str = None):
+        """Change the session settings; buffered sessions with other settings are dropped."""
+        self.random_sample_size = random_sample_size
+        self.final_selection_size = final_selection_size
+        self.language = language or self.language
+        self._wake.set()
+
+    def take(self, random_sample_size: int, final_selection_size: int, language: str = None) -> Optional[Dict]:
+        """
+        Get the oldest ready session and store it as the last session.
+
+        Args:
+            random_sample_size: Size of random sample for priority calculation
+            final_selection_size: Number of words per session
+            language: Language of the story (default: unchanged)
+
+        Returns:
+            dict like VocabularyApp.run_learning_session's result, or None if no
+            fresh session is ready
+        """
+        self.configure(random_sample_size, final_selection_size, language)
+        self._refresh_if_database_changed()
+
+        stale = []
+        session = None
+        with self._lock:
+            while self.sessions:
+                candidate = self.sessions.pop(0)
+                if self.is_stale(candidate):
+                    stale.append(candidate)
+                else:
+                    session = candidate
+                    break
+        for candidate in stale:
+            self._discard(candidate)
+
+        # Refill (and sync) in the background
+        if self.sync_git and self.depth <= 0:
+            # Nothing is buffered, so the story generated next must wait for this pull
+            self._synced.clear()
+        self._pull_requested = self.sync_git
+        self._wake.set()
+        if session is None:
+            return None
+
+        selected_words = [tuple(entry) for entry in session['selected_words']]
+        audio_path = self.vocab_app.save_last_session(
+            session['story'], selected_words, os.path.join(session['directory'], session['audio_file']),
+            language=session['language']
+        )
+        self._discard(session)
+        return {
+            "selected_words": selected_words,
+            "story": session['story'],
+            "audio_path": audio_path,
+            "srt_path": self.vocab_app.get_subtitle_path(audio_path),
+            "session_word_updates": [{"word": word, "translation": translation, "repeat": False}
+                                     for word, translation, _ in selected_words]
+        }
@@ -0,0 +1,325 @@
+"""
+Store of recent learning sessions.
+
+Each session (story, selected words, audio and its sentence cues) lives in its
+own directory, so app instances and sessions never overwrite each other. A
+manifest indexes the sessions in least recently opened order: the last
+session is found without touching the session directories, and the least
+recently opened ones are pruned once the store exceeds its size limit.
+"""
+
+import os
+import json
+import time
+import uuid
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from ..config import SESSION_STORE_DIR, SESSION_STORE_MAX_MB
+from .audio_generator import subtitle_path
+
+_MANIFEST_FILE = "manifest.json"
+_MANIFEST_VERSION = 1
+_STORY_FILE = "story.txt"
+_WORDS_FILE = "words.json"
+_AUDIO_FILE = "audio.mp3"
+_PREVIEW_CHARS = 60
+# Reserved directories that were never saved are removed after this many seconds
+_ABANDONED_SECONDS = 24 * 3600
+
+
+class SessionStore:
+    """Directory of saved sessions with a manifest index."""
+
+    def __init__(self, store_dir: str = None, max_mb: float = SESSION_STORE_MAX_MB):
+        """
+        Open (or create) the store.
+
+        Args:
+            store_dir: Directory holding the sessions (default: SESSION_STORE_DIR)
+            max_mb: Total size above which least recently opened sessions are pruned
+        """
+        self.store_dir = store_dir or SESSION_STORE_DIR
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.manifest_path = os.path.join(self.store_dir, _MANIFEST_FILE)
+        self._lock = threading.Lock()
+        self._manifest_mtime = None
+        # Session ID -> manifest entry, least recently opened first
+        self._entries = OrderedDict()
+
+        os.makedirs(self.store_dir, exist_ok=True)
+        with self._lock:
+            if not self._refresh():
+                self._rebuild()
+            self._remove_abandoned()
+
+    # Manifest
+    def _read_manifest(self) -> Optional[List[Dict]]:
+        """Read the manifest entries, or None if it is missing or unreadable."""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if manifest.get('version') != _MANIFEST_VERSION:
+            return None
+        return manifest.get('sessions', [])
+
+    def _refresh(self) -> bool:
+        """
+        Merge the manifest on disk if another app instance changed it (lock held).
+
+        Returns:
+            False if there is no readable manifest
+        """
+        try:
+            mtime = os.stat(self.manifest_path).st_mtime_ns
+        except OSError:
+            return False
+        if mtime == self._manifest_mtime:
+            return True
+        entries = self._read_manifest()
+        if entries is None:
+            return False
+        on_disk = {entry['id'] for entry in entries}
+        # Sessions the other instance pruned or deleted are gone from disk as well
+        merged = {session_id: entry for session_id, entry in self._entries.items()
+                  if session_id in on_disk or os.path.isdir(self.directory(session_id))}
+        for entry in entries:
+            known = merged.get(entry['id'])
+            if known is None:
+                if self._manifest_mtime is not None and not os.path.isdir(self.directory(entry['id'])):
+                    continue  # Pruned or deleted by this instance
+                merged[entry['id']] = entry
+            elif entry['opened'] > known['opened']:
+                merged[entry['id']] = entry
+        self._entries = OrderedDict(
+            (entry['id'], entry) for entry in sorted(merged.values(), key=lambda entry: entry['opened'])
+        )
+        self._manifest_mtime = mtime
+        return True
+
+    def _rebuild(self):
+        """Rebuild the manifest from the session directories (lock held)."""
+        entries = []
+        for item in os.scandir(self.store_dir):
+            if item.is_dir() and os.path.exists(os.path.join(item.path, _WORDS_FILE)):
+                try:
+                    entries.append(self._make_entry(item.name, os.path.getmtime(item.path)))
+                except (OSError, ValueError) as e:
+                    print(f"⚠️ Skipping unreadable session {item.name}: {e}")
+        entries.sort(key=lambda entry: entry['opened'])
+        self._entries = OrderedDict((entry['id'], entry) for entry in entries)
+        if entries:
+            print(f"📂 Rebuilt session index ({len(entries)} sessions)")
+        self._write_manifest()
+
+    def _write_manifest(self):
+        """Write the manifest atomically (lock held)."""
+        manifest = {'version': _MANIFEST_VERSION, 'sessions': list(self._entries.values())}
+        fd, tmp_path = tempfile.mkstemp(dir=self.store_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self.manifest_path)
+        self._manifest_mtime = os.stat(self.manifest_path).st_mtime_ns
+
+    def _remove_abandoned(self):
+        """Delete reserved session directories that were never saved (lock held)."""
+        now = time.time()
+        for item in os.scandir(self.store_dir):
+            if not item.is_dir() or item.name in self._entries:
+                continue
+            try:
+                abandoned = now - item.stat().st_mtime > _ABANDONED_SECONDS
+            except OSError:
+                continue
+            if abandoned and not os.path.exists(os.path.join(item.path, _WORDS_FILE)):
+                shutil.rmtree(item.path, ignore_errors=True)
+
+    def _make_entry(self, session_id: str, opened: float, language: str = None) -> Dict:
+        """Build the manifest entry of a session from its files."""
+        directory = self.directory(session_id)
+        with open(os.path.join(directory, _WORDS_FILE), 'r', encoding='utf-8') as f:
+            words_data = json.load(f)
+        with open(os.path.join(directory, _STORY_FILE), 'r', encoding='utf-8') as f:
+            preview = f.read(_PREVIEW_CHARS * 2)
+        preview = ' '.join(preview.split())
+        if len(preview) > _PREVIEW_CHARS:
+            preview = preview[:_PREVIEW_CHARS].rsplit(' ', 1)[0] + "…"
+        size = sum(item.stat().st_size for item in os.scandir(directory) if item.is_file())
+        return {
+            'id': session_id,
+            'created': words_data.get('created', opened),
+            'opened': opened,
+            'language': language or words_data.get('language', ''),
+            'preview': preview,
+            'word_count': len(words_data.get('words', [])),
+            'has_audio': os.path.exists(os.path.join(directory, _AUDIO_FILE)),
+            'size': size
+        }
+
+    # Sessions
+    def directory(self, session_id: str) -> str:
+        """Get the directory of a session."""
+        return os.path.join(self.store_dir, session_id)
+
+    def audio_path(self, session_id: str) -> str:
+        """Get the path of a session's audio file."""
+        return os.path.join(self.directory(session_id), _AUDIO_FILE)
+
+    def reserve(self) -> str:
+        """
+        Create the directory of a new session, e.g. to generate its audio into.
+
+        The session is listed once it is saved.
+
+        Returns:
+            str: Session ID (sortable by creation time)
+        """
+        session_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        os.makedirs(self.directory(session_id))
+        return session_id
+
+    def save(self, story: str, selected_words: List[Tuple[str, str, str]], audio_source: str = "",
+             language: str = "", session_id: str = None) -> Dict:
+        """
+        Save a session and make it the last session.
+
+        Args:
+            story: Generated story
+            selected_words: Vocabulary words of the session
+            audio_source: Audio file of the session, if any; moved into the session
+                directory along with its cue file unless it is already there
+            language: Language of the story
+            session_id: ID from reserve (default: a new session)
+
+        Returns:
+            dict: Manifest entry of the session
+        """
+        session_id = session_id or self.reserve()
+        directory = self.directory(session_id)
+        os.makedirs(directory, exist_ok=True)
+
+        if audio_source and os.path.abspath(audio_source) != os.path.abspath(self.audio_path(session_id)):
+            shutil.move(audio_source, self.audio_path(session_id))
+            if os.path.exists(subtitle_path(audio_source)):
+                shutil.move(subtitle_path(audio_source), subtitle_path(self.audio_path(session_id)))
+
+        with open(os.path.join(directory, _STORY_FILE), 'w', encoding='utf-8') as f:
+            f.write(story)
+        now = time.time()
+        words_data = {
+            'created': now,
+            'language': language,
+            'words': [{"word": word, "translation": translation, "pronunciation": pronunciation or ""}
+                      for word, translation, pronunciation in selected_words]
+        }
+        # Written last: its presence marks a complete session
+        with open(os.path.join(directory, _WORDS_FILE), 'w', encoding='utf-8') as f:
+            json.dump(words_data, f, indent=2, ensure_ascii=False)
+
+        entry = self._make_entry(session_id, now, language)
+        with self._lock:
+            self._refresh()
+            self._entries.pop(session_id, None)
+            self._entries[session_id] = entry
+            self._prune()
+            self._write_manifest()
+        return entry
+
+    def load(self, session_id: str) -> Optional[Dict]:
+        """
+        Load a session and make it the last session.
+
+        Args:
+            session_id: ID of the session
+
+        Returns:
+            dict with id, story, selected_words, audio_path and srt_path (empty if
+            the session has no audio or cues), or None if the session is gone
+        """
+        directory = self.directory(session_id)
+        try:
+            with open(os.path.join(directory, _STORY_FILE), 'r', encoding='utf-8') as f:
+                story = f.read()
+            with open(os.path.join(directory, _WORDS_FILE), 'r', encoding='utf-8') as f:
+                words_data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not load session {session_id}: {e}")
+            self.delete(session_id)
+            return None
+
+        with self._lock:
+            self._refresh()
+            entry = self._entries.pop(session_id, None)
+            if entry is not None:
+                entry['opened'] = time.time()
+                self._entries[session_id] = entry
+                self._write_manifest()
+
+        audio_path = self.audio_path(session_id)
+        if not os.path.exists(audio_path):
+            audio_path = ""
+        srt_path = subtitle_path(audio_path) if audio_path else ""
+        return {
+            'id': session_id,
+            'story': story,
+            'selected_words': [(info.get("word", ""), info.get("translation", ""), info.get("pronunciation", ""))
+                               for info in words_data.get('words', [])],
+            'audio_path': audio_path,
+            'srt_path': srt_path if srt_path and os.path.exists(srt_path) else ""
+        }
+
+    def last_session_id(self) -> Optional[str]:
+        """Get the ID of the most recently saved or opened session, or None if there is none."""
+        with self._lock:
+            self._refresh()
+            return next(reversed(self._entries), None)
+
+    def recent(self, limit: int = 20) -> List[Dict]:
+        """
+        List the most recently saved or opened sessions.
+
+        Args:
+            limit: Maximum number of sessions
+
+        Returns:
+            list: Manifest entries (id, created, opened, language, preview,
+                word_count, has_audio, size), most recent first
+        """
+        with self._lock:
+            self._refresh()
+            entries = []
+            for session_id in reversed(self._entries):
+                if len(entries) >= limit:
+                    break
+                entries.append(dict(self._entries[session_id]))
+            return entries
+
+    def delete(self, session_id: str):
+        """Remove a session (or an unsaved reserved directory)."""
+        shutil.rmtree(self.directory(session_id), ignore_errors=True)
+        with self._lock:
+            self._refresh()
+            if self._entries.pop(session_id, None) is not None:
+                self._write_manifest()
+
+    def _prune(self):
+        """Delete least recently opened sessions down to max_bytes; the last one is kept (lock held)."""
+        total = sum(entry['size'] for entry in self._entries.values())
+        while len(self._entries) > 1 and total > self.max_bytes:
+            session_id, entry = self._entries.popitem(last=False)
+            total -= entry['size']
+            shutil.rmtree(self.directory(session_id), ignore_errors=True)
+            print(f"🗑️ Pruned session {session_id} ({entry['size'] / (1024 * 1024):.1f} MB)")
+
+    def stats(self) -> Dict:
+        """Get the session count and total size."""
+        with self._lock:
+            return {
+                'sessions': len(self._entries),
+                'size_mb': round(sum(entry['size'] for entry in self._entries.values()) / (1024 * 1024), 2)
+            }
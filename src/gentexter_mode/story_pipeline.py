@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Story Pipeline
+
+Streams a story from the chat completion and turns it into audio while it is
+still being written: the text is cut into sentence-aligned chunks as it
+arrives, each chunk goes to TTS as soon as it is complete, and the MP3 parts
+are joined in story order at the end.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
+
+from .audio_generator import SENTENCE_END, write_mp3_parts
+
+
+class SentenceChunker:
+    """Cuts streamed text into chunks that end at sentence boundaries."""
+
+    def __init__(self, first_chunk_chars: int = 120, chunk_chars: int = 400):
+        """
+        Args:
+            first_chunk_chars: Minimum length of the first chunk (small, so audio starts early)
+            chunk_chars: Minimum length of later chunks (larger, for fewer requests and smoother prosody)
+        """
+        self.first_chunk_chars = first_chunk_chars
+        self.chunk_chars = chunk_chars
+        self.buffer = ""
+        self.chunks_emitted = 0
+
+    def feed(self, text: str) -> List[str]:
+        """
+        Add streamed text.
+
+        Args:
+            text: Next fragment of the story
+
+        Returns:
+            Chunks completed by this fragment, in order
+        """
+        self.buffer += text
+        chunks = []
+        while True:
+            target = self.first_chunk_chars if self.chunks_emitted == 0 else self.chunk_chars
+            cut = None
+            for match in SENTENCE_END.finditer(self.buffer):
+                if match.end() >= target:
+                    cut = match.end()
+                    break
+            if cut is None:
+                return chunks
+
+            chunk = self.buffer[:cut].strip()
+            self.buffer = self.buffer[cut:]
+            if chunk:
+                chunks.append(chunk)
+                self.chunks_emitted += 1
+
+    def flush(self) -> Optional[str]:
+        """Get the remaining text once the stream has ended (None if nothing is left)."""
+        chunk = self.buffer.strip()
+        self.buffer = ""
+        if not chunk:
+            return None
+        self.chunks_emitted += 1
+        return chunk
+
+
+def replace_in_chunks(chunks: List[str], old: str, new: str) -> bool:
+    """
+    Replace a passage of the chunked story text in place.
+
+    The chunks the passage spans are merged into one, except for leading and
+    trailing chunks whose text did not change; every other chunk keeps its
+    exact text (and its cached audio).
+
+    Args:
+        chunks: Story chunks as produced by SentenceChunker
+        old: Passage to replace (e.g., a paragraph)
+        new: Replacement text
+
+    Returns:
+        True if the passage was found
+    """
+    old, new = old.strip(), new.strip()
+    # Smallest range: the first chunk the passage ends in, then the last one it starts in
+    for end in range(1, len(chunks) + 1):
+        if old not in " ".join(chunks[:end]):
+            continue
+        for start in range(end - 1, -1, -1):
+            joined = " ".join(chunks[start:end])
+            if old in joined:
+                break
+        changed = joined.replace(old, new, 1)
+        while end - start > 1 and changed.startswith(chunks[start] + " "):
+            changed = changed[len(chunks[start]) + 1:]
+            start += 1
+        while end - start > 1 and changed.endswith(" " + chunks[end - 1]):
+            changed = changed[:-len(chunks[end - 1]) - 1]
+            end -= 1
+        chunks[start:end] = [changed]
+        return True
+    return False
+
+
+@dataclass
+class PipelineResult:
+    """Outcome and timings of one pipeline run."""
+    story: str
+    audio_path: str  # Empty if audio generation failed
+    chunks: List[str] = field(default_factory=list)
+    chunk_durations: List[float] = field(default_factory=list)  # Seconds of audio per chunk
+    audio_error: Optional[Exception] = None
+    first_audio_seconds: Optional[float] = None  # Until the first chunk's audio was ready
+    text_seconds: float = 0.0  # Until the story stream ended
+    total_seconds: float = 0.0
+
+
+class StoryAudioPipeline:
+    """Overlaps story generation and TTS: stream -> sentence chunks -> concurrent TTS -> concatenation."""
+
+    def __init__(self, text_generator, audio_generator, max_tts_workers: int = 3,
+                 first_chunk_chars: int = 120, chunk_chars: int = 400):
+        """
+        Args:
+            text_generator: TextGenerator providing stream_story
+            audio_generator: AudioGenerator providing synthesize
+            max_tts_workers: TTS requests allowed to run at the same time
+            first_chunk_chars: Minimum length of the first audio chunk
+            chunk_chars: Minimum length of later audio chunks
+        """
+        self.text_generator = text_generator
+        self.audio_generator = audio_generator
+        self.max_tts_workers = max_tts_workers
+        self.first_chunk_chars = first_chunk_chars
+        self.chunk_chars = chunk_chars
+
+    def run(self, vocab_list: List[Tuple[str, str, str]], audio_path: str,
+            language: str = "French", word_count: int = 300,
+            text_callback: Optional[Callable[[str], None]] = None,
+            voice: str = None) -> PipelineResult:
+        """
+        Generate a story and its audio.
+
+        Errors from the story stream are raised; TTS errors only leave the
+        result without audio (see PipelineResult.audio_error).
+
+        Args:
+            vocab_list: List of (word, translation, pronunciation) tuples
+            audio_path: Path of the combined MP3 file
+            language: Language of the story
+            word_count: Approximate story length in words
+            text_callback: Optional callback receiving each streamed text fragment
+            voice: TTS voice (default: the audio generator's default)
+
+        Returns:
+            PipelineResult with the story, audio path and timings
+        """
+        start = time.perf_counter()
+        chunker = SentenceChunker(self.first_chunk_chars, self.chunk_chars)
+        result = PipelineResult(story="", audio_path="")
+        futures = []
+        fragments = []
+
+        def synthesize(chunk: str, index: int) -> bytes:
+            audio = self.audio_generator.synthesize(chunk, voice)
+            if index == 0:
+                result.first_audio_seconds = time.perf_counter() - start
+            return audio
+
+        with ThreadPoolExecutor(max_workers=self.max_tts_workers) as pool:
+            def submit(chunk: str):
+                futures.append(pool.submit(synthesize, chunk, len(futures)))
+                result.chunks.append(chunk)
+
+            try:
+                for fragment in self.text_generator.stream_story(vocab_list, language, word_count):
+                    fragments.append(fragment)
+                    if text_callback:
+                        text_callback(fragment)
+                    for chunk in chunker.feed(fragment):
+                        submit(chunk)
+                tail = chunker.flush()
+                if tail:
+                    submit(tail)
+            except Exception:
+                for future in futures:
+                    future.cancel()
+                raise
+
+            result.story = "".join(fragments).strip()
+            result.text_seconds = time.perf_counter() - start
+
+            parts = []
+            for future in futures:
+                try:
+                    parts.append(future.result())
+                except Exception as e:
+                    result.audio_error = e
+                    for pending in futures:
+                        pending.cancel()
+                    break
+
+        if parts and result.audio_error is None:
+            try:
+                result.chunk_durations = write_mp3_parts(parts, audio_path)
+                result.audio_path = audio_path
+            except (OSError, ValueError) as e:
+                result.audio_error = e
+
+        result.total_seconds = time.perf_counter() - start
+        return result
@@ -6,13 +6,19 @@ Handles story generation using OpenAI API.
 """
 
 import os
-from typing import List, Tuple
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 from dotenv import load_dotenv
-import openai
+
+from ..shared.openai_client import get_client, with_current_priority
+from ..shared.vocab_coverage import check_coverage
 
 # Load environment variables from .env file
 load_dotenv()
 
+PARAGRAPH_BREAK = re.compile(r'(\n\s*\n)')
+
 
 class TextGenerator:
     """Handles text generation using OpenAI API."""
@@ -22,13 +28,10 @@ class TextGenerator:
         if not self.api_key:
             raise ValueError("OPENAI_API_KEY not found in environment variables")
         
-        self.client = openai.OpenAI(api_key=self.api_key)
+        self.client = get_client(self.api_key)
     
-    def generate_story(self, vocab_list: List[Tuple[str, str, str]], 
-                      language: str = "French", 
-                      word_count: int = 300) -> str:
-        """Generate a story incorporating the vocabulary words."""
-        
+    def _story_prompt(self, vocab_list: List[Tuple[str, str, str]], language: str, word_count: int) -> str:
+        """Build the story prompt for a vocabulary list."""
         if not vocab_list:
             raise ValueError("No vocabulary words provided for story generation")
         
@@ -53,11 +56,19 @@ Requirements:
 - Make sure the story flows well and is enjoyable to read
 
 Please write only the story in {language}, no other text."""
+        return prompt
+    
+    def generate_story(self, vocab_list: List[Tuple[str, str, str]], 
+                      language: str = "French", 
+                      word_count: int = 300) -> str:
+        """Generate a story incorporating the vocabulary words."""
+        
+        prompt = self._story_prompt(vocab_list, language, word_count)
 
         try:
             print(f"🎯 Generating story with {len(vocab_list)} vocabulary words...")
             
-            response = self.client.chat.completions.create(
+            response = self.client.chat_completion(
                 model="gpt-4",
                 messages=[{"role": "user", "content": prompt}],
                 max_tokens=int(word_count * 1.5),  # Allow some buffer
@@ -77,6 +88,42 @@ Please write only the story in {language}, no other text."""
             print(f"❌ Error generating story: {e}")
             raise
     
+    def stream_story(self, vocab_list: List[Tuple[str, str, str]], 
+                     language: str = "French", 
+                     word_count: int = 300) -> Iterator[str]:
+        """
+        Generate a story like generate_story, yielding text as it is produced.
+        
+        Args:
+            vocab_list: List of (word, translation, pronunciation) tuples
+            language: Language of the story
+            word_count: Approximate story length in words
+        
+        Yields:
+            Text fragments; joined and stripped they form the story
+        """
+        
+        prompt = self._story_prompt(vocab_list, language, word_count)
+        print(f"🎯 Streaming story with {len(vocab_list)} vocabulary words...")
+        
+        characters = 0
+        try:
+            for delta in self.client.chat_completion_stream(
+                model="gpt-4",
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=int(word_count * 1.5),  # Allow some buffer
+                temperature=0.7
+            ):
+                characters += len(delta)
+                yield delta
+        except Exception as e:
+            print(f"❌ Error generating story: {e}")
+            raise
+        
+        if not characters:
+            raise ValueError("Empty story generated")
+        print(f"✅ Story streamed successfully ({characters} characters)")
+    
     def generate_contextual_story(self, vocab_list: List[Tuple[str, str, str]], 
                                  context: str, 
                                  language: str = "French") -> str:
@@ -104,7 +151,7 @@ Requirements:
 Please write only the story in {language}, no other text."""
 
         try:
-            response = self.client.chat.completions.create(
+            response = self.client.chat_completion(
                 model="gpt-4",
                 messages=[{"role": "user", "content": prompt}],
                 max_tokens=500,
@@ -118,25 +165,162 @@ Please write only the story in {language}, no other text."""
             print(f"❌ Error generating contextual story: {e}")
             raise
     
-    def validate_story_contains_words(self, story: str, vocab_list: List[Tuple[str, str, str]]) -> dict:
-        """Check which vocabulary words are actually used in the generated story."""
-        story_lower = story.lower()
+    def validate_story_contains_words(self, story: str, vocab_list: List[Tuple[str, str, str]],
+                                      lemmatize: Optional[Callable[[str], str]] = None) -> dict:
+        """
+        Check which vocabulary words are actually used in the generated story.
         
-        found_words = []
-        missing_words = []
+        Words are matched as tokens, so inflected forms count ("fâchée" for
+        "se fâcher") and substrings do not ("mal" in "normal").
         
-        for word, translation, pronunciation in vocab_list:
-            word_lower = word.lower()
-            if word_lower in story_lower:
-                found_words.append((word, translation, pronunciation))
+        Args:
+            story: Generated story
+            vocab_list: List of (word, translation, pronunciation) tuples
+            lemmatize: Optional word -> lemma function (e.g., CachedLemmatizer.lemmatize)
+        
+        Returns:
+            dict: found_words, missing_words, coverage_percentage, and spans
+                (word -> (start, end) character spans in the story)
+        """
+        return check_coverage(story, vocab_list, lemmatize)
+    
+    def _rewrite_paragraph(self, paragraph: str, words: List[Tuple[str, str, str]], keep: List[str],
+                           language: str) -> str:
+        """Ask for one paragraph rewritten to use the given vocabulary words."""
+        words_str = ", ".join(f"{entry[0]} ({entry[1]})" for entry in words)
+        keep_str = f"\n- Keep using these words: {', '.join(keep)}" if keep else ""
+        prompt = f"""Here is a paragraph from a story in {language}:
+
+{paragraph}
+
+Rewrite this paragraph so that it naturally uses these vocabulary words: {words_str}
+
+Requirements:
+- Conjugate or inflect the words as the sentence needs
+- Keep the events, tone and length close to the original{keep_str}
+
+Please write only the rewritten paragraph in {language}, no other text."""
+        response = self.client.chat_completion(
+            model="gpt-4",
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=int(len(paragraph.split()) * 2.5) + 60,
+            temperature=0.7
+        )
+        content = response.choices[0].message.content
+        return content.strip() if content else ""
+    
+    def _insert_sentences(self, paragraph: str, words: List[Tuple[str, str, str]], language: str) -> str:
+        """Ask for one or two sentences that continue a paragraph using the given words."""
+        words_str = ", ".join(f"{entry[0]} ({entry[1]})" for entry in words)
+        prompt = f"""Here is the end of a story in {language}:
+
+{paragraph}
+
+Write one or two sentences that continue it naturally and use these vocabulary words: {words_str}
+
+Please write only the new sentences in {language}, no other text."""
+        response = self.client.chat_completion(
+            model="gpt-4",
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=40 * len(words) + 60,
+            temperature=0.7
+        )
+        content = response.choices[0].message.content
+        return content.strip() if content else ""
+    
+    def repair_story(self, story: str, vocab_list: List[Tuple[str, str, str]],
+                     language: str = "French",
+                     lemmatize: Optional[Callable[[str], str]] = None,
+                     max_rounds: int = 2) -> Dict:
+        """
+        Work missing vocabulary words into a story without regenerating it.
+        
+        The first round rewrites only the paragraphs the missing words are
+        assigned to (concurrently, one short request each); a rewrite is
+        rejected if it drops words the paragraph already used. Later rounds
+        append one or two sentences for whatever is still missing.
+        
+        Args:
+            story: Generated story
+            vocab_list: List of (word, translation, pronunciation) tuples
+            language: Language of the story
+            lemmatize: Optional word -> lemma function for the coverage check
+            max_rounds: Maximum number of repair rounds
+        
+        Returns:
+            dict: story (repaired), coverage (see validate_story_contains_words),
+                replacements (list of (old paragraph, new paragraph)) and requests
+        """
+        coverage = self.validate_story_contains_words(story, vocab_list, lemmatize)
+        pieces = PARAGRAPH_BREAK.split(story)  # Paragraphs at even indices, breaks at odd ones
+        replacements = []
+        requests = 0
+        
+        for round_number in range(max_rounds):
+            missing = coverage['missing_words']
+            if not missing:
+                break
+            
+            paragraph_indices = [i for i in range(0, len(pieces), 2) if pieces[i].strip()]
+            if not paragraph_indices:
+                break
+            if round_number == 0:
+                # Spread the words over the longer paragraphs
+                long_paragraphs = [i for i in paragraph_indices if len(pieces[i]) >= 200] or paragraph_indices
+                assignments = {}
+                for n, entry in enumerate(missing):
+                    index = long_paragraphs[n * len(long_paragraphs) // len(missing)]
+                    assignments.setdefault(index, []).append(entry)
+                
+                # Words each paragraph uses already and must keep
+                starts, offset = {}, 0
+                for i, piece in enumerate(pieces):
+                    starts[i] = offset
+                    offset += len(piece)
+                keep = {index: [word for word, spans in coverage['spans'].items()
+                                if any(starts[index] <= start < starts[index] + len(pieces[index])
+                                       for start, _ in spans)]
+                        for index in assignments}
+                
+                print(f"🩹 Rewriting {len(assignments)} paragraph(s) for {len(missing)} missing word(s)...")
+                with ThreadPoolExecutor(max_workers=len(assignments)) as pool:
+                    rewrites = {
+                        index: pool.submit(with_current_priority(self._rewrite_paragraph), pieces[index], words, keep[index], language)
+                        for index, words in assignments.items()
+                    }
+                requests += len(rewrites)
+                for index, future in rewrites.items():
+                    try:
+                        rewritten = future.result()
+                    except Exception as e:
+                        print(f"⚠️ Paragraph rewrite failed: {e}")
+                        continue
+                    kept_entries = [(word, "", "") for word in keep[index]]
+                    if rewritten and not self.validate_story_contains_words(
+                            rewritten, kept_entries, lemmatize)['missing_words']:
+                        replacements.append((pieces[index], rewritten))
+                        pieces[index] = rewritten
             else:
-                missing_words.append((word, translation, pronunciation))
+                last = paragraph_indices[-1]
+                print(f"🩹 Adding sentences for {len(missing)} missing word(s)...")
+                requests += 1
+                try:
+                    addition = self._insert_sentences(pieces[last], missing, language)
+                except Exception as e:
+                    print(f"⚠️ Sentence insertion failed: {e}")
+                    addition = ""
+                if addition:
+                    extended = f"{pieces[last].rstrip()} {addition}"
+                    replacements.append((pieces[last], extended))
+                    pieces[last] = extended
+            
+            story = "".join(pieces)
+            coverage = self.validate_story_contains_words(story, vocab_list, lemmatize)
         
-        return {
-            'found_words': found_words,
-            'missing_words': missing_words,
-            'coverage_percentage': (len(found_words) / len(vocab_list)) * 100 if vocab_list else 0
-        }
+        if requests:
+            print(f"✅ Story repaired with {requests} request(s): "
+                  f"{coverage['coverage_percentage']:.0f}% of the words used")
+        return {'story': story, 'coverage': coverage, 'replacements': replacements, 'requests': requests}
     
     def save_story_to_file(self, story: str, file_path: str, vocab_list: List[Tuple[str, str, str]] = None):
         """Save the generated story to a text file with optional vocabulary list."""
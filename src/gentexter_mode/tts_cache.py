@@ -0,0 +1,150 @@
+"""
+Content-addressed TTS audio cache.
+Stores synthesized MP3s as files named by a hash of (text, voice, model, speed),
+so the same clip is only ever synthesized once, with size-bounded LRU eviction.
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from ..config import TTS_CACHE_DIR, TTS_CACHE_MAX_MB
+
+# Evict in batches so the directory is not trimmed on every insert
+_EVICTION_SLACK = 0.05
+
+
+class TTSCache:
+    """Directory of MP3 files keyed by synthesis parameters."""
+
+    def __init__(self, cache_dir: str = None, max_mb: float = TTS_CACHE_MAX_MB):
+        """
+        Open (or create) the cache directory.
+
+        Args:
+            cache_dir: Directory holding the MP3 files (default: TTS_CACHE_DIR)
+            max_mb: Total size above which least recently used clips are evicted
+        """
+        self.cache_dir = cache_dir or TTS_CACHE_DIR
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Key -> file size, least recently used first (file mtime is the access time)
+        files = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and entry.name.endswith('.mp3'):
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.name[:-4], stat.st_size))
+        files.sort()
+        self._entries = OrderedDict((key, size) for _, key, size in files)
+        self._total_bytes = sum(self._entries.values())
+
+    @staticmethod
+    def make_key(text: str, voice: str, model: str, speed: float) -> str:
+        """Build the cache key for a synthesis request."""
+        payload = json.dumps([text, voice, model, round(speed, 2)], ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.mp3")
+
+    def lookup(self, key: str) -> Optional[str]:
+        """
+        Find a cached clip and mark it as recently used.
+
+        Args:
+            key: Key from make_key
+
+        Returns:
+            Path of the MP3 file, or None on a miss
+        """
+        path = self._path(key)
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            try:
+                os.utime(path)
+            except OSError:
+                # Removed behind our back (e.g., by another app instance)
+                self._total_bytes -= self._entries.pop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return path
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Get a cached clip's MP3 data, or None on a miss."""
+        path = self.lookup(key)
+        if path is None:
+            return None
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def put(self, key: str, data: bytes):
+        """Store MP3 data under a key."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        self._commit(key, tmp_path)
+
+    def put_file(self, key: str, source_path: str):
+        """Store a copy of an MP3 file under a key."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        os.close(fd)
+        shutil.copyfile(source_path, tmp_path)
+        self._commit(key, tmp_path)
+
+    def _commit(self, key: str, tmp_path: str):
+        """Move a written temp file into place, evicting when over capacity."""
+        size = os.path.getsize(tmp_path)
+        with self._lock:
+            os.replace(tmp_path, self._path(key))
+            self._total_bytes += size - self._entries.pop(key, 0)
+            self._entries[key] = size
+            if self._total_bytes > self.max_bytes * (1 + _EVICTION_SLACK):
+                self._evict()
+
+    def _evict(self):
+        """Delete least recently used clips down to max_bytes (lock held)."""
+        while self._entries and self._total_bytes > self.max_bytes:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def stats(self) -> Dict:
+        """Get hit/miss counters, clip count and total size."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': len(self._entries),
+            'size_mb': round(self._total_bytes / (1024 * 1024), 2)
+        }
+
+    def clear(self):
+        """Remove all cached clips."""
+        with self._lock:
+            for key in self._entries:
+                try:
+                    os.remove(self._path(key))
+                except OSError:
+                    pass
+            self._entries.clear()
+            self._total_bytes = 0
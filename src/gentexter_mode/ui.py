@@ -1,10 +1,12 @@
-from tkinter import Tk, Frame, Button, Label, filedialog, messagebox, ttk, Entry, Checkbutton, BooleanVar, IntVar, Text, Scrollbar, DoubleVar
+from tkinter import Tk, Toplevel, Frame, Button, Label, Listbox, filedialog, messagebox, ttk, Entry, Checkbutton, BooleanVar, IntVar, StringVar, Text, Scrollbar, DoubleVar
 import tkinter.messagebox as msgbox
 from .orchestrator import VocabularyApp
+from .session_prefetcher import SessionPrefetcher
 from ..shared.reader_ui import ReaderUI
 from ..shared.styles import apply_modern_theme, Colors, Fonts, Spacing
 from ..shared.style_utils import StyledWidgets, TileStyles, LayoutHelpers, CommonPatterns
 import os
+import time
 import threading
 import numpy as np
 
@@ -25,10 +27,23 @@ class VocabularyInterface:
         self.import_new_list = BooleanVar(value=False)
         self.use_test_mode = BooleanVar(value=False)
         self.use_last_text = BooleanVar(value=False)
+        self.session_choice = StringVar(value="")
+        self.recent_sessions = []
         self.random_sample_size = IntVar(value=40)
         self.final_selection_size = IntVar(value=20)
         
+        # Keep ready-made sessions in the background so generating is instant
+        self.prefetcher = SessionPrefetcher(self.vocab_app, self.random_sample_size.get(),
+                                            self.final_selection_size.get())
+        self.prefetcher.start()
+        
         self.setup_ui()
+    
+    def go_back(self):
+        """Stop background work and return to the menu"""
+        self.prefetcher.stop()
+        if self.back_callback:
+            self.back_callback()
 
     def setup_ui(self):
         # Apply modern theme
@@ -43,7 +58,7 @@ class VocabularyInterface:
         header_frame.pack(fill='x', pady=(0, Spacing.MD))
 
         if self.back_callback:
-            back_button = StyledWidgets.create_back_button(header_frame, self.back_callback, "← Menu")
+            back_button = StyledWidgets.create_back_button(header_frame, self.go_back, "← Menu")
             back_button.pack(side='left')
 
         # Title
@@ -74,6 +89,13 @@ class VocabularyInterface:
                                   bg=Colors.WHITE, fg=Colors.DARK_GRAY,
                                   activebackground=Colors.WHITE)
         import_check.pack(anchor='w', pady=2)
+        
+        # Words that are frequent in the user's own transcriptions (see CorpusIndex)
+        self.corpus_button = ttk.Button(vocab_source_frame,
+                                        text="🔎 Find words in my transcriptions",
+                                        command=self.find_corpus_words,
+                                        style='Modern.TButton')
+        self.corpus_button.pack(anchor='w', pady=(2, Spacing.SM))
 
         test_check = Checkbutton(vocab_source_frame, 
                                 text="🧪 Test mode (use preset data)", 
@@ -84,12 +106,18 @@ class VocabularyInterface:
         test_check.pack(anchor='w', pady=2)
 
         last_text_check = Checkbutton(vocab_source_frame, 
-                                      text="📄 Use last generated text", 
+                                      text="📄 Use a recent generated text", 
                                       variable=self.use_last_text,
+                                      command=self.refresh_recent_sessions,
                                       font=Fonts.BODY,
                                       bg=Colors.WHITE, fg=Colors.INFO,
                                       activebackground=Colors.WHITE)
         last_text_check.pack(anchor='w', pady=2)
+        
+        # Saved sessions to reopen (the last one is preselected)
+        self.session_combo = ttk.Combobox(vocab_source_frame, textvariable=self.session_choice,
+                                          state='disabled', font=Fonts.BODY, width=48)
+        self.session_combo.pack(anchor='w', padx=(Spacing.LG, 0), pady=2)
 
         # Batch size configuration
         batch_frame = Frame(config_content, bg=Colors.WHITE)
@@ -168,18 +196,104 @@ class VocabularyInterface:
                 # User canceled file selection
                 self.import_new_list.set(False)
 
+    def find_corpus_words(self):
+        """Mine the transcription library for vocabulary candidates in the background"""
+        self.corpus_button.config(state='disabled', text="🔎 Searching transcriptions...")
+        
+        def search_task():
+            try:
+                candidates = self.vocab_app.find_corpus_vocabulary(progress_callback=print)
+            except Exception as e:
+                print(f"❌ Could not search transcriptions: {e}")
+                candidates = None
+            self.master.after(0, lambda: self.on_corpus_words_found(candidates))
+        
+        threading.Thread(target=search_task, daemon=True).start()
+    
+    def on_corpus_words_found(self, candidates):
+        """Show the mined candidates so the user can pick which ones to import"""
+        self.corpus_button.config(state='normal', text="🔎 Find words in my transcriptions")
+        if candidates is None:
+            return
+        if not candidates:
+            print("ℹ️ No new vocabulary found in your transcriptions")
+            return
+        
+        dialog = Toplevel(self.master)
+        dialog.title("Words from your transcriptions")
+        dialog.geometry("460x480")
+        dialog.configure(bg=Colors.WHITE)
+        dialog.transient(self.master)
+        
+        Label(dialog, text=f"{len(candidates)} words you hear often but rarely see elsewhere.\n"
+                           "Deselect the ones you don't want to learn:",
+              font=Fonts.BODY, bg=Colors.WHITE, fg=Colors.DARK_GRAY, justify='left').pack(
+            anchor='w', padx=Spacing.LG, pady=(Spacing.LG, Spacing.SM))
+        
+        list_frame = Frame(dialog, bg=Colors.WHITE)
+        list_frame.pack(fill='both', expand=True, padx=Spacing.LG)
+        scrollbar = Scrollbar(list_frame)
+        scrollbar.pack(side='right', fill='y')
+        candidate_list = Listbox(list_frame, selectmode='multiple', font=Fonts.BODY,
+                                 yscrollcommand=scrollbar.set, activestyle='none')
+        candidate_list.pack(side='left', fill='both', expand=True)
+        scrollbar.config(command=candidate_list.yview)
+        
+        for candidate in candidates:
+            other_forms = [form for form in candidate['forms'] if form != candidate['word']]
+            forms = f"  ({', '.join(other_forms[:3])})" if other_forms else ""
+            candidate_list.insert('end', f"{candidate['word']}{forms} · {candidate['count']}× "
+                                         f"in {candidate['documents']} files")
+        candidate_list.select_set(0, 'end')
+        
+        def import_selected():
+            selected = [candidates[i] for i in candidate_list.curselection()]
+            dialog.destroy()
+            if selected:
+                self.import_corpus_words(selected)
+        
+        LayoutHelpers.create_button_row(dialog, [
+            {'text': "Import selected", 'command': import_selected, 'style': 'Accent.TButton'},
+            {'text': "Cancel", 'command': dialog.destroy},
+        ]).pack(pady=Spacing.LG)
+    
+    def import_corpus_words(self, candidates):
+        """Translate and import the chosen candidates in the background"""
+        self.corpus_button.config(state='disabled', text="🌐 Importing words...")
+        
+        def import_task():
+            try:
+                self.vocab_app.import_corpus_vocabulary(candidates, progress_callback=print)
+            except Exception as e:
+                print(f"❌ Could not import words: {e}")
+            finally:
+                self.master.after(0, lambda: self.corpus_button.config(
+                    state='normal', text="🔎 Find words in my transcriptions"))
+        
+        threading.Thread(target=import_task, daemon=True).start()
+    
+    def refresh_recent_sessions(self):
+        """Fill the session picker while 'Use a recent generated text' is checked"""
+        if not self.use_last_text.get():
+            self.session_combo.config(state='disabled')
+            return
+        
+        self.recent_sessions = self.vocab_app.list_recent_sessions()
+        labels = []
+        for entry in self.recent_sessions:
+            created = time.strftime('%d %b %H:%M', time.localtime(entry['created']))
+            audio = " 🔊" if entry['has_audio'] else ""
+            labels.append(f"{created} · {entry['word_count']} words{audio} · {entry['preview']}")
+        self.session_combo.config(values=labels, state='readonly' if labels else 'disabled')
+        if labels:
+            self.session_combo.current(0)
+        else:
+            self.session_choice.set("No saved sessions")
+    
     def generate_wordtext(self):
         """Generate wordtext using the modern backend"""
         try:
-            # Pull latest from Git before generating words
-            git_status = None
-            if hasattr(self.vocab_app, 'git_manager'):
-                print("🔄 Pulling latest vocabulary from Git...")
-                git_status = self.vocab_app.git_manager.pull_latest()
-                if git_status:
-                    print("✅ Git pull successful. Using latest vocabulary.")
-                else:
-                    print("⚠️ Git pull failed. Using local vocabulary.")
+            # The Git pull runs in the background (see SessionPrefetcher.wait_for_sync)
             # Check if test mode is enabled
             if self.use_test_mode.get():
                 self.run_test_mode()
@@ -206,6 +320,13 @@ class VocabularyInterface:
                 print("❌ Please enable 'Use vocabulary databank' option")
                 return
             
+            # Serve a prefetched session if one is ready
+            session = self.prefetcher.take(random_size, urgent_size)
+            if session:
+                print("⚡ Using a prefetched session")
+                self.on_generation_complete(session)
+                return
+            
             # Disable generate button during processing
             self.generate_button.config(state='disabled', text="Generating...")
             print("🚀 Generating Text...")
@@ -214,14 +335,19 @@ class VocabularyInterface:
             def generation_task():
                 try:
                     print("Starting generation task...")
+                    # Generate from the pulled vocabulary, not a stale local copy
+                    self.prefetcher.wait_for_sync()
                     
-                    # Run the complete learning session
+                    # Run the complete learning session; the story is shown while it is written
                     result = self.vocab_app.run_learning_session(
                         random_sample_size=random_size,
                         final_selection_size=urgent_size,
                         language="French",
                         generate_audio=True,
-                        import_from_downloads=False
+                        import_from_downloads=False,
+                        text_callback=lambda fragment: self.master.after(
+                            0, lambda f=fragment: self.on_story_fragment(f)
+                        )
                     )
                     
                     print(f"Generation task completed with result: {len(result.get('selected_words', []))} words")
@@ -256,6 +382,10 @@ class VocabularyInterface:
             # Disable generate button during processing
             self.generate_button.config(state='disabled', text="Loading...")
             
+            # The session picked in the list, or the last session
+            index = self.session_combo.current()
+            session_id = self.recent_sessions[index]['id'] if 0 <= index < len(self.recent_sessions) else None
+            
             def load_task():
                 try:
                     print("Loading last session...")
@@ -269,10 +399,15 @@ class VocabularyInterface:
                         else:
                             print("⚠️ Git pull failed (proceeding with local files)")
                     
-                    # Load last session data
-                    result = self.vocab_app.load_last_session(
-                        progress_callback=lambda msg: print(f"📂 {msg}")
-                    )
+                    # Load the session data
+                    if session_id:
+                        result = self.vocab_app.load_session(
+                            session_id, progress_callback=lambda msg: print(f"📂 {msg}")
+                        )
+                    else:
+                        result = self.vocab_app.load_last_session(
+                            progress_callback=lambda msg: print(f"📂 {msg}")
+                        )
                     
                     print(f"Load task completed with story length: {len(result.get('story', ''))}")
                     
@@ -301,12 +436,30 @@ class VocabularyInterface:
             print(f"❌ Error starting load: {str(e)}")
             self.generate_button.config(state='normal', text="📖\nGenerate\nWordtext")
 
+    def on_story_fragment(self, fragment):
+        """Show streamed story text, opening the reader with the first fragment"""
+        if not hasattr(self, 'review_interface'):
+            self.show_review_interface([], "", "", streaming=True)
+        if hasattr(self, 'review_interface') and self.review_interface.streaming:
+            self.review_interface.append_story_text(fragment)
+    
     def on_generation_complete(self, result):
         """Handle successful generation completion"""
         try:
             selected_words = result.get('selected_words', [])
             story = result.get('story', '')
             audio_path = result.get('audio_path', '')
+            srt_path = result.get('srt_path', '')
+            
+            if hasattr(self, 'review_interface') and self.review_interface.streaming:
+                # The reader is already open with the streamed story
+                if selected_words and story:
+                    print(f"✅ Generation complete! {len(selected_words)} words selected")
+                    self.review_interface.finish_streaming(selected_words, story, audio_path, srt_path)
+                else:
+                    print("❌ Story generation failed")
+                    self.return_from_review()
+                return
             
             if selected_words:
                 if self.use_test_mode.get():
@@ -315,7 +468,7 @@ class VocabularyInterface:
                     print(f"✅ Generation complete! {len(selected_words)} words selected")
                 
                 # Start review interface
-                self.show_review_interface(selected_words, story, audio_path)
+                self.show_review_interface(selected_words, story, audio_path, srt_path=srt_path)
             else:
                 print("❌ No words were selected for the story")
             
@@ -325,6 +478,8 @@ class VocabularyInterface:
     def on_generation_error(self, error_message):
         """Handle generation errors"""
         print(error_message)
+        if hasattr(self, 'review_interface') and self.review_interface.streaming:
+            self.return_from_review()
         self.generate_button.config(state='normal', text="📖\nGenerate\nWordtext")
 
     def on_load_complete(self, result):
@@ -332,6 +487,7 @@ class VocabularyInterface:
         try:
             story = result.get('story', '')
             audio_path = result.get('audio_path', '')
+            srt_path = result.get('srt_path', '')
             selected_words = result.get('selected_words', [])
             
             if story:
@@ -354,7 +510,7 @@ class VocabularyInterface:
                     print("⚠️ No saved vocabulary words found, using placeholders")
                 
                 # Start review interface with loaded content
-                self.show_review_interface(review_words, story, audio_path)
+                self.show_review_interface(review_words, story, audio_path, srt_path=srt_path)
             else:
                 print("❌ No saved text found. Generate new content first.")
             
@@ -436,8 +592,8 @@ Où que nous allions, ces mots nous aident. Maintenant, vous savez comment utili
             print(f"❌ Test mode failed: {str(e)}")
             self.generate_button.config(state='normal', text="📖\nGenerate\nWordtext")
     
-    def show_review_interface(self, review_data, generated_text, audio_path):
-        """Show the in-app review interface"""
+    def show_review_interface(self, review_data, generated_text, audio_path, streaming=False, srt_path=""):
+        """Show the in-app review interface (streaming: the story is still being generated)"""
         try:
             # Hide the main interface
             for widget in self.master.winfo_children():
@@ -450,7 +606,9 @@ Où que nous allions, ces mots nous aident. Maintenant, vous savez comment utili
                 generated_text, 
                 audio_path,
                 back_callback=self.return_from_review,
-                vocab_app=self.vocab_app
+                vocab_app=self.vocab_app,
+                streaming=streaming,
+                srt_path=srt_path
             )
             
         except Exception as e:
@@ -477,13 +635,16 @@ Où que nous allions, ces mots nous aident. Maintenant, vous savez comment utili
 class ReviewInterface:
     """3-stage vocabulary review: READ → TILE → STATS"""
     
-    def __init__(self, master, review_data, generated_text, audio_path, back_callback=None, vocab_app=None):
+    def __init__(self, master, review_data, generated_text, audio_path, back_callback=None, vocab_app=None,
+                 streaming=False, srt_path=""):
         self.master = master
         self.review_data = review_data
         self.generated_text = generated_text
         self.audio_path = audio_path
+        self.srt_path = srt_path  # Sentence cues of the audio, for highlighting during playback
         self.back_callback = back_callback
         self.vocab_app = vocab_app
+        self.streaming = streaming  # Story still being generated; review opens when it is done
         
         # Review session state
         self.current_view = "READ"  # READ → TILE → STATS
@@ -510,16 +671,19 @@ class ReviewInterface:
         self.content_frame.pack(fill='both', expand=True)
 
     def _sync_with_git(self):
-        """Sync with Git at session start"""
+        """Sync with Git at session start (in the background, so the reader opens immediately)"""
         if self.vocab_app and hasattr(self.vocab_app, 'git_manager'):
-            print("🔄 Syncing with Git repository...")
-            success = self.vocab_app.git_manager.pull_latest()
-            if success:
-                print("✅ Successfully synced with Git repository")
-                if hasattr(self.vocab_app, 'database_manager'):
-                    self.vocab_app.database_manager._refresh_word_stats()
-            else:
-                print("⚠️ Failed to sync with Git (using local data)")
+            def sync_task():
+                print("🔄 Syncing with Git repository...")
+                success = self.vocab_app.git_manager.pull_latest()
+                if success:
+                    print("✅ Successfully synced with Git repository")
+                    if hasattr(self.vocab_app, 'database_manager'):
+                        self.vocab_app.database_manager._refresh_word_stats()
+                else:
+                    print("⚠️ Failed to sync with Git (using local data)")
+            
+            threading.Thread(target=sync_task, daemon=True).start()
     
     def _setup_window(self):
         """Setup window configuration"""
@@ -551,11 +715,37 @@ class ReviewInterface:
             title="Reading Practice",
             audio_path=self.audio_path,
             text_content=self.generated_text,
-            back_callback=None  # No back button in this view
+            srt_path=self.srt_path or None,
+            back_callback=None,  # No back button in this view
+            streaming=self.streaming
         )
         
         # Add navigation to tile view by finding and modifying the header
-        self._add_navigation_to_reader_header(reading_frame)
+        if not self.streaming:
+            self._add_navigation_to_reader_header(reading_frame)
+            self.reader_ui.show_target_words(self._session_words())
+    
+    def _session_words(self):
+        """Get the vocabulary entries of the session (review data holds tuples or dicts)"""
+        return [item['word'] if isinstance(item, dict) else item[0] for item in self.review_data]
+    
+    def append_story_text(self, fragment):
+        """Show the next part of the story while it is being generated"""
+        self.generated_text += fragment
+        if self.reader_ui and self.current_view == "READ":
+            self.reader_ui.append_text(fragment)
+    
+    def finish_streaming(self, review_data, generated_text, audio_path, srt_path=""):
+        """Complete the session once story and audio are ready"""
+        self.streaming = False
+        self.review_data = review_data
+        self.generated_text = generated_text
+        self.audio_path = audio_path
+        self.srt_path = srt_path
+        if self.reader_ui and self.current_view == "READ":
+            self.reader_ui.finish_streaming(generated_text, audio_path, srt_path or None)
+            self.reader_ui.show_target_words(self._session_words())
+            self._add_navigation_to_reader_header(self.master.winfo_toplevel())
     
     def _add_navigation_to_reader_header(self, reading_frame):
         """Add navigation button to the shared ReaderUI header"""
@@ -1,17 +1,30 @@
-from .menu import MainMenu
-from .audio_controls import AudioControls
-from .text_display import TranscriptionTextDisplay
-from .reader_ui import ReaderUI
-from .styles import StyleManager, Colors, Fonts, Spacing, apply_modern_theme, get_button_style, get_label_style, get_frame_style
-from .style_utils import StyledWidgets, TileStyles, LayoutHelpers, CommonPatterns
+"""
+Shared UI components and services.
 
-__all__ = [
-    'MainMenu', 
-    'AudioControls', 
-    'TranscriptionTextDisplay', 
-    'ReaderUI',
+The UI classes are imported on first access, so importing a service module
+(e.g. src.shared.openai_client from the gentexter backend) does not pull in
+the menu and, through it, the gentexter UI and orchestrator.
+"""
+
+import importlib
+
+_EXPORTS = {
+    'MainMenu': '.menu',
+    'AudioControls': '.audio_controls',
+    'TranscriptionTextDisplay': '.text_display',
+    'ReaderUI': '.reader_ui',
     # Styling system
-    'StyleManager', 'Colors', 'Fonts', 'Spacing',
-    'apply_modern_theme', 'get_button_style', 'get_label_style', 'get_frame_style',
-    'StyledWidgets', 'TileStyles', 'LayoutHelpers', 'CommonPatterns'
-]
+    **{name: '.styles' for name in ('StyleManager', 'Colors', 'Fonts', 'Spacing', 'apply_modern_theme',
+                                    'get_button_style', 'get_label_style', 'get_frame_style')},
+    **{name: '.style_utils' for name in ('StyledWidgets', 'TileStyles', 'LayoutHelpers', 'CommonPatterns')},
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
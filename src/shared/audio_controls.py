@@ -16,6 +16,7 @@ class AudioControls:
         self.audio_speed = 1.0
         self.audio_length = 1
         self._slider_dragging = False
+        self.pending_seek_ms = None  # Seek requested before playback started
         
         # Try to import VLC
         try:
@@ -127,6 +128,11 @@ class AudioControls:
         if hasattr(self, 'vlc_player'):
             self.vlc_player.play()
             self.vlc_player.set_rate(self.audio_speed)
+            # VLC ignores seeks before playback starts, so apply a pending one shortly after
+            pending_seek_ms = self.pending_seek_ms
+            if pending_seek_ms is not None:
+                self.pending_seek_ms = None
+                self.parent_frame.after(100, lambda: self.vlc_player.set_time(pending_seek_ms))
             self.update_audio_progress()
 
     def pause_audio(self):
@@ -141,6 +147,16 @@ class AudioControls:
             if hasattr(self, 'audio_progress'):
                 self.audio_progress.set(0)
 
+    def seek_to(self, seconds):
+        """Move playback to an absolute position; applied on the next play if not started yet"""
+        if not hasattr(self, 'vlc_player'):
+            return
+        position_ms = int(max(0, seconds) * 1000)
+        if self.vlc_player.is_playing() or self.vlc_player.get_time() > 0:
+            self.vlc_player.set_time(position_ms)
+        else:
+            self.pending_seek_ms = position_ms
+
     def jump_audio(self, seconds):
         """Jump audio by specified seconds (positive or negative)"""
         if hasattr(self, 'vlc_player') and self.audio_length > 0:
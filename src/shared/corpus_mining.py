@@ -0,0 +1,288 @@
+"""
+Corpus index of the transcription library.
+
+Every SRT in the library is tokenized once into per-file term counts stored in
+SQLite. Re-indexing is incremental: a file is only read again when its mtime or
+size changed, and only re-tokenized when its content hash changed too. From the
+corpus counts we mine words that are frequent in the user's listening material
+but rare globally, as vocabulary candidates.
+"""
+
+import os
+import math
+import sqlite3
+import hashlib
+import threading
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from ..config import CORPUS_INDEX_FILE, TRANSCRIPTIONS_DIR
+from .srt_parser import iter_srt_segments
+from .frequency_analysis import ELISIONS, WORD_PATTERN, analyze_words
+from .translation_cache import TranslationCache
+
+# Bumped when tokenization changes, so existing indexes are rebuilt
+_INDEX_VERSION = 2
+_APOSTROPHES = ("'", "’")
+
+
+def file_hash(path: str) -> str:
+    """Get the SHA-1 of a file's content."""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def count_terms(srt_path: str) -> Tuple[Counter, Counter]:
+    """
+    Stream an SRT file and count its casefolded words.
+
+    Elided articles and pronouns (l', qu'...) are dropped; other words joined
+    by an apostrophe (aujourd'hui, quelqu'un) are counted as one word.
+
+    Returns:
+        Tuple of (occurrences, lowercase occurrences) per casefolded word;
+        words that are almost never lowercase are usually names
+    """
+    counts = Counter()
+    lowercase_counts = Counter()
+    for segment in iter_srt_segments(srt_path):
+        text = segment['text']
+        compound_start = None
+        for match in WORD_PATTERN.finditer(text):
+            start = match.start()
+            if compound_start is not None and start == compound_end + 1:
+                start = compound_start
+            compound_start = None
+            if text[match.end():match.end() + 1] in _APOSTROPHES:
+                if match.group().casefold() not in ELISIONS:
+                    compound_start, compound_end = start, match.end()
+                continue
+            word = text[start:match.end()].replace("’", "'")
+            term = word.casefold()
+            counts[term] += 1
+            if word.islower():
+                lowercase_counts[term] += 1
+    return counts, lowercase_counts
+
+
+class CachedLemmatizer:
+    """Maps word forms to lemmas using results already in the translation cache (no API calls)."""
+
+    def __init__(self, cache: TranslationCache, language_from: str, language_to: str):
+        """
+        Args:
+            cache: Translation cache filled by word lookups and pre-translation
+            language_from: Language of the words
+            language_to: Target language of cached analyses
+        """
+        self.cache = cache
+        self.language_from = language_from
+        self.language_to = language_to
+        self._lemmas = {}
+
+    def lemmatize(self, word: str) -> str:
+        """Get the cached root word of a form, or the form itself if it was never analyzed."""
+        if word not in self._lemmas:
+            entry = (self.cache.peek("analysis", word, self.language_from, self.language_to)
+                     or self.cache.peek("lemma", word, self.language_from))
+            root = entry.get("root_word") if entry else None
+            self._lemmas[word] = root.casefold() if isinstance(root, str) and root.strip() else word
+        return self._lemmas[word]
+
+
+class CorpusIndex:
+    """Incremental per-file term index over a directory of SRT transcripts."""
+
+    def __init__(self, db_path: str = None, corpus_dir: str = None):
+        """
+        Args:
+            db_path: SQLite file path (default: CORPUS_INDEX_FILE)
+            corpus_dir: Directory with SRT files (default: TRANSCRIPTIONS_DIR)
+        """
+        self.db_path = db_path or CORPUS_INDEX_FILE
+        self.corpus_dir = corpus_dir or TRANSCRIPTIONS_DIR
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                sha1 TEXT NOT NULL,
+                tokens INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS terms (
+                path TEXT NOT NULL,
+                term TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                lowercase INTEGER NOT NULL,
+                PRIMARY KEY (path, term)
+            );
+            CREATE INDEX IF NOT EXISTS idx_terms_term ON terms(term);
+        """)
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] < _INDEX_VERSION:
+            with self._conn:
+                self._conn.execute("DELETE FROM terms")
+                self._conn.execute("DELETE FROM files")
+            self._conn.execute(f"PRAGMA user_version = {_INDEX_VERSION}")
+
+    def srt_files(self) -> List[str]:
+        """List the SRT files currently in the corpus directory."""
+        if not os.path.isdir(self.corpus_dir):
+            return []
+        return sorted(
+            os.path.join(self.corpus_dir, name) for name in os.listdir(self.corpus_dir)
+            if name.lower().endswith('.srt')
+        )
+
+    def update(self, progress_callback: Optional[Callable[[str], None]] = None) -> Dict[str, int]:
+        """
+        Bring the index up to date with the corpus directory.
+
+        Args:
+            progress_callback: Optional callback receiving status messages
+
+        Returns:
+            Counts of 'indexed', 'unchanged' and 'removed' files
+        """
+        summary = {'indexed': 0, 'unchanged': 0, 'removed': 0}
+        paths = self.srt_files()
+
+        with self._lock:
+            known = {row[0]: row[1:] for row in self._conn.execute("SELECT path, mtime_ns, size, sha1 FROM files")}
+
+            for path in paths:
+                try:
+                    stat = os.stat(path)
+                    previous = known.get(path)
+                    if previous and previous[0] == stat.st_mtime_ns and previous[1] == stat.st_size:
+                        summary['unchanged'] += 1
+                        continue
+
+                    digest = file_hash(path)
+                    if previous and previous[2] == digest:
+                        # Touched but not edited: only refresh the stat key
+                        with self._conn:
+                            self._conn.execute("UPDATE files SET mtime_ns = ?, size = ? WHERE path = ?",
+                                               (stat.st_mtime_ns, stat.st_size, path))
+                        summary['unchanged'] += 1
+                        continue
+
+                    if progress_callback:
+                        progress_callback(f"📖 Indexing {os.path.basename(path)}...")
+                    counts, lowercase_counts = count_terms(path)
+                except (OSError, UnicodeDecodeError) as e:
+                    print(f"Could not index {path}: {e}")
+                    continue
+
+                with self._conn:
+                    self._conn.execute("DELETE FROM terms WHERE path = ?", (path,))
+                    self._conn.executemany(
+                        "INSERT INTO terms (path, term, count, lowercase) VALUES (?, ?, ?, ?)",
+                        ((path, term, count, lowercase_counts[term]) for term, count in counts.items())
+                    )
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO files (path, mtime_ns, size, sha1, tokens) VALUES (?, ?, ?, ?, ?)",
+                        (path, stat.st_mtime_ns, stat.st_size, digest, sum(counts.values()))
+                    )
+                summary['indexed'] += 1
+
+            removed = set(known) - set(paths)
+            if removed:
+                with self._conn:
+                    for path in removed:
+                        self._conn.execute("DELETE FROM terms WHERE path = ?", (path,))
+                        self._conn.execute("DELETE FROM files WHERE path = ?", (path,))
+                summary['removed'] = len(removed)
+
+        return summary
+
+    def term_frequencies(self) -> Dict[str, tuple]:
+        """
+        Get the corpus term-frequency table.
+
+        Returns:
+            Dictionary mapping each word form to (total count, lowercase count, number of files)
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT term, SUM(count), SUM(lowercase), COUNT(*) FROM terms GROUP BY term"
+            ).fetchall()
+        return {term: (count, lowercase, documents) for term, count, lowercase, documents in rows}
+
+    def total_tokens(self) -> int:
+        """Get the number of word tokens in the corpus."""
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(tokens), 0) FROM files").fetchone()[0]
+
+    def mine_candidates(self, language: str, known_words: Iterable[str] = (),
+                        lemmatizer: CachedLemmatizer = None, min_count: int = 3,
+                        max_zipf: float = 4.0, min_lowercase_share: float = 0.5,
+                        limit: int = 50) -> List[Dict]:
+        """
+        Find words that are frequent in the corpus but rare in general language use.
+
+        Candidates are scored by keyness: the word's zipf frequency within the
+        corpus minus its global zipf frequency. Words unknown to wordfreq
+        (mostly transcription errors) and words usually written capitalized
+        (mostly names) are skipped.
+
+        Args:
+            language: Language code of the corpus
+            known_words: Words already being learned (e.g., from word_tracking.json)
+            lemmatizer: Optional lemmatizer to merge inflected forms
+            min_count: Minimum corpus occurrences
+            max_zipf: Highest global zipf frequency to consider rare
+            min_lowercase_share: Minimum fraction of lowercase occurrences
+            limit: Maximum number of candidates
+
+        Returns:
+            List of dicts with 'word', 'count', 'documents', 'zipf', 'keyness' and 'forms',
+            best candidates first
+        """
+        total = self.total_tokens()
+        if not total:
+            return []
+
+        known = {word.strip().casefold() for word in known_words}
+        lemmas = {}
+        for form, (count, lowercase, documents) in self.term_frequencies().items():
+            if lowercase < count * min_lowercase_share:
+                continue
+            lemma = lemmatizer.lemmatize(form) if lemmatizer else form
+            entry = lemmas.setdefault(lemma, {'word': lemma, 'count': 0, 'documents': 0, 'forms': []})
+            entry['count'] += count
+            entry['documents'] = max(entry['documents'], documents)
+            entry['forms'].append(form)
+
+        pool = [
+            entry for lemma, entry in lemmas.items()
+            if entry['count'] >= min_count and lemma not in known
+            and not any(form in known for form in entry['forms'])
+        ]
+        if not pool:
+            return []
+
+        zipfs = analyze_words([entry['word'] for entry in pool], language)['zipf']
+        candidates = []
+        for entry, zipf in zip(pool, zipfs.tolist()):
+            if not 0 < zipf <= max_zipf:
+                continue
+            corpus_zipf = math.log10(entry['count'] / total * 1e9)
+            entry['zipf'] = round(zipf, 2)
+            entry['keyness'] = round(corpus_zipf - zipf, 2)
+            candidates.append(entry)
+
+        candidates.sort(key=lambda entry: entry['keyness'], reverse=True)
+        return candidates[:limit]
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -3,34 +3,107 @@ Word frequency analysis module using wordfreq library.
 Provides functions to analyze word frequency rankings across different languages.
 """
 
-from wordfreq import word_frequency, zipf_frequency
-from typing import Optional, Dict, Tuple
+import re
+import math
+from bisect import bisect_left
+from functools import lru_cache
+from wordfreq import word_frequency
+from typing import Optional, Dict, Iterable, Tuple
+import numpy as np
+from .frequency_tables import get_frequency_table
+
+# Rank bands from most to least frequent: (highest rank, category, level, color)
+FREQUENCY_BANDS = [
+    (100, "top_100", "Top 100", "#1B5E20"),  # Dark green
+    (1000, "top_1000", "Top 1,000", "#2E7D32"),  # Green
+    (5000, "top_5000", "Top 5,000", "#388E3C"),  # Light green
+    (10000, "top_10000", "Top 10,000", "#689F38"),  # Light green
+    (20000, "top_20000", "Top 20,000", "#FBC02D"),  # Yellow
+    (50000, "top_50000", "Top 50,000", "#FF8F00"),  # Orange
+    (100000, "top_100000", "Top 100,000", "#F57C00"),  # Dark orange
+]
+RARE_BAND = (None, "rare", "Rare", "#D32F2F")  # Red
+
+# Category codes used by analyze_words: index into CATEGORIES
+CATEGORIES = [band[1] for band in FREQUENCY_BANDS] + [RARE_BAND[1]]
+RARE_CODE = len(FREQUENCY_BANDS)
+_BAND_LIMITS = [band[0] for band in FREQUENCY_BANDS]
+
+# Words as a double-click selects them in the Text widget (letters, no digits)
+WORD_PATTERN = re.compile(r"[^\W\d_]+")
+
+# Elided French forms (l', qu', s'...) and the full word they stand for
+ELISIONS = {
+    'l': 'le', 'd': 'de', 's': 'se', 'j': 'je', 'm': 'me', 't': 'te', 'n': 'ne', 'c': 'ce',
+    'qu': 'que', 'jusqu': 'jusque', 'lorsqu': 'lorsque', 'puisqu': 'puisque',
+}
+
+# wordfreq's floor for unknown words (zipf 0 = once per billion words)
+_MIN_FREQUENCY = 1e-9
+
+
+def _zipf_to_frequency(zipf_freq: float) -> float:
+    """Convert a zipf value back to a raw frequency, rounded like wordfreq (3 significant digits)."""
+    freq = 10 ** (zipf_freq - 9)
+    return round(freq, math.floor(-math.log(freq, 10)) + 3)
+
+
+@lru_cache(maxsize=65536)
+def _frequency_core(word: str, language: str) -> Tuple[float, float, Optional[int]]:
+    """
+    Look up a lowercased word once and derive all frequency measures from it.
+    
+    Uses the precompiled frequency table (exact ranks) when available and
+    falls back to wordfreq with a zipf-derived rank otherwise.
+    
+    Args:
+        word: Lowercased word
+        language: Language code
+    
+    Returns:
+        Tuple of (raw frequency, zipf frequency, rank or None)
+    """
+    table = get_frequency_table(language)
+    entry = table.lookup(word) if table else None
+    if entry is not None:
+        rank, zipf_freq = entry
+        if not rank:
+            return 0.0, 0.0, None
+        return _zipf_to_frequency(zipf_freq), zipf_freq, rank
+    
+    raw_freq = word_frequency(word, language)
+    # Same computation as wordfreq.zipf_frequency, without a second lookup
+    zipf_freq = round(math.log(max(raw_freq, _MIN_FREQUENCY), 10) + 9, 2)
+    
+    # Convert Zipf frequency to approximate rank
+    # Zipf 7+ ≈ top 100, 6+ ≈ top 1000, 5+ ≈ top 10000, etc.
+    rank = int(10 ** (8 - zipf_freq)) if zipf_freq >= 3.0 else None
+    return raw_freq, zipf_freq, rank
+
+
+def get_frequency_band(rank: Optional[int]) -> Tuple[Optional[int], str, str, str]:
+    """Get the FREQUENCY_BANDS entry for a rank (RARE_BAND if unranked or beyond the table)."""
+    if not rank:
+        return RARE_BAND
+    code = bisect_left(_BAND_LIMITS, rank)
+    return FREQUENCY_BANDS[code] if code < RARE_CODE else RARE_BAND
 
 
 def get_word_frequency_rank(word: str, language: str) -> Optional[int]:
     """
-    Get the approximate frequency rank of a word in a given language.
+    Get the frequency rank of a word in a given language.
+    
+    Exact when a frequency table is available, otherwise approximated from zipf.
     
     Args:
         word: The word to analyze
         language: Language code (e.g., 'en', 'fr', 'de', 'es')
     
     Returns:
-        Approximate rank (1-based) or None if word not found
+        Rank (1-based) or None if word not found
     """
     try:
-        # Get Zipf frequency (logarithmic scale where 6+ = very common)
-        zipf_freq = zipf_frequency(word.lower(), language)
-        
-        # Convert Zipf frequency to approximate rank
-        # Zipf 7+ ≈ top 100, 6+ ≈ top 1000, 5+ ≈ top 10000, etc.
-        if zipf_freq >= 7.0:
-            return int(10 ** (8 - zipf_freq))
-        elif zipf_freq >= 3.0:
-            return int(10 ** (8 - zipf_freq))
-        else:
-            return None
-            
+        return _frequency_core(word.lower(), language)[2]
     except Exception:
         return None
 
@@ -47,45 +120,9 @@ def get_word_frequency_category(word: str, language: str) -> Dict[str, any]:
         Dictionary with frequency information including category, rank, and level
     """
     try:
-        zipf_freq = zipf_frequency(word.lower(), language)
-        raw_freq = word_frequency(word.lower(), language)
-        
-        # Calculate approximate rank first
-        rank = get_word_frequency_rank(word, language)
-        
-        # Determine category based on actual rank
-        if rank and rank <= 100:
-            category = "top_100"
-            level = "Top 100"
-            color = "#1B5E20"  # Dark green
-        elif rank and rank <= 1000:
-            category = "top_1000"
-            level = "Top 1,000"
-            color = "#2E7D32"  # Green
-        elif rank and rank <= 5000:
-            category = "top_5000"
-            level = "Top 5,000"
-            color = "#388E3C"  # Light green
-        elif rank and rank <= 10000:
-            category = "top_10000"
-            level = "Top 10,000"
-            color = "#689F38"  # Light green
-        elif rank and rank <= 20000:
-            category = "top_20000"
-            level = "Top 20,000"
-            color = "#FBC02D"  # Yellow
-        elif rank and rank <= 50000:
-            category = "top_50000"
-            level = "Top 50,000"
-            color = "#FF8F00"  # Orange
-        elif rank and rank <= 100000:
-            category = "top_100000"
-            level = "Top 100,000"
-            color = "#F57C00"  # Dark orange
-        else:
-            category = "rare"
-            level = "Rare"
-            color = "#D32F2F"  # Red
+        # One memoized lookup instead of separate zipf, raw and rank queries
+        raw_freq, zipf_freq, rank = _frequency_core(word.lower(), language)
+        _, category, level, color = get_frequency_band(rank)
         
         return {
             "word": word,
@@ -127,12 +164,85 @@ def is_common_word(word: str, language: str, threshold: float = 4.8) -> bool:
         True if word is common, False otherwise
     """
     try:
-        zipf_freq = zipf_frequency(word.lower(), language)
-        return zipf_freq >= threshold
+        return _frequency_core(word.lower(), language)[1] >= threshold
     except Exception:
         return False
 
 
+def analyze_words(words: Iterable[str], language: str) -> Dict[str, np.ndarray]:
+    """
+    Analyze the frequency of many words at once (e.g., every token of a transcript).
+    
+    Each distinct word is looked up once; category codes are computed
+    for all words together.
+    
+    Args:
+        words: Words to analyze, duplicates allowed
+        language: Language code
+    
+    Returns:
+        Dictionary of arrays aligned with words:
+        'zipf' (float32), 'rank' (int64, 0 = unranked) and
+        'category' (int8 index into CATEGORIES, RARE_CODE for rare words)
+    """
+    unique_index = {}
+    inverse = np.fromiter(
+        (unique_index.setdefault(word.lower(), len(unique_index)) for word in words),
+        dtype=np.intp
+    )
+    
+    def safe_core(word):
+        try:
+            _, zipf_freq, rank = _frequency_core(word, language)
+            return zipf_freq, rank or 0
+        except Exception:
+            return 0.0, 0
+    
+    unique = np.array([safe_core(word) for word in unique_index], dtype=np.float64).reshape(-1, 2)
+    unique_zipf = unique[:, 0]
+    unique_rank = unique[:, 1].astype(np.int64)
+    unique_category = np.where(
+        unique_rank > 0, np.searchsorted(_BAND_LIMITS, unique_rank, side='left'), RARE_CODE
+    ).astype(np.int8)
+    
+    return {
+        "zipf": unique_zipf[inverse].astype(np.float32),
+        "rank": unique_rank[inverse],
+        "category": unique_category[inverse],
+    }
+
+
+def analyze_text(text: str, language: str) -> Dict[str, np.ndarray]:
+    """
+    Tokenize a text once and locate every word with its frequency band.
+    
+    Args:
+        text: Text to analyze (lines separated by newlines)
+        language: Language code
+    
+    Returns:
+        Dictionary of arrays with one entry per word: 'line' (0-based),
+        'start' and 'end' (column offsets within the line) and 'category'
+        (index into CATEGORIES)
+    """
+    matches = list(WORD_PATTERN.finditer(text))
+    starts = np.fromiter((match.start() for match in matches), dtype=np.int64, count=len(matches))
+    ends = np.fromiter((match.end() for match in matches), dtype=np.int64, count=len(matches))
+    
+    # UTF-32 gives one array element per character, matching str offsets
+    codepoints = np.frombuffer(text.encode('utf-32-le'), dtype='<u4')
+    newlines = np.flatnonzero(codepoints == ord('\n'))
+    lines = np.searchsorted(newlines, starts)
+    line_starts = np.concatenate(([0], newlines + 1))[lines]
+    
+    return {
+        "line": lines,
+        "start": starts - line_starts,
+        "end": ends - line_starts,
+        "category": analyze_words([match.group() for match in matches], language)["category"],
+    }
+
+
 def get_supported_languages() -> list:
     """
     Get list of supported language codes.
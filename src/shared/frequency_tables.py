@@ -0,0 +1,241 @@
+"""
+Precompiled word frequency tables.
+
+The build step exports wordfreq's frequency list for a language into one
+binary file: a sorted UTF-8 word list with offsets, exact frequency ranks
+(uint32) and zipf values (float16). At runtime the file is memory-mapped and
+words are found by binary search, so opening a table costs next to nothing.
+
+Build tables with:
+    python -m src.shared.frequency_tables [language ...]
+"""
+
+import os
+import sys
+import mmap
+import struct
+import threading
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import wordfreq
+from wordfreq.language_info import get_language_info
+
+from ..config import FREQUENCY_TABLE_DIR
+
+_MAGIC = b'ILFT'
+_VERSION = 1
+_HEADER = struct.Struct('<4sIII16s')  # magic, version, word count, text bytes, wordfreq version
+_WORDLIST = 'best'
+
+
+def table_path(language: str) -> str:
+    """Get the table file path for a language."""
+    return os.path.join(FREQUENCY_TABLE_DIR, f"{language}.bin")
+
+
+def _wordfreq_version() -> bytes:
+    """Get the installed wordfreq version, padded for the header."""
+    return getattr(wordfreq, '__version__', '').encode('ascii')[:16].ljust(16, b'\0')
+
+
+def _uses_plain_normalization(language: str) -> bool:
+    """Check whether a single-word token is just the NFC-casefolded word in this language."""
+    info = get_language_info(language)
+    return (info['tokenizer'] == 'regex' and info['normal_form'] == 'NFC' and not info['remove_marks']
+            and not info['dotless_i'] and not info['diacritics_under'] and not info['transliteration'])
+
+
+def build_frequency_table(language: str, frequency_list: List[List[str]] = None, path: str = None) -> str:
+    """
+    Export a language's wordfreq list as a binary frequency table.
+
+    Ranks are competition ranks (1 + number of strictly more frequent words),
+    so words sharing a frequency bucket share a rank.
+
+    Args:
+        language: Language code supported by wordfreq
+        frequency_list: Frequency buckets as returned by wordfreq.get_frequency_list
+            (default: wordfreq's list for the language)
+        path: Table file path (default: table_path(language))
+
+    Returns:
+        Path of the written table
+    """
+    if frequency_list is None:
+        frequency_list = wordfreq.get_frequency_list(language, _WORDLIST)
+    words, ranks, zipfs = [], [], []
+    more_frequent = 0
+    # Bucket i holds the words with frequency 10 ** (-i / 100), i.e. zipf 9 - i / 100
+    for bucket_idx, bucket in enumerate(frequency_list):
+        if not bucket:
+            continue
+        for word in bucket:
+            words.append(word.encode('utf-8'))
+            ranks.append(more_frequent + 1)
+            zipfs.append(9 - bucket_idx / 100)
+        more_frequent += len(bucket)
+
+    order = sorted(range(len(words)), key=words.__getitem__)
+    sorted_words = [words[i] for i in order]
+    offsets = np.zeros(len(words) + 1, dtype='<u4')
+    np.cumsum([len(word) for word in sorted_words], out=offsets[1:])
+    text = b''.join(sorted_words)
+
+    path = path or table_path(language)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, len(words), len(text), _wordfreq_version()))
+        f.write(offsets.tobytes())
+        f.write(np.asarray(ranks, dtype='<u4')[order].tobytes())
+        f.write(np.asarray(zipfs, dtype='<f2')[order].tobytes())
+        f.write(text)
+    os.replace(tmp_path, path)
+    return path
+
+
+class FrequencyTable:
+    """Memory-mapped frequency table with binary search lookups."""
+
+    def __init__(self, path: str, language: str):
+        """
+        Map a table file written by build_frequency_table.
+
+        Args:
+            path: Table file path
+            language: Language code of the table
+
+        Raises:
+            ValueError: If the file is not a current frequency table
+        """
+        self.language = language
+        self.plain_normalization = _uses_plain_normalization(language)
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mmap) < _HEADER.size:
+            raise ValueError(f"Frequency table {path} is truncated")
+        magic, version, count, text_bytes, wf_version = _HEADER.unpack_from(self._mmap)
+        if magic != _MAGIC or version != _VERSION or wf_version != _wordfreq_version():
+            raise ValueError(f"Frequency table {path} is outdated")
+
+        offset = _HEADER.size
+        self.count = count
+        self._offsets = np.frombuffer(self._mmap, dtype='<u4', count=count + 1, offset=offset)
+        offset += 4 * (count + 1)
+        self._ranks = np.frombuffer(self._mmap, dtype='<u4', count=count, offset=offset)
+        offset += 4 * count
+        self._zipfs = np.frombuffer(self._mmap, dtype='<f2', count=count, offset=offset)
+        self._text_start = offset + 2 * count
+        if self._text_start + text_bytes > len(self._mmap):
+            raise ValueError(f"Frequency table {path} is truncated")
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _word_at(self, idx: int) -> bytes:
+        """Get the encoded word at a sorted position."""
+        start = self._text_start + int(self._offsets[idx])
+        return self._mmap[start:self._text_start + int(self._offsets[idx + 1])]
+
+    def _find(self, key: bytes) -> int:
+        """Binary search for an encoded word; returns its position or -1."""
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._word_at(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo if lo < self.count and self._word_at(lo) == key else -1
+
+    def normalize(self, word: str) -> Optional[str]:
+        """
+        Turn a word into the token wordfreq would look up.
+
+        Returns:
+            The token, or None if the word does not map to exactly one plain token
+        """
+        if self.plain_normalization and word.isalpha():
+            return unicodedata.normalize('NFC', word).casefold()
+        tokens = wordfreq.tokenize(word, self.language)
+        if len(tokens) != 1 or any(ch.isdigit() for ch in tokens[0]):
+            return None
+        return tokens[0]
+
+    def lookup(self, word: str) -> Optional[Tuple[int, float]]:
+        """
+        Look up a word's exact rank and zipf frequency.
+
+        Args:
+            word: Word as it appears in text
+
+        Returns:
+            (rank, zipf) for listed words, (0, 0.0) for unlisted words, or None if the
+            word spans several tokens and needs wordfreq's combination rule
+        """
+        token = self.normalize(word)
+        if token is None:
+            return None
+        idx = self._find(token.encode('utf-8'))
+        if idx < 0:
+            return 0, 0.0
+        return int(self._ranks[idx]), round(float(self._zipfs[idx]), 2)
+
+    def close(self):
+        """Release the memory map."""
+        self._offsets = self._ranks = self._zipfs = None
+        self._mmap.close()
+
+
+_tables: Dict[str, Optional[FrequencyTable]] = {}
+_tables_lock = threading.Lock()
+
+
+def get_frequency_table(language: str, build: bool = True) -> Optional[FrequencyTable]:
+    """
+    Get the memory-mapped table for a language, building it on first use.
+
+    Args:
+        language: Language code
+        build: Whether to export a missing or outdated table
+
+    Returns:
+        FrequencyTable, or None if wordfreq has no list for the language
+    """
+    with _tables_lock:
+        if language in _tables:
+            return _tables[language]
+
+        table = None
+        path = table_path(language)
+        try:
+            table = FrequencyTable(path, language)
+        except (OSError, ValueError):
+            if build and language in wordfreq.available_languages(_WORDLIST):
+                try:
+                    print(f"📊 Building frequency table for '{language}'...")
+                    table = FrequencyTable(build_frequency_table(language), language)
+                except (OSError, ValueError) as e:
+                    print(f"Could not build frequency table for '{language}': {e}")
+
+        _tables[language] = table
+        return table
+
+
+def build_tables(languages: Iterable[str]):
+    """Export tables for all given languages that wordfreq supports."""
+    available = wordfreq.available_languages(_WORDLIST)
+    for language in languages:
+        if language not in available:
+            print(f"⏭️ No wordfreq list for '{language}', skipping")
+            continue
+        path = build_frequency_table(language)
+        print(f"✅ {language}: {os.path.getsize(path) / (1024 * 1024):.1f} MB -> {path}")
+
+
+if __name__ == "__main__":
+    from .frequency_analysis import get_supported_languages
+    build_tables(sys.argv[1:] or get_supported_languages())
@@ -3,18 +3,70 @@ GPT-based word translation and analysis module.
 Provides lemmatization, translation, and linguistic analysis using OpenAI API.
 """
 
-from openai import OpenAI
 import json
 import os
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from dataclasses import dataclass
 from dotenv import load_dotenv
 from .frequency_analysis import get_word_frequency_category
+from .translation_cache import TranslationCache, get_cache
+from .openai_client import get_client
 
 # Load environment variables
 load_dotenv()
 
 
+LANGUAGE_NAMES = {
+    'en': 'English', 'fr': 'French', 'de': 'German', 'es': 'Spanish',
+    'it': 'Italian', 'pt': 'Portuguese', 'ru': 'Russian', 'ja': 'Japanese',
+    'ko': 'Korean', 'zh': 'Chinese', 'ar': 'Arabic', 'hi': 'Hindi'
+}
+
+
+def language_code(language: str) -> str:
+    """Get the code of a language given by name (e.g., 'French' -> 'fr'); codes are returned as is."""
+    for code, name in LANGUAGE_NAMES.items():
+        if name.casefold() == language.casefold():
+            return code
+    return language
+
+
+# Expected fields of a combined analysis response: name -> (allowed types, required)
+ANALYSIS_SCHEMA = {
+    "root_word": ((str,), True),
+    "grammatical_relation": ((str,), True),
+    "part_of_speech": ((str,), True),
+    "primary_translation": ((str,), True),
+    "secondary_translation": ((str, type(None)), False),
+    "context_translation": ((str, type(None)), False),
+}
+
+
+def validate_analysis(data) -> Optional[Dict]:
+    """
+    Validate a combined analysis response against ANALYSIS_SCHEMA.
+    
+    Args:
+        data: Parsed JSON response
+        
+    Returns:
+        Dictionary restricted to the schema fields, or None if invalid
+    """
+    if not isinstance(data, dict):
+        return None
+    
+    result = {}
+    for key, (types, required) in ANALYSIS_SCHEMA.items():
+        value = data.get(key)
+        if value is None and not required:
+            result[key] = None
+            continue
+        if not isinstance(value, types) or (required and not value.strip()):
+            return None
+        result[key] = value.strip() if isinstance(value, str) else value
+    return result
+
+
 @dataclass
 class WordAnalysis:
     """Data class for comprehensive word analysis results."""
@@ -33,23 +85,27 @@ class WordAnalysis:
 class GPTTranslator:
     """GPT-based translator with lemmatization and frequency analysis."""
     
-    def __init__(self, api_key: str = None):
-        """Initialize with OpenAI API key."""
+    def __init__(self, api_key: str = None, cache: TranslationCache = None):
+        """Initialize with OpenAI API key and an optional persistent cache."""
         self.api_key = api_key or os.getenv('OPENAI_API_KEY')
         if not self.api_key:
             raise ValueError("OpenAI API key not found. Please set OPENAI_API_KEY in .env file or pass as parameter.")
         
-        self.client = OpenAI(api_key=self.api_key)
-        self.cache = {}  # Simple translation cache
+        self.client = get_client(self.api_key)  # Pooled connections shared with generation and TTS
+        self.cache = cache or get_cache()  # Persistent across sessions, shared by all translators
+        self.use_combined_analysis = True  # One request for lemma + translation
         
-    def _call_gpt(self, prompt: str, model: str = "gpt-3.5-turbo") -> str:
+    def _call_gpt(self, prompt: str, model: str = "gpt-3.5-turbo", max_tokens: int = 200,
+                  json_mode: bool = False) -> str:
         """Make API call to GPT."""
         try:
-            response = self.client.chat.completions.create(
+            extra_args = {"response_format": {"type": "json_object"}} if json_mode else {}
+            response = self.client.chat_completion(
                 model=model,
                 messages=[{"role": "user", "content": prompt}],
-                max_tokens=200,
-                temperature=0.1
+                max_tokens=max_tokens,
+                temperature=0.1,
+                **extra_args
             )
             return response.choices[0].message.content.strip()
         except Exception as e:
@@ -68,9 +124,9 @@ class GPTTranslator:
         Returns:
             Dictionary with root word and grammatical relation
         """
-        cache_key = f"lemma_{word}_{language}"
-        if cache_key in self.cache:
-            return self.cache[cache_key]
+        cached = self.cache.get("lemma", word, language, context=context)
+        if cached is not None:
+            return cached
         
         prompt = f"""
         Analyze this {language} word: "{word}"
@@ -92,7 +148,7 @@ class GPTTranslator:
         
         try:
             result = json.loads(response)
-            self.cache[cache_key] = result
+            self.cache.set("lemma", word, language, "", context, result)
             return result
         except json.JSONDecodeError:
             return {"root_word": word, "grammatical_relation": "unchanged", "part_of_speech": "unknown"}
@@ -110,18 +166,12 @@ class GPTTranslator:
         Returns:
             Dictionary with translation information
         """
-        cache_key = f"trans_{word}_{language_from}_{language_to}"
-        if cache_key in self.cache:
-            return self.cache[cache_key]
+        cached = self.cache.get("trans", word, language_from, language_to, context)
+        if cached is not None:
+            return cached
         
-        lang_names = {
-            'en': 'English', 'fr': 'French', 'de': 'German', 'es': 'Spanish',
-            'it': 'Italian', 'pt': 'Portuguese', 'ru': 'Russian', 'ja': 'Japanese',
-            'ko': 'Korean', 'zh': 'Chinese', 'ar': 'Arabic', 'hi': 'Hindi'
-        }
-        
-        from_lang = lang_names.get(language_from, language_from)
-        to_lang = lang_names.get(language_to, language_to)
+        from_lang = LANGUAGE_NAMES.get(language_from, language_from)
+        to_lang = LANGUAGE_NAMES.get(language_to, language_to)
         
         prompt = f"""
         Translate this {from_lang} word to {to_lang}: "{word}"
@@ -141,11 +191,108 @@ class GPTTranslator:
         
         try:
             result = json.loads(response)
-            self.cache[cache_key] = result
+            self.cache.set("trans", word, language_from, language_to, context, result)
             return result
         except json.JSONDecodeError:
             return {"primary_translation": "Translation error", "secondary_translation": None, "context_translation": None}
     
+    def analyze_word_combined(self, word: str, language_from: str, language_to: str, context: str = "") -> Optional[Dict]:
+        """
+        Lemmatize and translate a word in a single GPT request.
+        
+        Args:
+            word: Word to analyze
+            language_from: Source language code
+            language_to: Target language code
+            context: Surrounding sentence for better accuracy
+            
+        Returns:
+            Dictionary with lemma, grammar and translation fields, or None if the
+            response was missing or did not match ANALYSIS_SCHEMA
+        """
+        # Falls back to the context-free result from bulk pre-translation
+        cached = self.cache.get("analysis", word, language_from, language_to, context, fallback=True)
+        if cached is not None:
+            return cached
+        
+        from_lang = LANGUAGE_NAMES.get(language_from, language_from)
+        to_lang = LANGUAGE_NAMES.get(language_to, language_to)
+        
+        prompt = f"""
+        Analyze this {from_lang} word and translate its base form to {to_lang}: "{word}"
+        {f'Context: "{context}"' if context else ''}
+        
+        Provide a JSON object with exactly these keys:
+        "root_word": the base/dictionary form (infinitive for verbs, singular for nouns)
+        "grammatical_relation": the transformation from the root (e.g., "past tense", "plural", "unchanged")
+        "part_of_speech": noun, verb, adjective, adverb, etc.
+        "primary_translation": most common/best {to_lang} translation of the root word
+        "secondary_translation": alternative translation, or null
+        "context_translation": translation considering the context, or null
+        
+        Response format: JSON only, no explanation.
+        """
+        
+        response = self._call_gpt(prompt, max_tokens=300, json_mode=True)
+        if not response:
+            return None
+        
+        try:
+            result = validate_analysis(json.loads(response))
+        except json.JSONDecodeError:
+            return None
+        
+        if result is not None:
+            self.cache.set("analysis", word, language_from, language_to, context, result)
+        return result
+    
+    def analyze_words_batch(self, words: List[str], language_from: str, language_to: str) -> Dict[str, Dict]:
+        """
+        Analyze many words in one GPT request and cache each result without context.
+        
+        Args:
+            words: Words to analyze (surface forms as they appear in the text)
+            language_from: Source language code
+            language_to: Target language code
+            
+        Returns:
+            Dictionary mapping each successfully analyzed word to its analysis
+        """
+        if not words:
+            return {}
+        
+        from_lang = LANGUAGE_NAMES.get(language_from, language_from)
+        to_lang = LANGUAGE_NAMES.get(language_to, language_to)
+        word_list = "\n".join(f"- {word}" for word in words)
+        
+        prompt = f"""
+        Analyze each of these {from_lang} words and translate its base form to {to_lang}:
+        {word_list}
+        
+        Provide a JSON object {{"words": {{...}}}} mapping every word exactly as written above to an object with:
+        "root_word", "grammatical_relation", "part_of_speech", "primary_translation",
+        "secondary_translation" (or null), "context_translation" (always null)
+        
+        Response format: JSON only, no explanation.
+        """
+        
+        response = self._call_gpt(prompt, max_tokens=min(4000, 80 * len(words)), json_mode=True)
+        if not response:
+            return {}
+        
+        try:
+            entries = json.loads(response).get("words", {})
+        except (json.JSONDecodeError, AttributeError):
+            return {}
+        
+        results = {}
+        for word in words:
+            result = validate_analysis(entries.get(word))
+            if result is not None:
+                self.cache.set("analysis", word, language_from, language_to, "", result)
+                results[word] = result
+        return results
+    
     def analyze_word_comprehensive(self, word: str, language_from: str, language_to: str = "en", context: str = "") -> WordAnalysis:
         """
         Comprehensive word analysis combining lemmatization, translation, and frequency.
@@ -159,12 +306,17 @@ class GPTTranslator:
         Returns:
             WordAnalysis object with all information
         """
-        # Step 1: Lemmatize the word
-        lemma_info = self.lemmatize_word(word, language_from, context)
-        root_word = lemma_info.get("root_word", word)
+        # Step 1+2: Lemmatize and translate in one round trip
+        combined = self.analyze_word_combined(word, language_from, language_to, context) if self.use_combined_analysis else None
         
-        # Step 2: Translate the root word
-        translation_info = self.translate_word(root_word, language_from, language_to, context)
+        if combined:
+            lemma_info = translation_info = combined
+            root_word = combined["root_word"]
+        else:
+            # Fall back to separate lemmatization and translation requests
+            lemma_info = self.lemmatize_word(word, language_from, context)
+            root_word = lemma_info.get("root_word", word)
+            translation_info = self.translate_word(root_word, language_from, language_to, context)
         
         # Step 3: Get frequency analysis for root word
         frequency_info = get_word_frequency_category(root_word, language_from)
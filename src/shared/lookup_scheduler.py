@@ -0,0 +1,105 @@
+"""
+Scheduler for interactive word lookups.
+Only the most recent request matters to the reader: queued lookups that were
+superseded before starting are dropped, identical lookups already in flight
+are merged into one call, and results are delivered only for the latest request.
+"""
+
+import threading
+from typing import Callable, Hashable
+
+
+class LookupScheduler:
+    """Runs lookups on a few daemon threads with latest-wins delivery and single-flight merging."""
+
+    def __init__(self, lookup: Callable, max_in_flight: int = 2):
+        """
+        Args:
+            lookup: Function performing one lookup; called with the arguments given to submit()
+            max_in_flight: Lookups allowed to run at the same time
+        """
+        self.lookup = lookup
+        self.max_in_flight = max_in_flight
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._latest = (0, None, None)  # (generation, key, callback) of the newest request
+        self._pending = None  # (key, args) of the one lookup waiting for a free worker
+        self._in_flight = set()
+        self._workers = 0
+        self.stats = {'submitted': 0, 'executed': 0, 'coalesced': 0, 'cancelled': 0, 'stale': 0}
+
+    def submit(self, key: Hashable, callback: Callable, *args) -> int:
+        """
+        Request a lookup, superseding every earlier request.
+
+        Args:
+            key: Identity of the lookup; equal keys share one call
+            callback: Called as callback(generation, result, error) from a worker thread,
+                only if this is still the latest request when the lookup finishes
+            *args: Arguments for the lookup function
+
+        Returns:
+            Generation number of this request (see is_current)
+        """
+        with self._lock:
+            self._generation += 1
+            self._latest = (self._generation, key, callback)
+            self.stats['submitted'] += 1
+
+            # Any queued lookup for another word is superseded by this request
+            if self._pending is not None and self._pending[0] != key:
+                self.stats['cancelled'] += 1
+                self._pending = None
+
+            if key in self._in_flight:
+                # Single-flight: the running call will deliver to this request
+                self.stats['coalesced'] += 1
+                return self._generation
+
+            self._pending = (key, args)
+
+            if self._workers < self.max_in_flight:
+                self._workers += 1
+                threading.Thread(target=self._worker, daemon=True).start()
+            return self._generation
+
+    def _worker(self):
+        """Run pending lookups until none are left."""
+        while True:
+            with self._lock:
+                if self._pending is None:
+                    self._workers -= 1
+                    return
+                key, args = self._pending
+                self._pending = None
+                self._in_flight.add(key)
+                self.stats['executed'] += 1
+
+            result, error = None, None
+            try:
+                result = self.lookup(*args)
+            except Exception as e:
+                error = e
+
+            with self._lock:
+                self._in_flight.discard(key)
+                generation, latest_key, callback = self._latest
+                deliver = latest_key == key
+                if not deliver:
+                    self.stats['stale'] += 1
+
+            if deliver:
+                callback(generation, result, error)
+
+    def is_current(self, generation: int) -> bool:
+        """Check whether a request is still the latest one."""
+        return generation == self._generation
+
+    def cancel_all(self):
+        """Drop the queued lookup and suppress delivery of running ones."""
+        with self._lock:
+            if self._pending is not None:
+                self.stats['cancelled'] += 1
+            self._pending = None
+            self._generation += 1
+            self._latest = (self._generation, None, None)
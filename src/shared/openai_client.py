@@ -0,0 +1,478 @@
+"""
+Shared OpenAI client layer.
+All API traffic (word analysis, story generation, TTS) goes through one
+keep-alive connection pool per API key, a global concurrency limit, per-endpoint
+rate limiting and jittered retries, with request timings collected in one place.
+The sync and asyncio clients share the same limits and metrics.
+Background work (pre-translation, prefetching, TTS) runs at a lower priority and
+leaves request slots free for interactive lookups.
+"""
+
+import os
+import time
+import asyncio
+import weakref
+import random
+import threading
+import contextvars
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from functools import wraps
+from typing import Callable, Dict, Iterator
+
+import httpx
+import openai
+from dotenv import load_dotenv
+
+from ..config import (OPENAI_MAX_CONCURRENT_REQUESTS, OPENAI_INTERACTIVE_SLOTS, OPENAI_MAX_CONNECTIONS,
+                      OPENAI_REQUEST_TIMEOUT, OPENAI_MAX_RETRIES, OPENAI_RATE_LIMITS)
+
+# Load environment variables
+load_dotenv()
+
+# Errors worth retrying; anything else (bad request, auth) fails immediately
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
+_BACKOFF_BASE = 0.5  # Seconds
+_BACKOFF_CAP = 20.0
+_LATENCY_SAMPLES = 200  # Recent durations kept per endpoint for percentiles
+
+
+class RateLimiter:
+    """Token bucket shared by all callers; hands out a delay per request."""
+
+    def __init__(self, requests_per_minute: float, burst: int = None):
+        self.rate = requests_per_minute / 60.0
+        self.capacity = burst or max(1, int(self.rate * 5))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token and return how long the caller must wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+class RequestSlots:
+    """Global limit on requests in flight; some slots are kept free for interactive requests."""
+
+    def __init__(self, capacity: int, interactive_slots: int):
+        """
+        Args:
+            capacity: Requests allowed in flight at once
+            interactive_slots: Slots background requests may not take
+        """
+        self.capacity = capacity
+        self.background_capacity = max(1, capacity - interactive_slots)
+        self.in_use = 0
+        self.interactive_waiting = 0
+        self._condition = threading.Condition()
+
+    @contextmanager
+    def acquire(self, background: bool):
+        """
+        Hold a request slot for the duration of the block.
+
+        Interactive requests may take any free slot and go before waiting
+        background requests; background requests only take the unreserved slots.
+        """
+        self._take(background)
+        try:
+            yield
+        finally:
+            self._release()
+
+    @asynccontextmanager
+    async def acquire_async(self, background: bool):
+        """Asyncio variant of acquire; waits on a worker thread so the event loop keeps running."""
+        take = asyncio.ensure_future(asyncio.to_thread(self._take, background))
+        try:
+            await asyncio.shield(take)
+        except asyncio.CancelledError:
+            # The wait cannot be interrupted; give the slot back once it is taken
+            take.add_done_callback(lambda done: done.cancelled() or done.exception() or self._release())
+            raise
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _take(self, background: bool):
+        """Wait for a free slot and take it."""
+        with self._condition:
+            if background:
+                self._condition.wait_for(
+                    lambda: self.in_use < self.background_capacity and not self.interactive_waiting
+                )
+            else:
+                self.interactive_waiting += 1
+                try:
+                    self._condition.wait_for(lambda: self.in_use < self.capacity)
+                finally:
+                    self.interactive_waiting -= 1
+            self.in_use += 1
+
+    def _release(self):
+        """Give a slot back and wake the waiting requests."""
+        with self._condition:
+            self.in_use -= 1
+            self._condition.notify_all()
+
+
+class RequestMetrics:
+    """Thread-safe per-endpoint request counters and timings."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def record(self, endpoint: str, duration: float, error: bool = False, retried: bool = False):
+        """Record one attempt of a request."""
+        with self._lock:
+            stats = self._endpoints.setdefault(endpoint, {
+                'requests': 0, 'errors': 0, 'retries': 0, 'total_seconds': 0.0,
+                'durations': deque(maxlen=_LATENCY_SAMPLES)
+            })
+            stats['requests'] += 1
+            stats['errors'] += int(error)
+            stats['retries'] += int(retried)
+            stats['total_seconds'] += duration
+            stats['durations'].append(duration)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """
+        Get a summary of all endpoints.
+
+        Returns:
+            Dictionary mapping endpoint to requests, errors, retries, mean/p50/p95 seconds
+        """
+        with self._lock:
+            summary = {}
+            for endpoint, stats in self._endpoints.items():
+                durations = sorted(stats['durations'])
+                summary[endpoint] = {
+                    'requests': stats['requests'],
+                    'errors': stats['errors'],
+                    'retries': stats['retries'],
+                    'mean_seconds': stats['total_seconds'] / stats['requests'],
+                    'p50_seconds': durations[len(durations) // 2],
+                    'p95_seconds': durations[min(len(durations) - 1, int(len(durations) * 0.95))],
+                }
+            return summary
+
+    def reset(self):
+        """Forget all recorded requests."""
+        with self._lock:
+            self._endpoints.clear()
+
+
+# Shared across every client so all features count against the same limits
+metrics = RequestMetrics()
+_rate_limiters = {endpoint: RateLimiter(rpm) for endpoint, rpm in OPENAI_RATE_LIMITS.items()}
+_request_slots = RequestSlots(OPENAI_MAX_CONCURRENT_REQUESTS, OPENAI_INTERACTIVE_SLOTS)
+_background = contextvars.ContextVar('openai_background_requests', default=False)
+
+
+@contextmanager
+def background_requests():
+    """Run the requests made in this block (on this thread) at background priority."""
+    token = _background.set(True)
+    try:
+        yield
+    finally:
+        _background.reset(token)
+
+
+def with_current_priority(function: Callable) -> Callable:
+    """
+    Wrap a function so it runs with the calling thread's request priority.
+
+    Worker threads start at interactive priority; wrap tasks handed to a
+    thread pool so background work stays in the background.
+    """
+    background = _background.get()
+
+    @wraps(function)
+    def run(*args, **kwargs):
+        token = _background.set(background)
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _background.reset(token)
+
+    return run
+
+
+def backoff_delay(attempt: int, error: Exception = None) -> float:
+    """
+    Get the wait before retrying a failed request.
+
+    Honors a Retry-After header when the server sends one, otherwise uses
+    exponential backoff with full jitter so concurrent callers spread out.
+
+    Args:
+        attempt: Zero-based number of the attempt that failed
+        error: Exception raised by the attempt
+
+    Returns:
+        Delay in seconds
+    """
+    response = getattr(error, 'response', None)
+    retry_after = response.headers.get('retry-after') if response is not None else None
+    if retry_after:
+        try:
+            return min(_BACKOFF_CAP, float(retry_after))
+        except ValueError:
+            pass
+    return random.uniform(0, min(_BACKOFF_CAP, _BACKOFF_BASE * 2 ** attempt))
+
+
+def _rate_limit_delay(endpoint: str) -> float:
+    """Reserve a request slot on an endpoint's rate limiter."""
+    limiter = _rate_limiters.get(endpoint)
+    return limiter.reserve() if limiter else 0.0
+
+
+def _resolve_api_key(api_key: str = None) -> str:
+    """Get the API key from the argument or the environment."""
+    api_key = api_key or os.getenv('OPENAI_API_KEY')
+    if not api_key:
+        raise ValueError("OpenAI API key not found. Please set OPENAI_API_KEY in .env file or pass as parameter.")
+    return api_key
+
+
+class OpenAIClient:
+    """Synchronous OpenAI client with pooled connections, limits and retries."""
+
+    def __init__(self, api_key: str = None, max_retries: int = OPENAI_MAX_RETRIES):
+        """
+        Args:
+            api_key: OpenAI API key (default: OPENAI_API_KEY from the environment)
+            max_retries: Retries per request for transient errors
+        """
+        self.max_retries = max_retries
+        self.http_client = httpx.Client(
+            limits=httpx.Limits(max_connections=OPENAI_MAX_CONNECTIONS,
+                                max_keepalive_connections=OPENAI_MAX_CONNECTIONS),
+            timeout=OPENAI_REQUEST_TIMEOUT
+        )
+        # Retries are handled here so they respect the shared limits
+        self.raw = openai.OpenAI(api_key=_resolve_api_key(api_key), http_client=self.http_client, max_retries=0)
+
+    def request(self, endpoint: str, method, **kwargs):
+        """
+        Run one API call under the shared limits, retrying transient errors.
+
+        Args:
+            endpoint: Rate limit bucket and metrics name (e.g., 'chat', 'speech')
+            method: Bound SDK method to call
+            **kwargs: Arguments for the SDK method
+
+        Returns:
+            The SDK method's result
+        """
+        for attempt in range(self.max_retries + 1):
+            delay = _rate_limit_delay(endpoint)
+            if delay:
+                time.sleep(delay)
+
+            with _request_slots.acquire(_background.get()):
+                start = time.perf_counter()
+                try:
+                    result = method(**kwargs)
+                except RETRYABLE_ERRORS as e:
+                    metrics.record(endpoint, time.perf_counter() - start, error=True,
+                                   retried=attempt < self.max_retries)
+                    if attempt == self.max_retries:
+                        raise
+                    error = e
+                except Exception:
+                    metrics.record(endpoint, time.perf_counter() - start, error=True)
+                    raise
+                else:
+                    metrics.record(endpoint, time.perf_counter() - start)
+                    return result
+
+            # Back off outside the semaphore so other requests can proceed
+            time.sleep(backoff_delay(attempt, error))
+
+    def chat_completion(self, **kwargs):
+        """Create a chat completion (arguments as for chat.completions.create)."""
+        return self.request('chat', self.raw.chat.completions.create, **kwargs)
+
+    def speech(self, **kwargs):
+        """Create TTS audio (arguments as for audio.speech.create)."""
+        return self.request('speech', self.raw.audio.speech.create, **kwargs)
+
+    def speech_to_file(self, path: str, **kwargs):
+        """
+        Create TTS audio and stream it straight to a file (arguments as for audio.speech.create).
+
+        Args:
+            path: File to write the audio to
+            **kwargs: Arguments for audio.speech.create
+        """
+        def stream_to_file(**create_kwargs):
+            with self.raw.audio.speech.with_streaming_response.create(**create_kwargs) as response:
+                with open(path, 'wb') as f:
+                    for block in response.iter_bytes(1 << 16):
+                        f.write(block)
+
+        self.request('speech', stream_to_file, **kwargs)
+
+    def chat_completion_stream(self, **kwargs) -> Iterator[str]:
+        """
+        Stream a chat completion, yielding content deltas as they arrive.
+
+        Opening the stream is retried like any request; errors after the first
+        delta are raised to the caller. The request slot is held until the
+        stream ends or the generator is closed.
+
+        Args:
+            **kwargs: Arguments for chat.completions.create (stream is set here)
+
+        Yields:
+            Text fragments of the completion
+        """
+        for attempt in range(self.max_retries + 1):
+            delay = _rate_limit_delay('chat')
+            if delay:
+                time.sleep(delay)
+
+            with _request_slots.acquire(_background.get()):
+                start = time.perf_counter()
+                try:
+                    stream = self.raw.chat.completions.create(stream=True, **kwargs)
+                except RETRYABLE_ERRORS as e:
+                    metrics.record('chat_stream', time.perf_counter() - start, error=True,
+                                   retried=attempt < self.max_retries)
+                    if attempt == self.max_retries:
+                        raise
+                    error = e
+                else:
+                    failed = True
+                    try:
+                        for chunk in stream:
+                            if chunk.choices and chunk.choices[0].delta.content:
+                                yield chunk.choices[0].delta.content
+                        failed = False
+                    finally:
+                        stream.close()
+                        metrics.record('chat_stream', time.perf_counter() - start, error=failed)
+                    return
+
+            time.sleep(backoff_delay(attempt, error))
+
+
+class AsyncOpenAIClient:
+    """Asyncio variant of OpenAIClient; bound to the event loop it was created on."""
+
+    def __init__(self, api_key: str = None, max_retries: int = OPENAI_MAX_RETRIES):
+        """
+        Args:
+            api_key: OpenAI API key (default: OPENAI_API_KEY from the environment)
+            max_retries: Retries per request for transient errors
+        """
+        self.max_retries = max_retries
+        self.http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=OPENAI_MAX_CONNECTIONS,
+                                max_keepalive_connections=OPENAI_MAX_CONNECTIONS),
+            timeout=OPENAI_REQUEST_TIMEOUT
+        )
+        self.raw = openai.AsyncOpenAI(api_key=_resolve_api_key(api_key), http_client=self.http_client,
+                                      max_retries=0)
+
+    async def request(self, endpoint: str, method, **kwargs):
+        """
+        Run one API call under the shared limits, retrying transient errors.
+
+        Args:
+            endpoint: Rate limit bucket and metrics name (e.g., 'chat', 'speech')
+            method: Bound async SDK method to call
+            **kwargs: Arguments for the SDK method
+
+        Returns:
+            The SDK method's result
+        """
+        for attempt in range(self.max_retries + 1):
+            delay = _rate_limit_delay(endpoint)
+            if delay:
+                await asyncio.sleep(delay)
+
+            async with _request_slots.acquire_async(_background.get()):
+                start = time.perf_counter()
+                try:
+                    result = await method(**kwargs)
+                except RETRYABLE_ERRORS as e:
+                    metrics.record(endpoint, time.perf_counter() - start, error=True,
+                                   retried=attempt < self.max_retries)
+                    if attempt == self.max_retries:
+                        raise
+                    error = e
+                except Exception:
+                    metrics.record(endpoint, time.perf_counter() - start, error=True)
+                    raise
+                else:
+                    metrics.record(endpoint, time.perf_counter() - start)
+                    return result
+
+            await asyncio.sleep(backoff_delay(attempt, error))
+
+    async def chat_completion(self, **kwargs):
+        """Create a chat completion (arguments as for chat.completions.create)."""
+        return await self.request('chat', self.raw.chat.completions.create, **kwargs)
+
+    async def speech(self, **kwargs):
+        """Create TTS audio (arguments as for audio.speech.create)."""
+        return await self.request('speech', self.raw.audio.speech.create, **kwargs)
+
+
+_clients = {}
+_async_clients = weakref.WeakKeyDictionary()  # Event loop -> {api_key: client}
+_clients_lock = threading.Lock()
+
+
+def get_client(api_key: str = None) -> OpenAIClient:
+    """
+    Get the shared synchronous client for an API key.
+
+    Args:
+        api_key: OpenAI API key (default: OPENAI_API_KEY from the environment)
+
+    Returns:
+        OpenAIClient reused by every caller with the same key
+    """
+    api_key = _resolve_api_key(api_key)
+    with _clients_lock:
+        if api_key not in _clients:
+            _clients[api_key] = OpenAIClient(api_key)
+        return _clients[api_key]
+
+
+def get_async_client(api_key: str = None) -> AsyncOpenAIClient:
+    """
+    Get the shared asyncio client for an API key on the running event loop.
+
+    Args:
+        api_key: OpenAI API key (default: OPENAI_API_KEY from the environment)
+
+    Returns:
+        AsyncOpenAIClient reused by every coroutine on this loop with the same key
+    """
+    api_key = _resolve_api_key(api_key)
+    loop = asyncio.get_running_loop()
+    with _clients_lock:
+        loop_clients = _async_clients.setdefault(loop, {})
+        if api_key not in loop_clients:
+            loop_clients[api_key] = AsyncOpenAIClient(api_key)
+        return loop_clients[api_key]
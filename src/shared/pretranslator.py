@@ -0,0 +1,120 @@
+"""
+Background pre-translation of a whole text.
+Tokenizes the displayed transcript once, skips common and already cached
+words, and analyzes the rest in a few large batched GPT requests so most
+double-click lookups become cache hits.
+"""
+
+import queue
+import threading
+from typing import Callable, List, Optional
+
+from .frequency_analysis import WORD_PATTERN, is_common_word
+from .gpt_translator import GPTTranslator
+from .openai_client import background_requests
+
+
+def extract_words(text: str, language: str, min_length: int = 2) -> List[str]:
+    """
+    Get the unique, uncommon words of a text in order of first appearance.
+
+    Words are deduplicated by case-folded surface form, not by lemma: lookups
+    are cached per clicked form, so every form needs its own analysis to
+    become a cache hit.
+
+    Args:
+        text: Text to tokenize
+        language: Language code for the frequency check
+        min_length: Shortest word to keep
+
+    Returns:
+        Deduplicated list of words worth pre-translating
+    """
+    seen = set()
+    words = []
+    for match in WORD_PATTERN.finditer(text):
+        word = match.group()
+        key = word.casefold()
+        if key in seen or len(word) < min_length:
+            continue
+        seen.add(key)
+        if not is_common_word(word, language):
+            words.append(word)
+    return words
+
+
+class TranscriptPretranslator:
+    """Pre-translates a text in batches on a small pool of daemon worker threads."""
+
+    def __init__(self, translator: GPTTranslator, language_from: str, language_to: str,
+                 batch_size: int = 40, max_workers: int = 3):
+        """
+        Args:
+            translator: Translator whose cache receives the results
+            language_from: Source language code
+            language_to: Target language code
+            batch_size: Words per GPT request
+            max_workers: Concurrent GPT requests
+        """
+        self.translator = translator
+        self.language_from = language_from
+        self.language_to = language_to
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self._batches = queue.Queue()
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self.words_done = 0
+        self.words_total = 0
+
+    def start(self, text: str, progress_callback: Optional[Callable[[int, int], None]] = None):
+        """
+        Start pre-translating in the background.
+
+        Args:
+            text: Full text to pre-translate
+            progress_callback: Optional callback(words_done, words_total), called from worker threads
+        """
+        def prepare_and_run():
+            words = [
+                word for word in extract_words(text, self.language_from)
+                if self.translator.cache.peek("analysis", word, self.language_from, self.language_to) is None
+            ]
+            self.words_total = len(words)
+            if not words or self._cancelled.is_set():
+                return
+
+            for i in range(0, len(words), self.batch_size):
+                self._batches.put(words[i:i + self.batch_size])
+
+            workers = min(self.max_workers, self._batches.qsize())
+            print(f"📚 Pre-translating {len(words)} words in {self._batches.qsize()} batches")
+            for _ in range(workers):
+                threading.Thread(target=self._worker, args=(progress_callback,), daemon=True).start()
+
+        threading.Thread(target=prepare_and_run, daemon=True).start()
+
+    def _worker(self, progress_callback):
+        """Take batches off the queue until it is empty or the job is cancelled."""
+        while not self._cancelled.is_set():
+            try:
+                batch = self._batches.get_nowait()
+            except queue.Empty:
+                return
+
+            try:
+                # Double-click lookups go first (see RequestSlots)
+                with background_requests():
+                    self.translator.analyze_words_batch(batch, self.language_from, self.language_to)
+            except Exception as e:
+                print(f"Pre-translation batch failed: {e}")
+
+            with self._lock:
+                self.words_done += len(batch)
+                words_done = self.words_done
+            if progress_callback and not self._cancelled.is_set():
+                progress_callback(words_done, self.words_total)
+
+    def cancel(self):
+        """Stop after the requests already in flight."""
+        self._cancelled.set()
@@ -5,13 +5,14 @@ from tkinter import Frame, Label, Button
 from .audio_controls import AudioControls
 from .text_display import TranscriptionTextDisplay
 from .vocabulary_panel import VocabularyPanel
+from .pretranslator import TranscriptPretranslator
 from .styles import center_top_window
 
 class ReaderUI:
     """Shared reader UI with text display and audio controls"""
     
     def __init__(self, master, title, audio_path=None, text_content=None, srt_path=None, back_callback=None, 
-                 language_from="fr", language_to="de"):
+                 language_from="fr", language_to="de", streaming=False):
         self.master = master
         self.title = title
         self.audio_path = audio_path
@@ -20,6 +21,7 @@ class ReaderUI:
         self.back_callback = back_callback
         self.language_from = language_from
         self.language_to = language_to
+        self.streaming = streaming  # Text arrives via append_text until finish_streaming
         
         # For custom highlighting functionality
         self.highlight_callback = None
@@ -60,6 +62,9 @@ class ReaderUI:
 
         # Audio controls at bottom
         self.setup_audio_controls()
+        
+        # Warm the translation cache for the whole text
+        self.start_pretranslation()
 
     def setup_header(self, parent):
         """Setup the header with back button and title"""
@@ -73,6 +78,21 @@ class ReaderUI:
         
         Label(header, text=self.title, font=("Segoe UI", 18, "bold"),
               bg='#f9f9fa', fg='#2c3e50').pack(side='left', padx=20)
+        
+        # Colour words by frequency band
+        self.heatmap_button = Button(header, text="🎨 Word Frequency", command=self.toggle_frequency_heatmap,
+                                     font=("Segoe UI", 10), bg='#e9ecef', fg='#2c3e50',
+                                     activebackground='#dee2e6', relief='flat', bd=0, pady=5, padx=12)
+        self.heatmap_button.pack(side='right', padx=(0, 30))
+
+    def toggle_frequency_heatmap(self):
+        """Show or hide the frequency-band colouring of the text"""
+        if self.text_display.heatmap_enabled:
+            self.text_display.hide_frequency_heatmap()
+            self.heatmap_button.config(relief='flat', bg='#e9ecef')
+        else:
+            self.text_display.show_frequency_heatmap(self.language_from)
+            self.heatmap_button.config(relief='sunken', bg='#d0ebff')
 
     def setup_text_area(self, parent):
         """Setup the main text display area"""
@@ -82,7 +102,7 @@ class ReaderUI:
         main_frame.grid_rowconfigure(1, weight=1)
 
         # Text area label
-        text_label = "Generated Text" if self.text_content else "Transcription Text"
+        text_label = "Generated Text" if self.text_content or self.streaming else "Transcription Text"
         Label(main_frame, text=text_label, font=("Segoe UI", 13, "bold"),
               bg='#ffffff', fg='#2c3e50').grid(row=0, column=0, sticky='w', pady=(0, 5))
         
@@ -115,12 +135,31 @@ class ReaderUI:
         # Create vocabulary panel
         self.vocabulary_panel = VocabularyPanel(vocab_frame, self.language_from, self.language_to)
 
+    def start_pretranslation(self):
+        """Pre-translate uncommon words of the displayed text in the background"""
+        translator = getattr(self.vocabulary_panel, 'translator', None)
+        text = self.text_display.get_full_text()
+        if not translator or not text:
+            return
+        
+        self.pretranslator = TranscriptPretranslator(translator, self.language_from, self.language_to)
+        self.pretranslator.start(text)
+        
+        # Stop issuing requests once the reader is closed
+        self.text_display.text_widget.bind('<Destroy>', lambda e: self.pretranslator.cancel(), add='+')
+
     def setup_audio_controls(self):
         """Setup the audio controls at the bottom"""
         # Audio controls frame
         self.audio_controls_frame = Frame(self.master, bg='#f9f9fa')
         self.audio_controls_frame.grid(row=1, column=0, sticky='ew', padx=30, pady=10)
         
+        if self.streaming:
+            # Controls are created once the audio exists (see finish_streaming)
+            Label(self.audio_controls_frame, text="🎵 Generating audio...", font=("Segoe UI", 10),
+                  bg='#f9f9fa', fg='#7f8c8d').pack(pady=5)
+            return
+        
         # Use shared audio controls component
         self.audio_controls = AudioControls(self.audio_controls_frame, self.audio_path)
         
@@ -130,6 +169,40 @@ class ReaderUI:
         # Connect highlighting functionality
         self.connect_highlighting()
 
+    def append_text(self, text_fragment):
+        """Show more of a text that is still being generated"""
+        self.text_display.append_text(text_fragment)
+
+    def finish_streaming(self, text_content, audio_path=None, srt_path=None):
+        """
+        Switch from live text to the finished text and its audio.
+        
+        Args:
+            text_content: Complete text (replaces the streamed text if it differs)
+            audio_path: Path to the generated audio, if any
+            srt_path: Sentence cues of the audio, if any (the text is then shown as cues
+                and highlighted during playback)
+        """
+        self.streaming = False
+        self.text_content = text_content
+        self.audio_path = audio_path
+        self.srt_path = srt_path
+        
+        if srt_path:
+            self.text_display.load_srt(srt_path)
+        elif text_content and text_content != self.text_display.get_full_text():
+            self.text_display.set_text(text_content)
+        elif self.text_display.heatmap_enabled:
+            self.text_display.show_frequency_heatmap(self.language_from)
+        
+        self.audio_controls_frame.destroy()
+        self.setup_audio_controls()
+        self.start_pretranslation()
+
+    def show_target_words(self, words, lemmatize=None):
+        """Show vocabulary words in bold in the text (see TranscriptionTextDisplay.show_target_words)"""
+        self.text_display.show_target_words(words, lemmatize)
+
     def connect_highlighting(self):
         """Connect the audio controls to text highlighting"""
         # Store original update method
@@ -177,6 +250,14 @@ class ReaderUI:
         if hasattr(self, 'text_display'):
             self.text_display.highlight_current_segment(current_time)
 
+    def seek_to(self, seconds):
+        """Show and highlight the text at a position and move the audio there"""
+        if hasattr(self, 'text_display'):
+            self.text_display.highlight_current_segment(seconds)
+            self.text_display.show_segment(self.text_display.current_segment_idx)
+        if hasattr(self, 'audio_controls'):
+            self.audio_controls.seek_to(seconds)
+
     def set_highlight_callback(self, callback):
         """Set a custom callback for segment highlighting"""
         self.highlight_callback = callback
@@ -235,3 +316,6 @@ class ReaderUI:
         
         if hasattr(self, 'vocabulary_panel'):
             self.vocabulary_panel.set_languages(language_from, language_to)
+        
+        if hasattr(self, 'text_display') and self.text_display.heatmap_enabled:
+            self.text_display.show_frequency_heatmap(language_from)
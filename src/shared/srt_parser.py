@@ -0,0 +1,209 @@
+"""
+Line-oriented SRT parser with a binary cache of parsed transcripts.
+
+Segments are parsed lazily one cue at a time. Fully parsed transcripts are
+cached as float arrays of start/end times plus one text blob, keyed by the
+SRT file's path, mtime and size, so reopening a transcript skips parsing.
+"""
+
+import os
+import sys
+import struct
+import hashlib
+from array import array
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional
+
+from ..config import SRT_CACHE_DIR
+
+_MAGIC = b'ILSR'
+_VERSION = 1
+_HEADER = struct.Struct('<4sIqqII')  # magic, version, mtime_ns, size, count, text bytes
+
+
+@dataclass
+class ParsedTranscript:
+    """Parsed SRT cues stored column-wise; cue texts are joined by newlines."""
+    starts: array = field(default_factory=lambda: array('d'))
+    ends: array = field(default_factory=lambda: array('d'))
+    indices: array = field(default_factory=lambda: array('I'))
+    text: str = ""
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def texts(self) -> List[str]:
+        """Return the text of each cue."""
+        return self.text.split('\n') if len(self) else []
+
+    def segments(self) -> List[dict]:
+        """Return cues as {'idx', 'start', 'end', 'text'} dictionaries."""
+        return [
+            {'idx': idx, 'start': start, 'end': end, 'text': text}
+            for idx, start, end, text in zip(self.indices, self.starts, self.ends, self.texts())
+        ]
+
+
+def parse_srt_time(time_str: str) -> float:
+    """Convert an SRT timestamp (HH:MM:SS,mmm) to seconds."""
+    h, m, rest = time_str.strip().split(':')
+    s, _, ms = rest.replace('.', ',').partition(',')
+    return int(h) * 3600 + int(m) * 60 + int(s) + int(ms.ljust(3, '0')[:3]) / 1000
+
+
+def iter_srt_segments(srt_path: str) -> Iterator[dict]:
+    """
+    Yield SRT cues one at a time without reading the whole file.
+
+    Args:
+        srt_path: Path to the SRT file
+
+    Yields:
+        Dictionaries with 'idx', 'start', 'end' and 'text' (lines joined by spaces)
+    """
+    with open(srt_path, 'r', encoding='utf-8-sig') as f:
+        idx = None
+        start = end = None
+        text_lines = []
+
+        for raw_line in f:
+            line = raw_line.strip()
+
+            if start is None:
+                # Waiting for the cue number and the timing line
+                if not line:
+                    continue
+                if '-->' in line:
+                    start_str, _, end_str = line.partition('-->')
+                    try:
+                        start = parse_srt_time(start_str)
+                        end = parse_srt_time(end_str.split()[0])
+                    except (ValueError, IndexError):
+                        start = end = None
+                elif line.isdigit():
+                    idx = int(line)
+                continue
+
+            if line:
+                text_lines.append(line)
+                continue
+
+            # A blank line closes the cue
+            yield {'idx': idx if idx is not None else 0, 'start': start, 'end': end,
+                   'text': ' '.join(text_lines)}
+            idx = None
+            start = end = None
+            text_lines = []
+
+        if start is not None:
+            yield {'idx': idx if idx is not None else 0, 'start': start, 'end': end,
+                   'text': ' '.join(text_lines)}
+
+
+def parse_srt(srt_path: str) -> ParsedTranscript:
+    """Parse an SRT file into a column-oriented transcript."""
+    transcript = ParsedTranscript()
+    texts = []
+    for seg in iter_srt_segments(srt_path):
+        transcript.indices.append(seg['idx'])
+        transcript.starts.append(seg['start'])
+        transcript.ends.append(seg['end'])
+        texts.append(seg['text'])
+    transcript.text = '\n'.join(texts)
+    return transcript
+
+
+def format_srt_time(seconds: float) -> str:
+    """Convert seconds to an SRT timestamp (HH:MM:SS,mmm)."""
+    total_ms = max(0, int(round(seconds * 1000)))
+    h, rest = divmod(total_ms, 3600000)
+    m, rest = divmod(rest, 60000)
+    s, ms = divmod(rest, 1000)
+    return f"{h:02}:{m:02}:{s:02},{ms:03}"
+
+
+def write_srt(segments: List[dict], srt_path: str):
+    """
+    Write cues to an SRT file.
+
+    Args:
+        segments: Dictionaries with 'start', 'end' (seconds) and 'text'
+        srt_path: Path of the SRT file
+    """
+    tmp_path = f"{srt_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for i, seg in enumerate(segments, 1):
+            text = ' '.join(seg['text'].split())  # One line per cue
+            f.write(f"{i}\n{format_srt_time(seg['start'])} --> {format_srt_time(seg['end'])}\n{text}\n\n")
+    os.replace(tmp_path, srt_path)
+
+
+def _cache_path(srt_path: str, cache_dir: str = None) -> str:
+    """Get the cache file path for an SRT file."""
+    key = hashlib.sha1(os.path.abspath(srt_path).encode('utf-8')).hexdigest()
+    return os.path.join(cache_dir or SRT_CACHE_DIR, f"{key}.bin")
+
+
+def _read_cache(cache_path: str, mtime_ns: int, size: int) -> Optional[ParsedTranscript]:
+    """Read a cached transcript if it matches the SRT file's mtime and size."""
+    try:
+        with open(cache_path, 'rb') as f:
+            magic, version, cached_mtime, cached_size, count, text_bytes = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != _MAGIC or version != _VERSION or cached_mtime != mtime_ns or cached_size != size:
+                return None
+            columns = []
+            for typecode in ('d', 'd', 'I'):
+                column = array(typecode)
+                column.fromfile(f, count)
+                if sys.byteorder == 'big':
+                    column.byteswap()
+                columns.append(column)
+            text = f.read(text_bytes).decode('utf-8')
+    except (OSError, EOFError, struct.error, UnicodeDecodeError):
+        return None
+    return ParsedTranscript(starts=columns[0], ends=columns[1], indices=columns[2], text=text)
+
+
+def _write_cache(cache_path: str, transcript: ParsedTranscript, mtime_ns: int, size: int):
+    """Write a transcript to the cache atomically."""
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    text_bytes = transcript.text.encode('utf-8')
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, mtime_ns, size, len(transcript), len(text_bytes)))
+        for column in (transcript.starts, transcript.ends, transcript.indices):
+            if sys.byteorder == 'big':
+                column = array(column.typecode, column)
+                column.byteswap()
+            column.tofile(f)
+        f.write(text_bytes)
+    os.replace(tmp_path, cache_path)
+
+
+def load_transcript(srt_path: str, use_cache: bool = True, cache_dir: str = None) -> ParsedTranscript:
+    """
+    Load a parsed transcript, using the binary cache when it is up to date.
+
+    Args:
+        srt_path: Path to the SRT file
+        use_cache: Whether to read from and write to the cache
+        cache_dir: Directory of the cache files (default: SRT_CACHE_DIR)
+
+    Returns:
+        ParsedTranscript for the file
+    """
+    if not use_cache:
+        return parse_srt(srt_path)
+
+    stat = os.stat(srt_path)
+    cache_path = _cache_path(srt_path, cache_dir)
+    transcript = _read_cache(cache_path, stat.st_mtime_ns, stat.st_size)
+    if transcript is not None:
+        return transcript
+
+    transcript = parse_srt(srt_path)
+    try:
+        _write_cache(cache_path, transcript, stat.st_mtime_ns, stat.st_size)
+    except OSError as e:
+        print(f"Could not cache transcript {srt_path}: {e}")
+    return transcript
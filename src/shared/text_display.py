@@ -2,22 +2,60 @@
 Shared text display component with SRT highlighting for transcription review
 """
 from tkinter import Frame, Label, Text, Scrollbar
-import re
+import threading
+from array import array
+from bisect import bisect_right
 from .styles import Colors
+from .frequency_analysis import FREQUENCY_BANDS, RARE_BAND, analyze_text
+from .word_timings import WordTimings, sidecar_path
+from .srt_parser import load_transcript, parse_srt_time
+from .vocab_coverage import VocabularyMatcher
 
 class TranscriptionTextDisplay:
     """Text display widget with SRT highlighting for transcription review"""
     
-    def __init__(self, parent_frame, srt_path, highlight_callback=None):
+    # Virtualized rendering: only a window of cues lives in the Text widget
+    VIRTUALIZE_THRESHOLD = 2000  # Cue count above which virtualization is enabled automatically
+    WINDOW_SIZE = 300  # Cues materialized at once
+    PAGE_MARGIN = 0.15  # Page in new cues when the viewport gets this close to a window edge
+    
+    # Frequency heatmap: one shared tag per band; Top 100 / Top 1,000 keep the normal text colour
+    HEATMAP_BANDS = FREQUENCY_BANDS + [RARE_BAND]
+    HEATMAP_SKIP_BANDS = 2
+    
+    def __init__(self, parent_frame, srt_path, highlight_callback=None, virtualized=None):
         self.parent_frame = parent_frame
         self.srt_path = srt_path
         self.highlight_callback = highlight_callback
+        self.virtualized = virtualized  # None = decide from the transcript length
         self.srt_segments = []
+        self.segment_starts = array('d')  # Sorted cue start times for bisect lookup
+        self.segment_ends = array('d')
         self.current_segment_idx = -1
+        self.word_timings = None
+        self.current_word_idx = -1
+        self.full_text = ""  # Whole displayed text, including cues outside the window
+        
+        # Materialized cue range [window_start, window_end) in virtualized mode
+        self.segment_texts = []
+        self.window_start = 0
+        self.window_end = 0
+        self._paging = False
+        self._page_pending = False
+        
+        # Frequency heatmap state; spans cover the whole text, not just the window
+        self.heatmap_enabled = False
+        self.heatmap_language = None
+        self.heatmap_spans = None
+        
+        # Vocabulary words shown in bold (see show_target_words); spans index full_text
+        self.target_matcher = None
+        self.target_spans = []
         
         self.setup_text_display()
         if self.srt_path:
             self.parse_and_display_srt()
+            self.word_timings = WordTimings.load(sidecar_path(self.srt_path))
     
     def setup_text_display(self):
         """Setup the text display widget"""
@@ -38,40 +76,58 @@ class TranscriptionTextDisplay:
                                padx=20, 
                                pady=15)
         
-        scrollbar = Scrollbar(self.parent_frame, orient='vertical', command=self.text_widget.yview)
-        self.text_widget.configure(yscrollcommand=scrollbar.set)
+        # Scrolling goes through our handlers so virtualized mode can map the
+        # scrollbar to the whole transcript instead of the materialized window
+        self.scrollbar = Scrollbar(self.parent_frame, orient='vertical', command=self.on_scrollbar)
+        self.text_widget.configure(yscrollcommand=self.on_text_scroll)
         
         self.text_widget.grid(row=0, column=0, sticky='nsew')
-        scrollbar.grid(row=0, column=1, sticky='ns')
+        self.scrollbar.grid(row=0, column=1, sticky='ns')
+        
+        # One moving tag marks the active segment; created first so the word tag wins
+        self.text_widget.tag_configure('current_segment', background='#fff3cd')
+        
+        # Karaoke-style highlight for the word currently spoken
+        self.text_widget.tag_configure('current_word', background='#ffd966', underline=True)
+        
+        # Session vocabulary in the text
+        self.text_widget.tag_configure('target_word', font=("Segoe UI", 12, "bold"))
+        
+        # Heatmap tags only set the foreground, so they combine with the highlights
+        for code in range(self.HEATMAP_SKIP_BANDS, len(self.HEATMAP_BANDS)):
+            self.text_widget.tag_configure(f'freq_{code}', foreground=self.HEATMAP_BANDS[code][3])
     
     def parse_and_display_srt(self):
         """Parse SRT file and display with highlighting capability"""
         self.srt_segments = []
+        self.segment_starts = array('d')
+        self.segment_ends = array('d')
+        self.current_segment_idx = -1
+        self.heatmap_spans = None
         self.text_widget.config(state='normal')
         self.text_widget.delete('1.0', 'end')
         
         try:
-            with open(self.srt_path, 'r', encoding='utf-8') as f:
-                srt_content = f.read()
+            # Parsed cues come from the binary cache when the SRT is unchanged
+            transcript = load_transcript(self.srt_path)
+            self.srt_segments = transcript.segments()
+            self.segment_starts = transcript.starts
+            self.segment_ends = transcript.ends
+            self.full_text = transcript.text
             
-            # Parse SRT format
-            pattern = re.compile(r"(\d+)\s+([\d:,]+) --> ([\d:,]+)\s+([\s\S]*?)(?=\n\d+\n|\Z)")
-            for match in pattern.finditer(srt_content):
-                idx = int(match.group(1))
-                start = self.srt_time_to_seconds(match.group(2))
-                end = self.srt_time_to_seconds(match.group(3))
-                text = match.group(4).strip().replace('\n', ' ')
-                
-                self.srt_segments.append({'idx': idx, 'start': start, 'end': end, 'text': text})
+            if self.virtualized is None:
+                self.virtualized = len(transcript) > self.VIRTUALIZE_THRESHOLD
             
-            # Insert lines and tag them for highlighting
-            for i, seg in enumerate(self.srt_segments):
-                tag = f'seg_{i}'
-                self.text_widget.insert('end', seg['text'] + '\n', tag)
-                # Set default background
-                self.text_widget.tag_configure(tag, background='#fafafa')
+            if self.virtualized:
+                self.segment_texts = transcript.texts()
+                self.materialize_window(0)
+            elif len(transcript):
+                # Bulk insert: one line per segment, segment i lives on line i + 1
+                self.text_widget.insert('end', transcript.text + '\n')
+                self.window_start, self.window_end = 0, len(transcript)
             
             self.text_widget.config(state='disabled')
+            self.find_target_words()
             
         except Exception as e:
             self.text_widget.insert('1.0', f"Failed to load transcription: {e}")
@@ -79,34 +135,318 @@ class TranscriptionTextDisplay:
     
     def srt_time_to_seconds(self, time_str):
         """Convert SRT time format to seconds"""
-        h, m, rest = time_str.split(':')
-        s, ms = rest.split(',')
-        return int(h)*3600 + int(m)*60 + int(s) + int(ms)/1000
+        return parse_srt_time(time_str)
+    
+    def segment_line(self, segment_idx):
+        """Get the Text widget line of a segment, or None if it is not materialized"""
+        if self.window_start <= segment_idx < self.window_end:
+            return segment_idx - self.window_start + 1
+        return None
+    
+    def materialize_window(self, start, anchor_segment=None):
+        """
+        Render the cue window beginning at start (virtualized mode).
+        
+        Args:
+            start: First segment index to materialize
+            anchor_segment: Segment to keep at the top of the viewport (default: start)
+        """
+        total = len(self.segment_texts)
+        start = max(0, min(start, total - self.WINDOW_SIZE))
+        end = min(total, start + self.WINDOW_SIZE)
+        
+        self._paging = True
+        try:
+            state = self.text_widget.cget('state')
+            self.text_widget.config(state='normal')
+            self.text_widget.delete('1.0', 'end')
+            self.text_widget.insert('1.0', '\n'.join(self.segment_texts[start:end]) + '\n')
+            self.text_widget.config(state=state)
+            self.window_start, self.window_end = start, end
+            
+            if anchor_segment is None:
+                anchor_segment = start
+            self.text_widget.yview(f'{self.segment_line(anchor_segment) or 1}.0')
+            
+            # Highlights were dropped with the old window content
+            self.reapply_highlights()
+        finally:
+            self._paging = False
+    
+    def reapply_highlights(self):
+        """Re-tag the active segment and word after the window content changed"""
+        segment_line = self.segment_line(self.current_segment_idx) if self.current_segment_idx >= 0 else None
+        if segment_line:
+            self.text_widget.tag_add('current_segment', f'{segment_line}.0', f'{segment_line + 1}.0')
+        
+        if self.word_timings and self.current_word_idx >= 0:
+            self.tag_word(self.current_word_idx)
+        
+        if self.heatmap_enabled:
+            self.apply_heatmap()
+        
+        self.apply_target_words()
+    
+    def on_text_scroll(self, first, last):
+        """Text widget scrolled: update the scrollbar and page in cues near the edges"""
+        if not self.virtualized or not self.segment_texts:
+            self.scrollbar.set(first, last)
+            return
+        
+        first, last = float(first), float(last)
+        total = len(self.segment_texts)
+        window_len = self.window_end - self.window_start
+        self.scrollbar.set((self.window_start + first * window_len) / total,
+                           (self.window_start + last * window_len) / total)
+        
+        if self._paging or self._page_pending:
+            return
+        if first < self.PAGE_MARGIN and self.window_start > 0:
+            self._page_pending = True
+            self.text_widget.after_idle(lambda: self.page_window(-1))
+        elif last > 1 - self.PAGE_MARGIN and self.window_end < total:
+            self._page_pending = True
+            self.text_widget.after_idle(lambda: self.page_window(1))
+    
+    def page_window(self, direction):
+        """Shift the window half a page while keeping the top visible cue in place"""
+        self._page_pending = False
+        if self._paging:
+            return
+        top_line = int(self.text_widget.index('@0,0').split('.')[0])
+        top_segment = self.window_start + top_line - 1
+        self.materialize_window(self.window_start + direction * (self.WINDOW_SIZE // 2), top_segment)
+    
+    def on_scrollbar(self, *args):
+        """Scrollbar dragged or clicked: map the position onto the whole transcript"""
+        if not self.virtualized or not self.segment_texts:
+            self.text_widget.yview(*args)
+            return
+        
+        if args[0] == 'moveto':
+            target = int(float(args[1]) * len(self.segment_texts))
+            target = max(0, min(target, len(self.segment_texts) - 1))
+            if self.segment_line(target) is None:
+                self.materialize_window(target - self.WINDOW_SIZE // 2, target)
+            else:
+                self.text_widget.yview(f'{self.segment_line(target)}.0')
+        else:
+            self.text_widget.yview(*args)
+    
+    def show_segment(self, segment_idx):
+        """Scroll a segment into view, paging it in if needed"""
+        if segment_idx < 0 or segment_idx >= len(self.srt_segments):
+            return
+        if self.segment_line(segment_idx) is None:
+            self.materialize_window(segment_idx - self.WINDOW_SIZE // 2, segment_idx)
+        self.text_widget.see(f'{self.segment_line(segment_idx)}.0')
+    
+    def segment_at(self, current_time):
+        """Return the index of the segment playing at the given time, or -1"""
+        idx = bisect_right(self.segment_starts, current_time) - 1
+        if idx >= 0 and current_time <= self.segment_ends[idx]:
+            return idx
+        return -1
     
     def highlight_current_segment(self, current_time):
         """Highlight the current segment based on audio time"""
-        # Remove previous highlight
-        for i in range(len(self.srt_segments)):
-            tag = f'seg_{i}'
-            self.text_widget.tag_configure(tag, background='#fafafa')
-        
-        # Find and highlight the current segment
-        for i, seg in enumerate(self.srt_segments):
-            if seg['start'] <= current_time <= seg['end']:
-                tag = f'seg_{i}'
-                self.text_widget.tag_configure(tag, background='#fff3cd')
+        idx = self.segment_at(current_time)
+        
+        # Only touch the widget when the active segment changes
+        if idx != self.current_segment_idx:
+            self.current_segment_idx = idx
+            self.text_widget.tag_remove('current_segment', '1.0', 'end')
+            if idx >= 0:
+                # Follow playback out of the materialized window
+                if self.virtualized and self.segment_line(idx) is None:
+                    self.show_segment(idx)
+                line = self.segment_line(idx)
+                self.text_widget.tag_add('current_segment', f'{line}.0', f'{line + 1}.0')
                 
                 # Call highlight callback if provided
                 if self.highlight_callback:
-                    self.highlight_callback(i, seg)
-                break
+                    self.highlight_callback(idx, self.srt_segments[idx])
+        
+        self.highlight_current_word(current_time)
+    
+    def highlight_current_word(self, current_time):
+        """Highlight the word spoken at the given audio time (needs a word timing sidecar)"""
+        if not self.word_timings:
+            return
+        
+        word_idx = self.word_timings.word_at(current_time)
+        if word_idx == self.current_word_idx:
+            return
+        
+        self.current_word_idx = word_idx
+        self.text_widget.tag_remove('current_word', '1.0', 'end')
+        if word_idx >= 0:
+            self.tag_word(word_idx)
+    
+    def tag_word(self, word_idx):
+        """Apply the current_word tag to a word if its segment is materialized"""
+        seg_idx, offset, length = self.word_timings.word_location(word_idx)
+        line = self.segment_line(seg_idx)
+        if line:
+            self.text_widget.tag_add('current_word', f'{line}.{offset}', f'{line}.{offset + length}')
     
     def set_text(self, text_content):
         """Set plain text content (for non-SRT text)"""
+        self.full_text = text_content
+        self.heatmap_spans = None
         self.text_widget.config(state='normal')
         self.text_widget.delete('1.0', 'end')
         self.text_widget.insert('1.0', text_content)
         self.text_widget.config(state='disabled')
+        self.find_target_words()
+        
+        if self.heatmap_enabled:
+            self.show_frequency_heatmap(self.heatmap_language)
+    
+    def load_srt(self, srt_path):
+        """Replace the displayed text with the cues of an SRT file (enables highlighting)"""
+        self.srt_path = srt_path
+        self.virtualized = None
+        self.parse_and_display_srt()
+        self.word_timings = WordTimings.load(sidecar_path(srt_path))
+        self.current_word_idx = -1
+        
+        if self.heatmap_enabled:
+            self.show_frequency_heatmap(self.heatmap_language)
+    
+    def append_text(self, text_fragment):
+        """
+        Append text at the end (for text that is still being generated).
+        
+        Follows the end of the text unless the user scrolled up. The heatmap
+        is recomputed once the text is final (see set_text).
+        
+        Args:
+            text_fragment: Text to append
+        """
+        if not text_fragment:
+            return
+        follow = self.text_widget.yview()[1] >= 0.999
+        self.full_text += text_fragment
+        self.heatmap_spans = None
+        self.text_widget.config(state='normal')
+        self.text_widget.insert('end-1c', text_fragment)
+        self.text_widget.config(state='disabled')
+        if follow:
+            self.text_widget.see('end')
+    
+    def show_frequency_heatmap(self, language):
+        """
+        Colour every word by its frequency band.
+        
+        The whole text is tokenized and analyzed once in a background thread;
+        the result is reused when the heatmap is toggled or the window pages.
+        
+        Args:
+            language: Language code of the displayed text
+        """
+        self.heatmap_enabled = True
+        if self.heatmap_spans is not None and self.heatmap_language == language:
+            self.apply_heatmap()
+            return
+        
+        self.heatmap_language = language
+        text = self.full_text
+        
+        def analyze():
+            try:
+                spans = analyze_text(text, language)
+            except Exception as e:
+                print(f"Frequency heatmap failed: {e}")
+                return
+            self.text_widget.after(0, lambda: self.heatmap_ready(text, language, spans))
+        
+        threading.Thread(target=analyze, daemon=True).start()
+    
+    def heatmap_ready(self, text, language, spans):
+        """Store analyzed spans (main thread) unless the text changed meanwhile"""
+        if text is not self.full_text or language != self.heatmap_language:
+            return
+        self.heatmap_spans = spans
+        if self.heatmap_enabled:
+            self.apply_heatmap()
+    
+    def hide_frequency_heatmap(self):
+        """Remove the frequency colouring"""
+        self.heatmap_enabled = False
+        self.clear_heatmap_tags()
+    
+    def clear_heatmap_tags(self):
+        """Remove all heatmap tags from the widget"""
+        for code in range(self.HEATMAP_SKIP_BANDS, len(self.HEATMAP_BANDS)):
+            self.text_widget.tag_remove(f'freq_{code}', '1.0', 'end')
+    
+    def apply_heatmap(self):
+        """Tag the materialized words with one shared tag per band"""
+        self.clear_heatmap_tags()
+        spans = self.heatmap_spans
+        if spans is None:
+            return
+        
+        # Text line of each span; in virtualized mode only the window is in the widget
+        lines = spans['line']
+        visible = spans['category'] >= self.HEATMAP_SKIP_BANDS
+        if self.virtualized:
+            visible &= (lines >= self.window_start) & (lines < self.window_end)
+            lines = lines - self.window_start
+        
+        for code in range(self.HEATMAP_SKIP_BANDS, len(self.HEATMAP_BANDS)):
+            selected = visible & (spans['category'] == code)
+            if not selected.any():
+                continue
+            # A single tag_add call with all ranges of the band
+            indices = []
+            for line, start, end in zip((lines[selected] + 1).tolist(), spans['start'][selected].tolist(),
+                                        spans['end'][selected].tolist()):
+                indices.append(f'{line}.{start}')
+                indices.append(f'{line}.{end}')
+            self.text_widget.tag_add(f'freq_{code}', *indices)
+    
+    def show_target_words(self, words, lemmatize=None):
+        """
+        Show vocabulary words in bold wherever the text uses them (inflected forms included).
+        
+        Args:
+            words: Vocabulary entries (single words or expressions)
+            lemmatize: Optional word -> lemma function for irregular forms
+        """
+        self.target_matcher = VocabularyMatcher(words, lemmatize) if words else None
+        self.find_target_words()
+    
+    def find_target_words(self):
+        """Locate the target words in the whole text and tag them"""
+        self.target_spans = []
+        if self.target_matcher and self.full_text:
+            spans = sorted(span for spans in self.target_matcher.find_spans(self.full_text) for span in spans)
+            # full_text offsets -> (line, start column, end column); lines are cues in SRT mode
+            line_starts = [0] + [i + 1 for i, char in enumerate(self.full_text) if char == '\n']
+            for start, end in spans:
+                line = bisect_right(line_starts, start) - 1
+                self.target_spans.append((line, start - line_starts[line], end - line_starts[line]))
+        self.apply_target_words()
+    
+    def apply_target_words(self):
+        """Tag the materialized target word spans"""
+        self.text_widget.tag_remove('target_word', '1.0', 'end')
+        indices = []
+        for line, start, end in self.target_spans:
+            if self.virtualized:
+                if not self.window_start <= line < self.window_end:
+                    continue
+                line -= self.window_start
+            indices.append(f'{line + 1}.{start}')
+            indices.append(f'{line + 1}.{end}')
+        if indices:
+            self.text_widget.tag_add('target_word', *indices)
+    
+    def get_full_text(self):
+        """Get the complete text, independent of what is currently materialized"""
+        return self.full_text
     
     def get_segments(self):
         """Get parsed SRT segments"""
@@ -114,6 +454,8 @@ class TranscriptionTextDisplay:
     
     def clear(self):
         """Clear the text display"""
+        self.full_text = ""
+        self.heatmap_spans = None
         self.text_widget.config(state='normal')
         self.text_widget.delete('1.0', 'end')
         self.text_widget.config(state='disabled')
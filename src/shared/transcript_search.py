@@ -0,0 +1,185 @@
+"""
+Full-text search over saved transcriptions.
+
+Every SRT cue in the transcription library is stored in an SQLite FTS5 index
+together with its file, cue number and start time. Files are re-indexed only
+when their mtime or size changed, and the transcriber indexes each new SRT as
+soon as it is written.
+"""
+
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from ..config import TRANSCRIPT_SEARCH_FILE, TRANSCRIPTIONS_DIR
+from .srt_parser import load_transcript
+from .frequency_analysis import WORD_PATTERN
+
+
+@dataclass
+class SearchHit:
+    """One matching cue."""
+    srt_path: str
+    cue: int  # 0-based segment index, as used by TranscriptionTextDisplay
+    start: float  # Seconds
+    text: str
+    snippet: str  # Cue text with matches wrapped in [brackets]
+
+
+def build_match_query(query: str) -> str:
+    """
+    Turn user input into an FTS5 query: every word must match as a prefix.
+
+    Returns:
+        FTS5 MATCH expression, or an empty string if the input has no words
+    """
+    return " ".join(f'"{word}"*' for word in WORD_PATTERN.findall(query))
+
+
+class TranscriptSearchIndex:
+    """SQLite FTS5 index over all SRT cues of the transcription library."""
+
+    def __init__(self, db_path: str = None, corpus_dir: str = None):
+        """
+        Args:
+            db_path: SQLite file path (default: TRANSCRIPT_SEARCH_FILE)
+            corpus_dir: Directory with SRT files (default: TRANSCRIPTIONS_DIR)
+        """
+        self.db_path = db_path or TRANSCRIPT_SEARCH_FILE
+        self.corpus_dir = corpus_dir or TRANSCRIPTIONS_DIR
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS cues USING fts5(
+                text,
+                path UNINDEXED,
+                cue UNINDEXED,
+                start UNINDEXED,
+                tokenize = 'unicode61 remove_diacritics 2'
+            );
+        """)
+
+    def srt_files(self) -> List[str]:
+        """List the SRT files currently in the corpus directory."""
+        if not os.path.isdir(self.corpus_dir):
+            return []
+        return sorted(
+            os.path.join(self.corpus_dir, name) for name in os.listdir(self.corpus_dir)
+            if name.lower().endswith('.srt')
+        )
+
+    def index_file(self, srt_path: str) -> bool:
+        """
+        Index one SRT file if it changed since it was last indexed.
+
+        Args:
+            srt_path: Path to the SRT file
+
+        Returns:
+            True if the file was (re-)indexed
+        """
+        path = os.path.abspath(srt_path)
+        stat = os.stat(path)
+        with self._lock:
+            row = self._conn.execute("SELECT mtime_ns, size FROM files WHERE path = ?", (path,)).fetchone()
+            if row == (stat.st_mtime_ns, stat.st_size):
+                return False
+
+            # Reuses the binary transcript cache shared with the reader
+            transcript = load_transcript(path)
+            with self._conn:
+                self._conn.execute("DELETE FROM cues WHERE path = ?", (path,))
+                self._conn.executemany(
+                    "INSERT INTO cues (text, path, cue, start) VALUES (?, ?, ?, ?)",
+                    ((text, path, cue, start) for cue, (text, start)
+                     in enumerate(zip(transcript.texts(), transcript.starts)))
+                )
+                self._conn.execute("INSERT OR REPLACE INTO files (path, mtime_ns, size) VALUES (?, ?, ?)",
+                                   (path, stat.st_mtime_ns, stat.st_size))
+        return True
+
+    def update(self, progress_callback: Optional[Callable[[str], None]] = None) -> Dict[str, int]:
+        """
+        Bring the index up to date with the corpus directory.
+
+        Args:
+            progress_callback: Optional callback receiving status messages
+
+        Returns:
+            Counts of 'indexed', 'unchanged' and 'removed' files
+        """
+        summary = {'indexed': 0, 'unchanged': 0, 'removed': 0}
+        paths = [os.path.abspath(path) for path in self.srt_files()]
+
+        for path in paths:
+            try:
+                if self.index_file(path):
+                    summary['indexed'] += 1
+                    if progress_callback:
+                        progress_callback(f"🔎 Indexed {os.path.basename(path)}")
+                else:
+                    summary['unchanged'] += 1
+            except (OSError, UnicodeDecodeError) as e:
+                print(f"Could not index {path}: {e}")
+
+        with self._lock:
+            known = [row[0] for row in self._conn.execute("SELECT path FROM files")]
+            removed = set(known) - set(paths)
+            if removed:
+                with self._conn:
+                    for path in removed:
+                        self._conn.execute("DELETE FROM cues WHERE path = ?", (path,))
+                        self._conn.execute("DELETE FROM files WHERE path = ?", (path,))
+                summary['removed'] = len(removed)
+        return summary
+
+    def search(self, query: str, limit: int = 50) -> List[SearchHit]:
+        """
+        Find cues containing all words of a query (prefix match, accent-insensitive).
+
+        Args:
+            query: Words to search for
+            limit: Maximum number of hits
+
+        Returns:
+            Matching cues, best matches first
+        """
+        match_query = build_match_query(query)
+        if not match_query:
+            return []
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path, cue, start, text, snippet(cues, 0, '[', ']', '…', 12) "
+                "FROM cues WHERE cues MATCH ? ORDER BY rank LIMIT ?",
+                (match_query, limit)
+            ).fetchall()
+        return [SearchHit(path, int(cue), float(start), text, snippet)
+                for path, cue, start, text, snippet in rows]
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def index_transcript(srt_path: str):
+    """Add a newly written SRT to the default search index (errors are only logged)."""
+    try:
+        index = TranscriptSearchIndex()
+        try:
+            index.index_file(srt_path)
+        finally:
+            index.close()
+    except (OSError, sqlite3.Error, UnicodeDecodeError) as e:
+        print(f"Could not add {srt_path} to the search index: {e}")
@@ -0,0 +1,213 @@
+"""
+Persistent translation cache backed by SQLite.
+Stores GPT lemma and translation results across sessions, keyed by word,
+language pair and a normalized context hash, with LRU eviction and a TTL.
+"""
+
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Dict, Optional
+
+from ..config import TRANSLATION_CACHE_FILE, TRANSLATION_CACHE_MAX_ENTRIES, TRANSLATION_CACHE_TTL_DAYS
+
+# Evict in batches so the size check does not run on every insert
+_EVICTION_SLACK = 0.05
+
+
+def normalize_context(context: str) -> str:
+    """Normalize context text so trivial differences map to the same hash."""
+    context = re.sub(r'[^\w\s]', ' ', context.casefold())
+    return ' '.join(context.split())
+
+
+def context_hash(context: str) -> str:
+    """Hash a context sentence; empty context yields an empty key part."""
+    normalized = normalize_context(context or "")
+    if not normalized:
+        return ""
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()[:16]
+
+
+class TranslationCache:
+    """SQLite key-value cache for lemma and translation results."""
+
+    def __init__(self, db_path: str = None,
+                 max_entries: int = TRANSLATION_CACHE_MAX_ENTRIES,
+                 ttl_days: float = TRANSLATION_CACHE_TTL_DAYS):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            db_path: SQLite file path (default: TRANSLATION_CACHE_FILE)
+            max_entries: Entry count above which least recently used rows are evicted
+            ttl_days: Age after which entries are considered stale
+        """
+        self.db_path = db_path or TRANSLATION_CACHE_FILE
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_days * 24 * 3600
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                value TEXT NOT NULL,
+                created REAL NOT NULL,
+                accessed REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries(accessed)")
+        self._purge_expired()
+        self._entry_count = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    @staticmethod
+    def make_key(kind: str, word: str, language_from: str, language_to: str = "", context: str = "") -> str:
+        """Build the cache key for a lookup."""
+        return "|".join([kind, word.strip().casefold(), language_from, language_to, context_hash(context)])
+
+    def get(self, kind: str, word: str, language_from: str, language_to: str = "",
+            context: str = "", fallback: bool = False) -> Optional[Dict]:
+        """
+        Look up a cached result.
+
+        Args:
+            kind: Result type (e.g., 'lemma', 'trans')
+            word: Looked-up word
+            language_from: Source language code
+            language_to: Target language code (empty for language-independent results)
+            context: Surrounding sentence the lookup was made in
+            fallback: Whether to use the context-free result if there is none for the context
+
+        Returns:
+            Cached dictionary, or None on a miss or expired entry (counted as one lookup)
+        """
+        keys = [self.make_key(kind, word, language_from, language_to, context)]
+        if fallback and context_hash(context):
+            keys.append(self.make_key(kind, word, language_from, language_to))
+        now = time.time()
+        with self._lock:
+            for key in keys:
+                value = self._lookup(key, now)
+                if value is not None:
+                    self.hits += 1
+                    return json.loads(value)
+            self.misses += 1
+        return None
+
+    def _lookup(self, key: str, now: float) -> Optional[str]:
+        """Get the stored value of a key and mark it as used; expired rows are deleted (lock held)."""
+        row = self._conn.execute("SELECT value, created FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+
+        value, created = row
+        if now - created > self.ttl_seconds:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._entry_count -= 1
+            return None
+
+        self._conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+        return value
+
+    def peek(self, kind: str, word: str, language_from: str, language_to: str = "",
+             context: str = "") -> Optional[Dict]:
+        """
+        Read a cached result without counting a hit or miss or refreshing its LRU position.
+
+        For bulk scans (pre-translation, lemma grouping) that should not skew
+        the lookup statistics; arguments as for get.
+
+        Returns:
+            Cached dictionary, or None if absent or expired
+        """
+        key = self.make_key(kind, word, language_from, language_to, context)
+        with self._lock:
+            row = self._conn.execute("SELECT value, created FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None or time.time() - row[1] > self.ttl_seconds:
+            return None
+        return json.loads(row[0])
+
+    def set(self, kind: str, word: str, language_from: str, language_to: str, context: str, value: Dict):
+        """Store a result, evicting least recently used entries when over capacity."""
+        key = self.make_key(kind, word, language_from, language_to, context)
+        now = time.time()
+        payload = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, kind, value, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, kind, payload, now, now)
+            )
+            if cursor.rowcount:
+                self._entry_count += 1
+            if self._entry_count > self.max_entries * (1 + _EVICTION_SLACK):
+                self._evict()
+
+    def _evict(self):
+        """Drop least recently used entries down to max_entries (lock held)."""
+        # Replacements inflate the running count, so recount before deleting
+        count = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        if count > self.max_entries:
+            self._conn.execute(
+                "DELETE FROM entries WHERE key IN (SELECT key FROM entries ORDER BY accessed LIMIT ?)",
+                (count - self.max_entries,)
+            )
+            count = self.max_entries
+        self._entry_count = count
+
+    def _purge_expired(self):
+        """Delete entries older than the TTL."""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE created < ?", (time.time() - self.ttl_seconds,))
+
+    def stats(self) -> Dict:
+        """Get hit/miss counters and the current entry count."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': self._entry_count
+        }
+
+    def clear(self):
+        """Remove all cached entries."""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._entry_count = 0
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(db_path: str = None) -> TranslationCache:
+    """
+    Get the shared cache for a database file.
+
+    Args:
+        db_path: SQLite file path (default: TRANSLATION_CACHE_FILE)
+
+    Returns:
+        TranslationCache reused by every caller with the same file
+    """
+    db_path = os.path.abspath(db_path or TRANSLATION_CACHE_FILE)
+    with _caches_lock:
+        if db_path not in _caches:
+            _caches[db_path] = TranslationCache(db_path)
+        return _caches[db_path]
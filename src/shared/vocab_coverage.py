@@ -0,0 +1,255 @@
+"""
+Vocabulary coverage of generated stories.
+
+The story is tokenized once; every token gets a few normalized keys (exact
+form, singular, cached lemma, light stem, function-word class). Vocabulary
+entries, including multi-word expressions like "dédier à" or "se fâcher",
+are compiled into a trie over the same keys and matched in one pass, so
+conjugated and inflected forms count and "mal" no longer matches "normal".
+Matches are returned as character spans for highlighting.
+"""
+
+import unicodedata
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .frequency_analysis import ELISIONS, WORD_PATTERN
+
+# Story tokens that may be skipped between two words of an expression
+# ("il s'est vite fâché", "dédia sa vie à")
+MAX_GAP = 2
+
+# Text between two tokens that ends a clause; expressions do not span it
+_CLAUSE_BREAKS = set('.!?…;:')
+
+# Function words that vary with person, gender or number and are interchangeable
+# inside an expression ("se fâcher" -> "je me fâche", "faire de son mieux" -> "de leur mieux")
+_WORD_CLASSES = {
+    'DET': ('le', 'la', 'les', 'un', 'une', 'des', 'du', 'de', 'au', 'aux'),
+    'REFL': ('me', 'te', 'se', 'nous', 'vous'),
+    'POSS': ('mon', 'ton', 'son', 'ma', 'ta', 'sa', 'mes', 'tes', 'ses',
+             'notre', 'votre', 'leur', 'nos', 'vos', 'leurs'),
+}
+_CLASS_OF = {word: name for name, words in _WORD_CLASSES.items() for word in words}
+_LEADING_ARTICLES = {'le', 'la', 'les', 'un', 'une', 'des'}
+
+# Inflectional endings (verbs, adjectives, nouns), longest first
+_SUFFIXES = sorted((
+    'issaient', 'issions', 'issiez', 'issent', 'issait', 'issais', 'issant',
+    'eraient', 'erions', 'eriez', 'erons', 'eront', 'erait', 'erais', 'erez', 'erai', 'era', 'eras',
+    'irent', 'irait', 'iront', 'irons', 'irez', 'ira',
+    'aient', 'asses', 'assent', 'èrent', 'âmes', 'âtes', 'ions', 'iez', 'ons', 'ent', 'ait', 'ais',
+    'ant', 'ées', 'ée', 'és', 'er', 'ez', 'es', 'ir', 'ie', 'ies', 'is', 'it', 'ît', 're',
+    'ues', 'ue', 'us', 'e', 's', 'x', 'a', 'é', 'i', 'u',
+), key=len, reverse=True)
+_MIN_STEM_WORD = 5  # Shorter words only match exactly ("mal", "tant", "sale")
+_MIN_STEM = 3
+
+# Forms of frequent irregular verbs that stemming cannot relate to the infinitive;
+# these verbs carry many expressions ("faire de son mieux", "se tenir", "mettre fin")
+_IRREGULAR_VERBS = {
+    'être': "suis es est sommes êtes sont étais était étions étiez étaient serai seras sera serons serez "
+            "seront serais serait serions seriez seraient sois soit soyons soyez soient fus fut fûmes "
+            "furent été étant",
+    'avoir': "ai as a avons avez ont avais avait avions aviez avaient aurai auras aura aurons aurez auront "
+             "aurais aurait aurions auriez auraient aie aies ait ayons ayez aient eus eut eûmes eurent eu "
+             "eue eues ayant",
+    'faire': "fais fait faisons faites font faisais faisait faisions faisiez faisaient ferai feras fera "
+             "ferons ferez feront ferais ferait ferions feriez feraient fasse fasses fassions fassiez "
+             "fassent fis fit fîmes firent faite faits faisant",
+    'aller': "vais vas va allons allez vont irai iras ira irons irez iront irais irait irions iriez "
+             "iraient aille ailles aillent",
+    'mettre': "mets met mis mit mîmes mirent mise mises",
+    'prendre': "prends prend prenons prenez prennent prenais prenait prenions preniez prenaient prenne "
+               "prennes pris prit prîmes prirent prise prises prenant",
+    'tenir': "tiens tient tenons tenez tiennent tiendrai tiendras tiendra tiendrons tiendrez tiendront "
+             "tiendrais tiendrait tienne tiennes tins tint tinrent tenu tenue tenus tenues",
+    'venir': "viens vient venons venez viennent viendrai viendras viendra viendrons viendrez viendront "
+             "viendrais viendrait vienne viennes vins vint vinrent venu venue venus venues",
+    'dire': "dis dit disons dites disent disais disait disions disiez disaient dirai diras dira dirons "
+            "direz diront dirais dirait dise dises dirent dite dits disant",
+    'voir': "vois voit voyons voyez voient voyais voyait voyions voyiez voyaient verrai verras verra "
+            "verrons verrez verront verrais verrait vit virent vu vue vus vues voyant",
+    'pouvoir': "peux peut pouvons pouvez peuvent pouvais pouvait pourrai pourra pourrons pourrez pourront "
+               "pourrais pourrait puisse puissent put purent pu",
+    'vouloir': "veux veut voulons voulez veulent voulais voulait voudrai voudra voudrons voudrez voudront "
+               "voudrais voudrait veuille veuillent voulut voulu",
+    'devoir': "dois doit devons devez doivent devais devait devrai devra devrons devrez devront devrais "
+              "devrait doive doives dut durent dû",
+    'savoir': "sais sait savons savez savent savais savait saurai saura saurons saurez sauront saurais "
+              "saurait sache saches sachions sachiez sachent sut surent su sachant",
+}
+_IRREGULAR_FORMS = {form: verb for verb, forms in _IRREGULAR_VERBS.items() for form in forms.split()}
+
+
+def normalize_word(word: str) -> str:
+    """Casefold a word and unify spelling variants (œ, composed accents)."""
+    word = unicodedata.normalize('NFC', word.casefold())
+    return word.replace('œ', 'oe').replace('æ', 'ae')
+
+
+@lru_cache(maxsize=65536)
+def stem(word: str) -> Optional[str]:
+    """
+    Strip one inflectional ending from a normalized word.
+
+    Returns:
+        The stem, or None if the word is too short to stem safely
+    """
+    if len(word) < _MIN_STEM_WORD:
+        return None
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= _MIN_STEM:
+            return word[:-len(suffix)]
+    return word
+
+
+def _singular(word: str) -> str:
+    """Drop a plural -s/-x."""
+    if len(word) > 3 and word[-1] in 'sx':
+        return word[:-1]
+    return word
+
+
+def _tokenize(text: str) -> List[Tuple[str, int, int, int]]:
+    """
+    Split text into normalized words.
+
+    Returns:
+        List of (word, start, end, clause number); elided forms are expanded
+    """
+    tokens = []
+    clause = 0
+    previous_end = 0
+    for match in WORD_PATTERN.finditer(text):
+        if _CLAUSE_BREAKS.intersection(text[previous_end:match.start()]):
+            clause += 1
+        previous_end = match.end()
+        word = normalize_word(match.group())
+        if text[match.end():match.end() + 1] in ("'", "’"):
+            word = ELISIONS.get(word, word)
+        tokens.append((word, match.start(), match.end(), clause))
+    return tokens
+
+
+def _pattern_key(word: str) -> str:
+    """Key a vocabulary word is matched by: its class, its stem, or the exact form."""
+    if word in _CLASS_OF:
+        return _CLASS_OF[word]
+    word = _IRREGULAR_FORMS.get(word, word)  # Entries like "se tiendra"
+    word_stem = stem(word)
+    return f"~{word_stem}" if word_stem else f"={word}"
+
+
+def _token_keys(word: str, lemmatize: Optional[Callable[[str], str]]) -> set:
+    """All keys a story token can match."""
+    keys = {f"={word}", f"={_singular(word)}"}
+    if word in _CLASS_OF:
+        keys.add(_CLASS_OF[word])
+    forms = {word}
+    lemma = _IRREGULAR_FORMS.get(word) or (normalize_word(lemmatize(word)) if lemmatize else None)
+    if lemma:
+        keys.add(f"={lemma}")
+        forms.add(lemma)
+    for form in forms:
+        form_stem = stem(form)
+        if form_stem:
+            keys.add(f"~{form_stem}")
+    if len(word) == _MIN_STEM_WORD - 1:
+        keys.add(f"~{word}")  # Bare stem forms of longer words ("rend" of "rendre")
+    return keys
+
+
+class VocabularyMatcher:
+    """Trie of vocabulary entries over normalized token keys."""
+
+    def __init__(self, words: Sequence[str], lemmatize: Optional[Callable[[str], str]] = None):
+        """
+        Args:
+            words: Vocabulary entries (single words or expressions), in result order
+            lemmatize: Optional word -> lemma function (e.g., CachedLemmatizer.lemmatize)
+        """
+        self.words = list(words)
+        self.lemmatize = lemmatize
+        self._root = {}  # key -> child node; '$' -> indices of entries ending here
+        for index, entry in enumerate(self.words):
+            pattern = [word for word, _, _, _ in _tokenize(entry)]
+            if len(pattern) > 1 and pattern[0] in _LEADING_ARTICLES:
+                pattern = pattern[1:]  # "la foule" is also covered by "sa foule"
+            if not pattern:
+                continue
+            node = self._root
+            for word in pattern:
+                node = node.setdefault(_pattern_key(word), {})
+            node.setdefault('$', []).append(index)
+
+    def find_spans(self, text: str) -> List[List[Tuple[int, int]]]:
+        """
+        Find every occurrence of every entry.
+
+        Args:
+            text: Text to search
+
+        Returns:
+            For each entry, the sorted (start, end) character spans of its matched
+            words (skipped words in between are not included)
+        """
+        tokens = _tokenize(text)
+        lemma_keys = {}
+        keys = []
+        for word, _, _, _ in tokens:
+            if word not in lemma_keys:
+                lemma_keys[word] = _token_keys(word, self.lemmatize)
+            keys.append(lemma_keys[word])
+
+        spans = [set() for _ in self.words]
+
+        def walk(node: Dict, position: int, clause: int, matched: Tuple[int, ...]):
+            for index in node.get('$', ()):
+                spans[index].update((tokens[i][1], tokens[i][2]) for i in matched)
+            last = min(len(tokens), position + MAX_GAP + 1)
+            for next_position in range(position, last):
+                if tokens[next_position][3] != clause:
+                    break
+                for key in keys[next_position]:
+                    child = node.get(key)
+                    if child is not None:
+                        walk(child, next_position + 1, clause, matched + (next_position,))
+
+        for start in range(len(tokens)):
+            for key in keys[start]:
+                child = self._root.get(key)
+                if child is not None:
+                    walk(child, start + 1, tokens[start][3], (start,))
+
+        return [sorted(entry_spans) for entry_spans in spans]
+
+
+def check_coverage(story: str, vocab_list: Sequence[Tuple[str, str, str]],
+                   lemmatize: Optional[Callable[[str], str]] = None) -> Dict:
+    """
+    Check which vocabulary words a story uses.
+
+    Args:
+        story: Generated story
+        vocab_list: List of (word, translation, pronunciation) tuples
+        lemmatize: Optional word -> lemma function for irregular forms
+
+    Returns:
+        Dictionary with found_words, missing_words, coverage_percentage and
+        spans (word -> list of (start, end) character spans in the story)
+    """
+    matcher = VocabularyMatcher([entry[0] for entry in vocab_list], lemmatize)
+    found_words, missing_words, spans = [], [], {}
+    for entry, entry_spans in zip(vocab_list, matcher.find_spans(story)):
+        if entry_spans:
+            found_words.append(entry)
+            spans[entry[0]] = entry_spans
+        else:
+            missing_words.append(entry)
+    return {
+        'found_words': found_words,
+        'missing_words': missing_words,
+        'coverage_percentage': (len(found_words) / len(vocab_list)) * 100 if vocab_list else 0,
+        'spans': spans
+    }
@@ -4,9 +4,9 @@ Vocabulary panel widget for displaying word translations and frequency analysis.
 
 import tkinter as tk
 from tkinter import ttk, Frame, Label, Button
-import threading
 from typing import Optional
 from .gpt_translator import GPTTranslator, WordAnalysis
+from .lookup_scheduler import LookupScheduler
 from .styles import Colors
 
 
@@ -36,6 +36,11 @@ class VocabularyPanel:
         # Current translation state
         self.current_analysis = None
         self.is_loading = False
+        self.loading_animation_id = None
+        self.lookup_word = None
+        
+        # Rapid double-clicks: only the newest lookup is shown, duplicates share one call
+        self.lookup_scheduler = LookupScheduler(self._analyze_word)
         
         self.setup_ui()
     
@@ -97,11 +102,13 @@ class VocabularyPanel:
                                   bg='#ffffff', fg='#007bff')
         self.loading_label.pack()
         
-        # Start loading animation
-        self.animate_loading()
+        # Start loading animation (a single loop, even across repeated lookups)
+        if self.loading_animation_id is None:
+            self.animate_loading()
     
     def animate_loading(self):
         """Animate the loading indicator."""
+        self.loading_animation_id = None
         if self.is_loading and hasattr(self, 'loading_label'):
             current_text = self.loading_label.cget('text')
             if current_text == '⟳':
@@ -110,7 +117,7 @@ class VocabularyPanel:
                 self.loading_label.config(text='⟳')
             
             # Schedule next animation frame
-            self.parent.after(500, self.animate_loading)
+            self.loading_animation_id = self.parent.after(500, self.animate_loading)
     
     def show_error_state(self, error_message: str):
         """Show error state."""
@@ -251,6 +258,7 @@ class VocabularyPanel:
     def clear_translation(self):
         """Clear the current translation and show empty state."""
         self.current_analysis = None
+        self.lookup_scheduler.cancel_all()
         self.show_empty_state()
     
     def translate_word(self, word: str, context: str = ""):
@@ -271,27 +279,31 @@ class VocabularyPanel:
         word = word.strip()
         
         # Show loading state
+        self.lookup_word = word
         self.show_loading_state(word)
         
-        # Start translation in background thread
-        thread = threading.Thread(target=self._translate_worker, args=(word, context))
-        thread.daemon = True
-        thread.start()
+        # Supersedes any earlier lookup; the same word in flight is not requested twice
+        key = (word.casefold(), context, self.language_from, self.language_to)
+        self.lookup_scheduler.submit(key, self._on_lookup_done, word, context,
+                                     self.language_from, self.language_to)
     
-    def _translate_worker(self, word: str, context: str):
-        """Background worker for translation."""
-        try:
-            # Perform translation
-            analysis = self.translator.analyze_word_comprehensive(
-                word, self.language_from, self.language_to, context
-            )
-            
-            # Update UI on main thread
-            self.parent.after(0, lambda: self.show_translation(analysis))
-            
-        except Exception as e:
-            error_msg = f"Failed to translate '{word}': {str(e)}"
-            self.parent.after(0, lambda: self.show_error_state(error_msg))
+    def _analyze_word(self, word: str, context: str, language_from: str, language_to: str) -> WordAnalysis:
+        """Lookup run by the scheduler in a background thread."""
+        return self.translator.analyze_word_comprehensive(word, language_from, language_to, context)
+    
+    def _on_lookup_done(self, generation: int, analysis: Optional[WordAnalysis], error: Optional[Exception]):
+        """Scheduler callback (background thread): hand the result to the main thread."""
+        self.parent.after(0, lambda: self._show_lookup_result(generation, analysis, error))
+    
+    def _show_lookup_result(self, generation: int, analysis: Optional[WordAnalysis], error: Optional[Exception]):
+        """Render a lookup result unless a newer lookup was requested meanwhile."""
+        if not self.lookup_scheduler.is_current(generation):
+            return
+        
+        if error is not None:
+            self.show_error_state(f"Failed to translate '{self.lookup_word}': {error}")
+        else:
+            self.show_translation(analysis)
     
     def set_languages(self, language_from: str, language_to: str):
         """Update the languages used for translation."""
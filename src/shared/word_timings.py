@@ -0,0 +1,134 @@
+"""
+Word-level timing table for transcriptions.
+
+Stores Whisper word timestamps as a compact binary sidecar next to the SRT
+file: parallel arrays of start/end times plus the segment index, character
+offset and length of each word in its displayed segment line.
+"""
+
+import os
+import sys
+import struct
+from array import array
+from bisect import bisect_right
+from typing import List, Optional, Tuple
+
+SIDECAR_EXTENSION = '.words'
+_MAGIC = b'ILWT'
+_VERSION = 1
+_HEADER = struct.Struct('<4sII')  # magic, version, word count
+
+
+def sidecar_path(srt_path: str) -> str:
+    """Get the word timing sidecar path belonging to an SRT file."""
+    return os.path.splitext(srt_path)[0] + SIDECAR_EXTENSION
+
+
+def write_sidecar(segments: List[dict], srt_path: str) -> int:
+    """
+    Write the word timings of a transcription next to its SRT file.
+
+    A sidecar left by an earlier transcription is removed when there are no
+    word timings, since it would not match the new SRT.
+
+    Args:
+        segments: Whisper result segments, each with a "words" list
+        srt_path: Path of the SRT file written from the segments
+
+    Returns:
+        Number of words saved
+    """
+    word_timings = WordTimings.from_whisper_segments(segments)
+    path = sidecar_path(srt_path)
+    if len(word_timings):
+        word_timings.save(path)
+    elif os.path.exists(path):
+        os.remove(path)
+    return len(word_timings)
+
+
+class WordTimings:
+    """Sorted word timing table with O(log n) lookup by playback time."""
+
+    def __init__(self, starts: array = None, ends: array = None, segments: array = None,
+                 offsets: array = None, lengths: array = None):
+        self.starts = starts if starts is not None else array('d')
+        self.ends = ends if ends is not None else array('d')
+        self.segments = segments if segments is not None else array('I')
+        self.offsets = offsets if offsets is not None else array('I')
+        self.lengths = lengths if lengths is not None else array('I')
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @classmethod
+    def from_whisper_segments(cls, segments: List[dict]) -> 'WordTimings':
+        """
+        Build the table from Whisper segments transcribed with word_timestamps=True.
+
+        Args:
+            segments: Whisper result segments, each with a "words" list
+
+        Returns:
+            WordTimings with offsets relative to each segment's display text
+        """
+        timings = cls()
+        for seg_idx, seg in enumerate(segments):
+            # Same normalisation as the SRT text shown by TranscriptionTextDisplay
+            text = seg["text"].strip().replace('\n', ' ')
+            cursor = 0
+            for word in seg.get("words") or []:
+                token = word["word"].strip()
+                if not token:
+                    continue
+                offset = text.find(token, cursor)
+                if offset < 0:
+                    continue
+                cursor = offset + len(token)
+                timings.starts.append(float(word["start"]))
+                timings.ends.append(float(word["end"]))
+                timings.segments.append(seg_idx)
+                timings.offsets.append(offset)
+                timings.lengths.append(len(token))
+        return timings
+
+    def word_at(self, current_time: float) -> int:
+        """Return the index of the word spoken at the given time, or -1."""
+        idx = bisect_right(self.starts, current_time) - 1
+        if idx >= 0 and current_time <= self.ends[idx]:
+            return idx
+        return -1
+
+    def word_location(self, idx: int) -> Tuple[int, int, int]:
+        """Return (segment index, character offset, length) of a word."""
+        return self.segments[idx], self.offsets[idx], self.lengths[idx]
+
+    def save(self, path: str):
+        """Write the table as a binary sidecar file."""
+        columns = [self.starts, self.ends, self.segments, self.offsets, self.lengths]
+        with open(path, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, len(self)))
+            for column in columns:
+                if sys.byteorder == 'big':
+                    column = array(column.typecode, column)
+                    column.byteswap()
+                column.tofile(f)
+
+    @classmethod
+    def load(cls, path: str) -> Optional['WordTimings']:
+        """Read a sidecar file; returns None if it is missing or unreadable."""
+        try:
+            with open(path, 'rb') as f:
+                magic, version, count = _HEADER.unpack(f.read(_HEADER.size))
+                if magic != _MAGIC or version != _VERSION:
+                    return None
+                columns = []
+                for typecode in ('d', 'd', 'I', 'I', 'I'):
+                    column = array(typecode)
+                    column.fromfile(f, count)
+                    if sys.byteorder == 'big':
+                        column.byteswap()
+                    columns.append(column)
+        except (OSError, EOFError, ValueError, struct.error):
+            return None
+        return cls(*columns)
@@ -0,0 +1,198 @@
+"""
+Transcriber model calibration
+
+Measures the real-time factor (processing seconds per audio second) of each
+installed Whisper model on this machine and keeps a history of real runs.
+Estimates prefer real runs, then the one-off benchmark, then the static
+time factors from the configuration.
+"""
+
+import os
+import json
+import time
+import datetime
+import statistics
+import threading
+from typing import Dict, List
+
+from ..config import (
+    TRANSCRIBER_MODELS,
+    TRANSCRIBER_CALIBRATION_FILE,
+    TRANSCRIBER_CALIBRATION_SECONDS,
+    TRANSCRIBER_RUN_HISTORY_SIZE,
+)
+
+# Number of most recent real runs used for the estimate
+RECENT_RUNS_FOR_ESTIMATE = 10
+
+
+def installed_models() -> List[str]:
+    """Return the configured Whisper models whose weights are already downloaded."""
+    try:
+        import whisper
+    except ImportError:
+        return []
+
+    default_cache = os.path.join(os.path.expanduser("~"), ".cache")
+    download_root = os.path.join(os.getenv("XDG_CACHE_HOME", default_cache), "whisper")
+
+    installed = []
+    for model_name in TRANSCRIBER_MODELS:
+        url = getattr(whisper, '_MODELS', {}).get(model_name)
+        if url and os.path.exists(os.path.join(download_root, os.path.basename(url))):
+            installed.append(model_name)
+    return installed
+
+
+class ModelCalibration:
+    """Persistent real-time factor measurements for the Whisper models."""
+
+    def __init__(self, calibration_file: str = None):
+        self.calibration_file = calibration_file or TRANSCRIBER_CALIBRATION_FILE
+        self._lock = threading.Lock()
+        self.data = self._load()
+
+    def _load(self) -> Dict:
+        """Load calibration data, falling back to an empty record."""
+        try:
+            with open(self.calibration_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            data = {}
+        data.setdefault('calibration', {})
+        data.setdefault('runs', {})
+        return data
+
+    def _save(self):
+        """Write calibration data atomically."""
+        os.makedirs(os.path.dirname(self.calibration_file), exist_ok=True)
+        tmp_path = self.calibration_file + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, indent=2)
+        os.replace(tmp_path, self.calibration_file)
+
+    def record_run(self, model_name: str, audio_seconds: float, elapsed_seconds: float):
+        """Add a real transcription run to the history of a model."""
+        if audio_seconds <= 0 or elapsed_seconds <= 0:
+            return
+
+        with self._lock:
+            runs = self.data['runs'].setdefault(model_name, [])
+            runs.append({
+                'audio_seconds': round(audio_seconds, 2),
+                'elapsed_seconds': round(elapsed_seconds, 2),
+                'date': datetime.datetime.now().isoformat()
+            })
+            del runs[:-TRANSCRIBER_RUN_HISTORY_SIZE]
+            self._save()
+
+    def real_time_factor(self, model_name: str) -> float:
+        """
+        Get the best known real-time factor for a model.
+
+        Args:
+            model_name: Whisper model size (e.g., 'tiny', 'base')
+
+        Returns:
+            Processing seconds per second of audio
+        """
+        runs = self.data['runs'].get(model_name, [])[-RECENT_RUNS_FOR_ESTIMATE:]
+        if runs:
+            return statistics.median(run['elapsed_seconds'] / run['audio_seconds'] for run in runs)
+
+        calibration = self.data['calibration'].get(model_name)
+        if calibration:
+            return calibration['rtf']
+
+        return TRANSCRIBER_MODELS.get(model_name, {}).get('time_factor', 1.0)
+
+    def is_measured(self, model_name: str) -> bool:
+        """Check whether the estimate for a model comes from this machine."""
+        return bool(self.data['runs'].get(model_name) or self.data['calibration'].get(model_name))
+
+    def estimate_seconds(self, model_name: str, audio_seconds: float) -> float:
+        """Estimate how long transcribing audio of the given length will take."""
+        return audio_seconds * self.real_time_factor(model_name)
+
+    def choose_model(self, audio_seconds: float, time_budget_seconds: float,
+                     candidates: List[str] = None) -> str:
+        """
+        Pick the most accurate model expected to finish within the time budget.
+
+        Args:
+            audio_seconds: Duration of the audio to transcribe
+            time_budget_seconds: Maximum acceptable processing time
+            candidates: Models to consider (default: installed models, else all)
+
+        Returns:
+            Model name; the fastest candidate if none fits the budget
+        """
+        if candidates is None:
+            candidates = installed_models() or list(TRANSCRIBER_MODELS)
+
+        # TRANSCRIBER_MODELS is ordered from fastest to most accurate
+        ordered = [name for name in TRANSCRIBER_MODELS if name in candidates]
+        if not ordered:
+            raise ValueError("No transcription models available to choose from")
+
+        fitting = [name for name in ordered
+                   if self.estimate_seconds(name, audio_seconds) <= time_budget_seconds]
+        if fitting:
+            return fitting[-1]
+        return min(ordered, key=lambda name: self.estimate_seconds(name, audio_seconds))
+
+    def uncalibrated_models(self, model_names: List[str] = None) -> List[str]:
+        """Return models without a benchmark or any recorded run."""
+        if model_names is None:
+            model_names = installed_models()
+        return [name for name in model_names if not self.is_measured(name)]
+
+    def calibrate(self, audio_path: str, model_names: List[str] = None,
+                  progress_callback=None) -> Dict[str, float]:
+        """
+        Benchmark models on a short clip of real audio and cache the results.
+
+        Args:
+            audio_path: Audio file to take the benchmark clip from
+            model_names: Models to benchmark (default: uncalibrated installed models)
+            progress_callback: Optional callback receiving status messages
+
+        Returns:
+            Dictionary of model name to measured real-time factor
+        """
+        import whisper
+
+        if model_names is None:
+            model_names = self.uncalibrated_models()
+        if not model_names:
+            return {}
+
+        audio = whisper.load_audio(audio_path)
+        clip = audio[:TRANSCRIBER_CALIBRATION_SECONDS * whisper.audio.SAMPLE_RATE]
+        clip_seconds = len(clip) / whisper.audio.SAMPLE_RATE
+        if clip_seconds <= 0:
+            raise ValueError("Calibration audio is empty")
+
+        results = {}
+        for model_name in model_names:
+            if progress_callback:
+                progress_callback(f"Calibrating {model_name} model...")
+
+            model = whisper.load_model(model_name)
+            start = time.perf_counter()
+            model.transcribe(clip, verbose=None)
+            elapsed = time.perf_counter() - start
+            del model
+
+            rtf = elapsed / clip_seconds
+            results[model_name] = rtf
+            with self._lock:
+                self.data['calibration'][model_name] = {
+                    'rtf': round(rtf, 4),
+                    'sample_seconds': round(clip_seconds, 2),
+                    'date': datetime.datetime.now().isoformat()
+                }
+                self._save()
+            print(f"Calibrated {model_name}: {rtf:.2f}x real time")
+
+        return results
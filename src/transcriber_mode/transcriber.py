@@ -3,11 +3,16 @@ import sys
 import whisper
 import re
 import io
+import time
+from .calibration import ModelCalibration
+from src.shared.word_timings import write_sidecar
+from src.shared.transcript_search import index_transcript
 
 
 class Transcriber:
-    def __init__(self, model_size="small"):
+    def __init__(self, model_size="small", calibration=None):
         self.model_size = model_size
+        self.calibration = calibration or ModelCalibration()
         
         try:
             self.whisper = whisper
@@ -21,12 +26,13 @@ class Transcriber:
     def transcribe_and_write_srt(self, audio_path, srt_path, language="fr", progress_callback=None):
         """Transcribe audio and write SRT file with proper timestamps"""
         try:
-            # Get audio duration first for progress calculation
+            # Decode once: the duration drives progress and the run history,
+            # and the decoded samples are passed straight to the model
+            audio = whisper.load_audio(audio_path)
+            duration = len(audio) / whisper.audio.SAMPLE_RATE
+            start_time = time.perf_counter()
+            
             if progress_callback:
-                # Load audio to get duration
-                audio = whisper.load_audio(audio_path)
-                duration = len(audio) / whisper.audio.SAMPLE_RATE
-                
                 old_stdout = sys.stdout
                 captured = io.StringIO()
                 
@@ -58,10 +64,15 @@ class Transcriber:
                         old_stdout.flush()
                 
                 sys.stdout = ProgressCapture(duration, progress_callback)
-                result = self.model.transcribe(audio_path, language=language, verbose=True)
-                sys.stdout = old_stdout
+                try:
+                    result = self.model.transcribe(audio, language=language, verbose=True, word_timestamps=True)
+                finally:
+                    sys.stdout = old_stdout
             else:
-                result = self.model.transcribe(audio_path, language=language, verbose=True)
+                result = self.model.transcribe(audio, language=language, verbose=True, word_timestamps=True)
+            
+            # Feed the measured speed back into the time estimates
+            self.calibration.record_run(self.model_size, duration, time.perf_counter() - start_time)
             
             segments = result["segments"]
             total = len(segments)
@@ -77,6 +88,14 @@ class Transcriber:
                     f.write(f"{self.format_srt_time(start)} --> {self.format_srt_time(end)}\n")
                     f.write(f"{text}\n\n")
             print(f"\nSRT file saved: {srt_path}")
+            
+            # Word timestamps go into a compact sidecar for per-word highlighting
+            word_count = write_sidecar(segments, srt_path)
+            if word_count:
+                print(f"Word timings saved: {word_count} words")
+            
+            # Make the new transcript searchable right away
+            index_transcript(srt_path)
             return True
         except (ImportError, AttributeError):
             print("Cannot write SRT. audio_path: {audio_path}, srt_path: {srt_path}, language: {language}")
@@ -1,11 +1,14 @@
-from tkinter import Tk, Frame, Label, Button, filedialog, messagebox, ttk, Text, Scrollbar, Canvas, Radiobutton, StringVar
+from tkinter import Tk, Frame, Label, Button, Entry, filedialog, messagebox, ttk, Text, Scrollbar, Canvas, Radiobutton, StringVar
 import os
 import threading
 from .transcriber import Transcriber
+from .calibration import ModelCalibration
 import re
 import shutil
 from src.shared.reader_ui import ReaderUI
+from src.shared.transcript_search import TranscriptSearchIndex
 from src.shared.styles import center_top_window, Colors
+from src.config import DEFAULT_TRANSCRIBER_TIME_BUDGET_MINUTES
 
 class WhisperInterface:
     def __init__(self, master, back_callback=None):
@@ -21,6 +24,15 @@ class WhisperInterface:
         self.ui_state = "INITIAL"  # INITIAL, FILE_SELECTED, TRANSCRIBING, COMPLETED
         self.selected_model = StringVar(value="base")
         self.selected_language = StringVar(value="fr")  # Add language selection, default French
+        self.time_budget_minutes = StringVar(value=str(DEFAULT_TRANSCRIBER_TIME_BUDGET_MINUTES))
+        self.calibration = ModelCalibration()
+        self.calibrating = False
+        self.search_query = StringVar()
+        self.search_after_id = None
+        self.search_index = TranscriptSearchIndex()
+        
+        # Catch up on SRTs added or edited outside the app
+        threading.Thread(target=self.search_index.update, daemon=True).start()
         
         # UI components references
         self.browse_button = None
@@ -129,6 +141,9 @@ class WhisperInterface:
             # Initialize transcriber with selected model
             model_size = self.selected_model.get()
             language_code = self.selected_language.get()  # Get selected language
+            if model_size == "auto":
+                model_size = self.resolve_auto_model()
+                self.master.after(0, lambda m=model_size: self.update_progress_status(f"Auto-selected {m} model"))
             self.master.after(0, lambda: self.update_progress_status(f"Loading {model_size} model ..."))
             
             # Create new transcriber instance for this transcription
@@ -137,7 +152,7 @@ class WhisperInterface:
             # Show more detailed status during model loading
             self.master.after(0, lambda: self.update_progress_status(f"Loading {model_size} model ..."))
             
-            transcriber = Transcriber(model_size=model_size)
+            transcriber = Transcriber(model_size=model_size, calibration=self.calibration)
             self.current_transcriber = transcriber  # Store for SRT creation
             print("Transcriber created successfully")  # Debug log
             
@@ -288,14 +303,56 @@ class WhisperInterface:
                 )
                 btn.pack(side='top', padx=8, pady=2, fill='x', expand=False)
 
-    def load_saved_transcription(self, mp3_path, srt_path):
+    def load_saved_transcription(self, mp3_path, srt_path, start_time=None):
         """Show the modern review UI for the selected saved transcription and audio."""
         def return_to_main():
             # Restore the main Whisper interface
             for widget in self.master.winfo_children():
                 widget.destroy()
             self.setup_ui()
-        SavedTranscriptionReview(self.master, srt_path, mp3_path, back_callback=return_to_main)
+        SavedTranscriptionReview(self.master, srt_path, mp3_path, back_callback=return_to_main,
+                                 start_time=start_time)
+
+    def schedule_search(self, event=None):
+        """Search shortly after the user stops typing"""
+        if self.search_after_id:
+            self.master.after_cancel(self.search_after_id)
+        self.search_after_id = self.master.after(150, self.run_search)
+
+    def run_search(self):
+        """Show cues matching the search box, or the saved transcriptions if it is empty"""
+        self.search_after_id = None
+        if not self.saved_tiles_frame.winfo_exists():
+            return
+        query = self.search_query.get().strip()
+        if not query:
+            self.populate_saved_transcriptions()
+            return
+
+        for widget in self.saved_tiles_frame.winfo_children():
+            widget.destroy()
+
+        hits = [hit for hit in self.search_index.search(query)
+                if os.path.exists(os.path.splitext(hit.srt_path)[0] + '.mp3')]
+        if not hits:
+            Label(self.saved_tiles_frame, text=f"No matches for '{query}'", font=("Segoe UI", 10),
+                  bg=Colors.SURFACE, fg=Colors.DARK_GRAY).pack(side='top', padx=8, pady=4, anchor='w')
+            return
+
+        for hit in hits:
+            title = os.path.splitext(os.path.basename(hit.srt_path))[0]
+            if len(title) > 30:
+                title = title[:27] + '...'
+            mp3_path = os.path.splitext(hit.srt_path)[0] + '.mp3'
+            btn = Button(
+                self.saved_tiles_frame,
+                text=f"{title}  ·  {self.format_duration(hit.start)}\n{hit.snippet}",
+                font=("Segoe UI", 10), bg=Colors.SURFACE, fg=Colors.DARK_GRAY,
+                relief='flat', bd=1, padx=5, pady=4, anchor='w', justify='left', wraplength=400,
+                activebackground=Colors.LIGHT_GRAY,
+                command=lambda m=mp3_path, s=hit.srt_path, t=hit.start: self.load_saved_transcription(m, s, t)
+            )
+            btn.pack(side='top', padx=8, pady=2, fill='x', expand=False)
 
     def update_ui_state(self):
         """Update UI based on current state"""
@@ -452,13 +509,13 @@ class WhisperInterface:
         # Get audio file duration for time estimates
         audio_duration = self.get_audio_duration()
         
-        # Model options: (description, time_factor, model_name)
+        # Model options: (description, model_name); estimates come from the calibration data
         models = [
-            ("Blitz guess", 0.3, "tiny"),
-            ("Hurried estimate", 0.5, "base"),
-            ("Measured notion", 0.8, "small"),
-            ("Careful take", 1.2, "medium"),
-            ("Deliberate precision", 2.0, "large")
+            ("Blitz guess", "tiny"),
+            ("Hurried estimate", "base"),
+            ("Measured notion", "small"),
+            ("Careful take", "medium"),
+            ("Deliberate precision", "large")
         ]
         self.model_frame = Frame(self.content_frame, bg=Colors.SURFACE, relief='raised', bd=1)
         self.model_frame.pack(fill='both', expand=True, pady=(0, 10), padx=10)
@@ -470,11 +527,12 @@ class WhisperInterface:
         model_col = Frame(selection_container, bg=Colors.SURFACE)
         model_col.grid(row=0, column=0, sticky='n', padx=(0, 40))
         Label(model_col, text="Transcription Model", font=("Segoe UI", 12, "bold"), bg=Colors.SURFACE, fg=Colors.DARK_GRAY).pack(pady=(20, 15))
-        for description, time_factor, model_name in models:
-            estimated_time = self.format_estimated_time(audio_duration * time_factor)
+        for description, model_name in models:
+            estimated_time = self.format_estimated_time(self.calibration.estimate_seconds(model_name, audio_duration))
+            measured_mark = "" if self.calibration.is_measured(model_name) else "?"
             radio = Radiobutton(
                 model_col,
-                text=f"{description} (≈{estimated_time})",
+                text=f"{description} (≈{estimated_time}{measured_mark})",
                 variable=self.selected_model,
                 value=model_name,
                 font=("Segoe UI", 11),
@@ -485,6 +543,39 @@ class WhisperInterface:
             )
             radio.pack(anchor='w', pady=2)
 
+        # Auto choice: most accurate model that fits the time budget
+        auto_row = Frame(model_col, bg=Colors.SURFACE)
+        auto_row.pack(anchor='w', pady=2)
+        Radiobutton(
+            auto_row,
+            text="Auto, within",
+            variable=self.selected_model,
+            value="auto",
+            font=("Segoe UI", 11),
+            bg=Colors.SURFACE,
+            fg=Colors.DARK_GRAY,
+            activebackground=Colors.SURFACE,
+            selectcolor=Colors.SURFACE
+        ).pack(side='left')
+        Entry(auto_row, textvariable=self.time_budget_minutes, width=4,
+              font=("Segoe UI", 11)).pack(side='left', padx=(4, 4))
+        Label(auto_row, text="min", font=("Segoe UI", 11),
+              bg=Colors.SURFACE, fg=Colors.DARK_GRAY).pack(side='left')
+
+        # Offer a one-off benchmark while installed models have no measurements
+        if self.audio_file_path and (self.calibrating or self.calibration.uncalibrated_models()):
+            self.calibrate_button = Button(
+                model_col,
+                text="⏱ Calibrating..." if self.calibrating else "⏱ Calibrate on this machine",
+                command=self.start_calibration,
+                font=("Segoe UI", 10),
+                bg=Colors.BUTTON_SECONDARY, fg=Colors.TEXT_LIGHT,
+                activebackground=Colors.BUTTON_SECONDARY,
+                relief='flat', bd=0, pady=3, padx=10,
+                state='disabled' if self.calibrating else 'normal'
+            )
+            self.calibrate_button.pack(anchor='w', pady=(10, 0))
+
         # Language selection column
         lang_col = Frame(selection_container, bg=Colors.SURFACE)
         lang_col.grid(row=0, column=1, sticky='n')
@@ -520,6 +611,15 @@ class WhisperInterface:
             bg=Colors.SURFACE, fg=Colors.DARK_GRAY
         ).pack(pady=(15, 5), anchor='w', padx=16)
 
+        # Search across every cue of every saved transcription
+        search_frame = Frame(self.saved_frame, bg=Colors.SURFACE)
+        search_frame.pack(fill='x', padx=16, pady=(0, 5))
+        Label(search_frame, text="🔎", font=("Segoe UI", 11),
+              bg=Colors.SURFACE, fg=Colors.DARK_GRAY).pack(side='left')
+        search_entry = Entry(search_frame, textvariable=self.search_query, font=("Segoe UI", 11))
+        search_entry.pack(side='left', fill='x', expand=True, padx=(5, 0))
+        search_entry.bind('<KeyRelease>', self.schedule_search)
+
         # Scrollable area for tiles
         canvas = Canvas(self.saved_frame, bg=Colors.SURFACE, highlightthickness=0)
         scrollbar = Scrollbar(self.saved_frame, orient='vertical', command=canvas.yview)
@@ -532,11 +632,43 @@ class WhisperInterface:
         canvas.configure(yscrollcommand=scrollbar.set)
         canvas.pack(side='left', fill='both', expand=True)
         scrollbar.pack(side='right', fill='y')
-        self.populate_saved_transcriptions()
+        self.run_search()
         
         # Set initial state to no file selected
         self.ui_state = "INITIAL"
 
+    def resolve_auto_model(self):
+        """Pick the most accurate model expected to finish within the user's time budget"""
+        try:
+            budget_minutes = float(self.time_budget_minutes.get())
+        except ValueError:
+            budget_minutes = DEFAULT_TRANSCRIBER_TIME_BUDGET_MINUTES
+        return self.calibration.choose_model(self.get_audio_duration(), budget_minutes * 60)
+
+    def start_calibration(self):
+        """Benchmark the installed models on the selected audio in the background"""
+        if self.calibrating or not self.audio_file_path:
+            return
+        self.calibrating = True
+        self.update_ui_state()
+        audio_path = self.audio_file_path
+
+        def calibration_task():
+            try:
+                self.calibration.calibrate(audio_path, self.calibration.uncalibrated_models())
+            except Exception as e:
+                print(f"Calibration error: {e}")
+            finally:
+                self.master.after(0, self.calibration_complete)
+
+        threading.Thread(target=calibration_task, daemon=True).start()
+
+    def calibration_complete(self):
+        """Refresh the time estimates once calibration has finished"""
+        self.calibrating = False
+        if self.ui_state == "FILE_SELECTED":
+            self.update_ui_state()
+
     def get_audio_duration(self):
         """Get duration of the selected audio file in seconds"""
         if not self.audio_file_path or not os.path.exists(self.audio_file_path):
@@ -637,7 +769,7 @@ class WhisperInterface:
 
 class SavedTranscriptionReview:
     """Modern review UI for saved transcriptions using shared components."""
-    def __init__(self, master, srt_path, mp3_path, back_callback=None):
+    def __init__(self, master, srt_path, mp3_path, back_callback=None, start_time=None):
         self.master = master
         self.srt_path = srt_path
         self.mp3_path = mp3_path
@@ -657,6 +789,10 @@ class SavedTranscriptionReview:
             srt_path=self.srt_path,
             back_callback=self.back_callback
         )
+        
+        # Opened from a search hit: jump to the matching cue
+        if start_time is not None:
+            self.review_ui.seek_to(start_time)
 
 def run_whisper_interface():
     root = Tk()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Test script for the asyncio OpenAI client (shared request slots, metrics and retries)
+"""
+
+import asyncio
+
+import httpx
+import openai
+
+from src.shared import openai_client
+from src.shared.openai_client import AsyncOpenAIClient, background_requests, get_async_client, metrics
+
+
+async def run_requests():
+    client = AsyncOpenAIClient(api_key="test-key", max_retries=1)
+    slots = openai_client._request_slots
+    peak = []
+
+    async def fake_call(seconds):
+        peak.append(slots.in_use)
+        await asyncio.sleep(seconds)
+        return seconds
+
+    # Async requests hold the same global slots as sync ones
+    with slots.acquire(False):
+        assert await client.request('test_async', fake_call, seconds=0) == 0
+        assert max(peak) == 2
+
+    # Background requests leave the reserved slots free
+    peak.clear()
+    with background_requests():
+        await asyncio.gather(*(client.request('test_async', fake_call, seconds=0.05)
+                               for _ in range(slots.capacity * 2)))
+    assert max(peak) == slots.background_capacity
+
+    # Transient errors are retried and counted in the shared metrics
+    attempts = []
+
+    async def flaky_call():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise openai.APITimeoutError(request=httpx.Request("POST", "https://api.openai.com"))
+        return "ok"
+
+    assert await client.request('test_async_retry', flaky_call) == "ok"
+    assert get_async_client("test-key") is get_async_client("test-key")
+    await client.http_client.aclose()
+
+
+def test_async_openai_client():
+    metrics.reset()
+    asyncio.run(run_requests())
+    assert openai_client._request_slots.in_use == 0
+    snapshot = metrics.snapshot()
+    print(f"Async metrics: {snapshot}")
+    assert snapshot['test_async']['requests'] == 1 + openai_client._request_slots.capacity * 2
+    assert snapshot['test_async_retry']['retries'] == 1
+    print("✅ Async OpenAI client test passed")
+
+
+if __name__ == "__main__":
+    test_async_openai_client()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Test script for transcriber model calibration (real-time factors and model choice)
+"""
+
+import os
+import tempfile
+
+from src.transcriber_mode.calibration import ModelCalibration, RECENT_RUNS_FOR_ESTIMATE
+
+MODELS = ['tiny', 'base', 'small', 'medium', 'large']
+
+
+def test_calibration():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        calibration_file = os.path.join(tmp_dir, "cache", "calibration.json")
+        calibration = ModelCalibration(calibration_file)
+
+        # Without measurements the static time factors are used
+        assert calibration.real_time_factor('small') == 0.8
+        assert calibration.uncalibrated_models(MODELS) == MODELS
+
+        # A benchmark overrides the static factor, real runs override the benchmark
+        calibration.data['calibration']['small'] = {'rtf': 0.4}
+        assert calibration.real_time_factor('small') == 0.4
+        for elapsed in (30, 60, 1000):
+            calibration.record_run('small', 100, elapsed)
+        assert calibration.real_time_factor('small') == 0.6  # Median, not mean
+        calibration.record_run('small', 0, 10)  # Ignored
+
+        # Only the most recent runs count
+        for _ in range(RECENT_RUNS_FOR_ESTIMATE):
+            calibration.record_run('base', 100, 20)
+        calibration.record_run('base', 100, 400)
+        assert calibration.real_time_factor('base') == 0.2
+
+        # Measurements persist; only models without one are left to calibrate
+        reloaded = ModelCalibration(calibration_file)
+        assert len(reloaded.data['runs']['small']) == 3
+        assert reloaded.uncalibrated_models(MODELS) == ['tiny', 'medium', 'large']
+
+        # The most accurate model within the budget wins, else the fastest one
+        assert reloaded.choose_model(600, 300, candidates=MODELS) == 'base'  # small would take 360s
+        assert reloaded.choose_model(600, 400, candidates=MODELS) == 'small'
+        assert reloaded.choose_model(600, 1200, candidates=MODELS) == 'large'
+        assert reloaded.choose_model(600, 10, candidates=MODELS) == 'base'
+        assert reloaded.choose_model(600, 10, candidates=['small', 'large']) == 'small'
+        try:
+            reloaded.choose_model(600, 300, candidates=['huge'])
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("choosing from no known models should fail")
+    print("✅ Calibration test passed")
+
+
+if __name__ == "__main__":
+    test_calibration()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Test script for corpus term counting (elisions and apostrophe compounds)
+"""
+
+import os
+import tempfile
+
+from src.shared.corpus_mining import CorpusIndex, count_terms
+
+SRT = """1
+00:00:00,000 --> 00:00:03,000
+Aujourd'hui, l'homme qu'on voit parle jusqu'aujourd’hui.
+
+2
+00:00:03,000 --> 00:00:06,000
+Quelqu'un d'autre s'en va aujourd'hui.
+
+"""
+
+
+def test_corpus_mining():
+    with tempfile.TemporaryDirectory() as corpus_dir:
+        srt_path = os.path.join(corpus_dir, "episode.srt")
+        with open(srt_path, 'w', encoding='utf-8') as f:
+            f.write(SRT)
+
+        counts, lowercase_counts = count_terms(srt_path)
+        print(f"Terms: {dict(counts)}")
+        assert counts["aujourd'hui"] == 3
+        assert counts["quelqu'un"] == 1
+        assert counts["homme"] == 1 and counts["autre"] == 1 and counts["on"] == 1
+        # Neither halves of compounds nor elided articles become words
+        for fragment in ("hui", "aujourd", "quelqu", "un", "l", "qu", "d", "s", "jusqu"):
+            assert fragment not in counts, fragment
+        assert lowercase_counts["aujourd'hui"] == 2
+
+        index = CorpusIndex(os.path.join(corpus_dir, "index.sqlite3"), corpus_dir)
+        index.update()
+        candidates = index.mine_candidates("fr", min_count=1, max_zipf=8)
+        assert not any(entry['word'] == "hui" for entry in candidates)
+        index.close()
+    print("✅ Corpus mining test passed")
+
+
+if __name__ == "__main__":
+    test_corpus_mining()
@@ -7,7 +7,9 @@ from src.shared.frequency_analysis import (
     get_word_frequency_category,
     format_frequency_info,
     is_common_word,
-    get_supported_languages
+    get_supported_languages,
+    analyze_words,
+    CATEGORIES
 )
 
 def test_frequency_analysis():
@@ -39,6 +41,16 @@ def test_frequency_analysis():
         print(f"  Formatted: {format_frequency_info(word, lang)}")
         print()
     
+    # Batch analysis must agree with the per-word lookups
+    words = [word for word, lang in test_cases if lang == "fr"] * 3
+    batch = analyze_words(words, "fr")
+    for i, word in enumerate(words):
+        info = get_word_frequency_category(word, "fr")
+        assert CATEGORIES[batch['category'][i]] == info['category']
+        assert batch['rank'][i] == (info['rank'] or 0)
+    print(f"Batch categories: {[CATEGORIES[code] for code in batch['category'][:3]]}")
+    print()
+    
     print("Supported languages:", get_supported_languages()[:10], "...")
 
 if __name__ == "__main__":
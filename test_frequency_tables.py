@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Test script for the precompiled frequency tables (build, binary search lookups, rebuild)
+"""
+
+import os
+import tempfile
+
+from src.shared import frequency_tables
+from src.shared.frequency_tables import FrequencyTable, build_frequency_table, get_frequency_table, table_path
+
+# Buckets of wordfreq's list: bucket i holds the words at zipf 9 - i / 100
+FREQUENCY_LIST = [[], ["le", "de"], [], ["maison"], ["zèbre", "élève"]]
+
+
+def test_frequency_tables():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = build_frequency_table("fr", FREQUENCY_LIST, os.path.join(tmp_dir, "small.bin"))
+        table = FrequencyTable(path, "fr")
+        try:
+            assert len(table) == 5
+            # Words sharing a bucket share a rank; lookups are case-insensitive
+            assert table.lookup("le") == table.lookup("de") == (1, 8.99)
+            assert table.lookup("Maison") == (3, 8.97)
+            assert table.lookup("ÉLÈVE") == table.lookup("zèbre") == (4, 8.96)
+            assert table.lookup("inconnu") == (0, 0.0)
+            assert table.lookup("a") == (0, 0.0)  # Before the first word
+            assert table.lookup("zzz") == (0, 0.0)  # After the last word
+            assert table.lookup("123") is None
+        finally:
+            table.close()
+
+        # A table from another format version is rebuilt on first use
+        table_dir = frequency_tables.FREQUENCY_TABLE_DIR
+        frequency_tables.FREQUENCY_TABLE_DIR = tmp_dir
+        try:
+            stale_path = build_frequency_table("fr", FREQUENCY_LIST)
+            assert stale_path == table_path("fr") == os.path.join(tmp_dir, "fr.bin")
+            with open(stale_path, 'r+b') as f:
+                f.seek(4)
+                f.write((0).to_bytes(4, 'little'))
+            try:
+                FrequencyTable(stale_path, "fr")
+            except ValueError:
+                pass
+            else:
+                raise AssertionError("a table of another version should be rejected")
+
+            frequency_tables._tables.pop("fr", None)
+            rebuilt = get_frequency_table("fr")
+            print(f"Rebuilt table: {len(rebuilt)} words, 'maison' -> {rebuilt.lookup('maison')}")
+            assert len(rebuilt) > 1000
+            assert rebuilt.lookup("de")[0] <= 3
+            rebuilt.close()
+        finally:
+            frequency_tables._tables.pop("fr", None)
+            frequency_tables.FREQUENCY_TABLE_DIR = table_dir
+    print("✅ Frequency tables test passed")
+
+
+if __name__ == "__main__":
+    test_frequency_tables()
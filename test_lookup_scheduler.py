@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Test script for the word lookup scheduler (coalescing and latest-wins delivery)
+"""
+
+import threading
+import time
+
+from src.shared.lookup_scheduler import LookupScheduler
+
+
+def test_lookup_scheduler():
+    calls = []
+    delivered = []
+    done = threading.Event()
+
+    def slow_lookup(word):
+        calls.append(word)
+        time.sleep(0.05)
+        return word.upper()
+
+    def on_done(generation, result, error):
+        delivered.append((generation, result))
+        done.set()
+
+    scheduler = LookupScheduler(slow_lookup, max_in_flight=1)
+    scheduler.submit("maison", on_done, "maison")
+    time.sleep(0.01)  # "maison" is now in flight
+    scheduler.submit("chat", on_done, "chat")  # Superseded before it starts
+    scheduler.submit("chien", on_done, "chien")
+    last = scheduler.submit("chien", on_done, "chien")  # Same as queued request
+
+    assert done.wait(2)
+    time.sleep(0.1)
+    assert calls == ["maison", "chien"]
+    assert delivered == [(last, "CHIEN")]
+    assert scheduler.is_current(last)
+
+    # A repeated click on the word in flight joins the running call
+    done.clear()
+    scheduler.submit("vélo", on_done, "vélo")
+    time.sleep(0.01)
+    last = scheduler.submit("vélo", on_done, "vélo")
+    assert done.wait(2)
+    assert calls.count("vélo") == 1
+    assert delivered[-1] == (last, "VÉLO")
+
+    # Returning to the word in flight drops the lookup queued behind it
+    done.clear()
+    cancelled = scheduler.stats['cancelled']
+    scheduler.submit("pomme", on_done, "pomme")
+    time.sleep(0.01)
+    scheduler.submit("poire", on_done, "poire")
+    last = scheduler.submit("pomme", on_done, "pomme")
+    assert done.wait(2)
+    time.sleep(0.1)
+    assert "poire" not in calls
+    assert scheduler.stats['cancelled'] == cancelled + 1
+    assert delivered[-1] == (last, "POMME")
+    print(f"Scheduler stats: {scheduler.stats}")
+
+
+if __name__ == "__main__":
+    test_lookup_scheduler()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Test script for chunked TTS support: text splitting and gapless MP3 stitching
+"""
+
+import os
+import struct
+import tempfile
+
+from src.gentexter_mode.audio_generator import split_text_for_tts
+from src.gentexter_mode.mp3_tools import audio_frames, parse_frame_header, stitch_mp3
+
+FRAME = b'\xff\xfb\x90\x64' + bytes(413)  # MPEG-1 Layer III, 128 kbps, 44.1 kHz
+
+
+def encoder_output(frames):
+    """MP3 as an encoder writes it: ID3 tag, Info header frame, audio frames."""
+    info = FRAME[:36] + b'Info' + struct.pack('>II', 0x1, frames)
+    return b'ID3\x04\x00\x00\x00\x00\x00\x00' + info + bytes(len(FRAME) - len(info)) + FRAME * frames
+
+
+def test_mp3_stitching():
+    # Splitting: limits respected, paragraphs and sentences kept whole, no text lost
+    paragraph = " ".join(f"Phrase numéro {i} de ce paragraphe." for i in range(40))
+    text = "\n\n".join([paragraph] * 5) + " " + "mot " * 400
+    chunks = split_text_for_tts(text, max_chars=1000)
+    print(f"Split {len(text)} characters into {len(chunks)} chunks")
+    assert all(len(chunk) <= 1000 for chunk in chunks)
+    assert " ".join(" ".join(chunks).split()) == " ".join(text.split())
+    assert all(chunk.endswith(".") for chunk in chunks[:5])
+
+    # Stitching: one Info header for the whole stream, no per-part headers or tags
+    parts = [encoder_output(frames) for frames in (10, 25, 7)]
+    with tempfile.TemporaryDirectory() as out_dir:
+        output_path = os.path.join(out_dir, "joined.mp3")
+        durations = stitch_mp3(parts, output_path)
+        with open(output_path, 'rb') as f:
+            joined = f.read()
+
+    audio, headers = audio_frames(joined)
+    assert audio == FRAME * 42 and len(headers) == 42
+    assert joined.count(b'ID3') == 0 and joined.count(b'Info') == 1
+
+    header = parse_frame_header(joined)
+    tag, flags, frame_count, byte_count = struct.unpack_from('>4sIII', joined, 4 + header.side_info_size)
+    assert (tag, frame_count, byte_count) == (b'Info', 42, len(joined))
+    assert [round(duration, 4) for duration in durations] == [round(n * 1152 / 44100, 4) for n in (10, 25, 7)]
+    print(f"Stitched durations: {[round(d, 2) for d in durations]}")
+
+    # Parts without audio frames are an error, not an empty MP3
+    with tempfile.TemporaryDirectory() as out_dir:
+        output_path = os.path.join(out_dir, "empty.mp3")
+        try:
+            stitch_mp3([b'', b'ID3\x04\x00\x00\x00\x00\x00\x00'], output_path)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("stitching parts without frames should fail")
+        assert not os.path.exists(output_path)
+    print("✅ MP3 stitching test passed")
+
+
+if __name__ == "__main__":
+    test_mp3_stitching()
@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+Test script for choosing the words to pre-translate (deduplication, common-word filter)
+"""
+
+from src.shared.pretranslator import extract_words
+
+TEXT = """Le Parapluie de Claire était ouvert. Le parapluie, toujours le PARAPLUIE !
+Le chat bâillait à la fenêtre ; la fenêtre bâillait aussi. Y a-t-il 3 chats ?"""
+
+
+def test_pretranslator():
+    words = extract_words(TEXT, "fr")
+    print(f"Words to pre-translate: {words}")
+    # Each surface form once, case-folded, spelled as it first appears
+    assert words == ["Parapluie", "Claire", "chat", "bâillait", "fenêtre", "chats"]
+    assert words.count("chat") == 1 and "chats" in words  # Forms are not merged by lemma
+
+    # Common words, one-letter words and numbers are left out
+    assert not {"Le", "le", "de", "était", "ouvert", "toujours", "la", "aussi", "a", "Y", "t", "il", "3"} & set(words)
+    assert extract_words("Le chat et le perroquet.", "fr", min_length=5) == ["perroquet"]
+    assert extract_words("", "fr") == []
+    print("✅ Pre-translator test passed")
+
+
+if __name__ == "__main__":
+    test_pretranslator()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Test script for request slot priorities (background work leaves a slot for interactive lookups)
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.shared.openai_client import RequestSlots, background_requests, with_current_priority, _background
+
+
+def test_request_slots():
+    slots = RequestSlots(capacity=4, interactive_slots=1)
+    in_flight = []
+    peak_background = []
+    lock = threading.Lock()
+
+    def request(background: bool, seconds: float):
+        with slots.acquire(background):
+            with lock:
+                in_flight.append(background)
+                peak_background.append(sum(in_flight))
+            time.sleep(seconds)
+            with lock:
+                in_flight.remove(background)
+
+    # Six background requests never take more than three slots
+    workers = [threading.Thread(target=request, args=(True, 0.2)) for _ in range(6)]
+    for worker in workers:
+        worker.start()
+    time.sleep(0.05)
+
+    # An interactive request gets the reserved slot at once
+    start = time.perf_counter()
+    request(False, 0)
+    waited = time.perf_counter() - start
+    for worker in workers:
+        worker.join()
+    print(f"Interactive wait: {waited * 1000:.0f} ms, background peak: {max(peak_background)}")
+    assert waited < 0.1
+    assert max(peak_background) == 3
+
+    # Pool tasks keep the priority of the thread that submitted them
+    with background_requests():
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            assert pool.submit(with_current_priority(_background.get)).result() is True
+            assert pool.submit(_background.get).result() is False
+    assert _background.get() is False
+    print("✅ Request slots test passed")
+
+
+if __name__ == "__main__":
+    test_request_slots()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Test script for sentence cues built from the durations of stitched TTS chunks
+"""
+
+import os
+import struct
+import tempfile
+
+from src.gentexter_mode.audio_generator import sentence_cues, write_mp3_parts
+
+FRAME = b'\xff\xfb\x90\x64' + bytes(413)  # MPEG-1 Layer III, 128 kbps, 44.1 kHz
+FRAME_SECONDS = 1152 / 44100
+
+CHUNKS = [
+    "Claire se réveilla tôt. Elle prit son manteau !",
+    "« Tu viens ? » demanda Paul.\n\nIls partirent ensemble vers la gare, sans un mot.",
+    "Fin.",
+]
+
+
+def encoder_output(frames):
+    """MP3 as an encoder writes it: Info header frame, then audio frames."""
+    info = FRAME[:36] + b'Info' + struct.pack('>II', 0x1, frames)
+    return info + bytes(len(FRAME) - len(info)) + FRAME * frames
+
+
+def test_sentence_cues():
+    with tempfile.TemporaryDirectory() as out_dir:
+        durations = write_mp3_parts([encoder_output(n) for n in (40, 90, 12)],
+                                    os.path.join(out_dir, "story", "audio.mp3"))
+    assert [round(d, 6) for d in durations] == [round(n * FRAME_SECONDS, 6) for n in (40, 90, 12)]
+
+    cues = sentence_cues(CHUNKS, durations)
+    print(f"Cues: {[(round(cue['start'], 2), round(cue['end'], 2), cue['text']) for cue in cues]}")
+    assert [cue['text'] for cue in cues] == [
+        "Claire se réveilla tôt.", "Elle prit son manteau !", "« Tu viens ? »", "demanda Paul.",
+        "Ils partirent ensemble vers la gare, sans un mot.", "Fin.",
+    ]
+
+    # Cues are contiguous and every chunk's last cue ends where its audio ends
+    assert cues[0]['start'] == 0
+    assert all(previous['end'] == cue['start'] for previous, cue in zip(cues, cues[1:]))
+    chunk_ends = [sum(durations[:i + 1]) for i in range(len(durations))]
+    for cue_index, chunk_end in zip((1, 4, 5), chunk_ends):
+        assert abs(cues[cue_index]['end'] - chunk_end) < 1e-9
+
+    # Within a chunk, time is shared in proportion to sentence length
+    first, second = cues[0], cues[1]
+    ratio = (first['end'] - first['start']) / (second['end'] - second['start'])
+    assert abs(ratio - len(first['text']) / len(second['text'])) < 1e-9
+    print("✅ Sentence cues test passed")
+
+
+if __name__ == "__main__":
+    test_sentence_cues()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test script for the session prefetcher's Git sync (also with prefetching disabled)
+"""
+
+import os
+import tempfile
+from types import SimpleNamespace
+
+from src.gentexter_mode.session_prefetcher import SessionPrefetcher
+
+
+class FakeGitManager:
+    def __init__(self):
+        self.pulls = 0
+
+    def pull_latest(self):
+        self.pulls += 1
+        return True
+
+
+def make_app(tmp_dir):
+    tracking_file = os.path.join(tmp_dir, "tracking.json")
+    with open(tracking_file, 'w', encoding='utf-8') as f:
+        f.write("{}")
+    database_manager = SimpleNamespace(tracking_file_path=tracking_file, word_stats={},
+                                       _refresh_word_stats=lambda: None)
+    # No generators: the prefetcher never generates, it only syncs
+    return SimpleNamespace(git_manager=FakeGitManager(), database_manager=database_manager,
+                           text_generator=None, audio_generator=None, get_vocabulary_count=lambda: 0)
+
+
+def test_session_prefetcher():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_dir = os.path.join(tmp_dir, "sessions")
+
+        # Prefetching disabled and no background thread: every click still pulls
+        app = make_app(tmp_dir)
+        prefetcher = SessionPrefetcher(app, depth=0, cache_dir=cache_dir)
+        assert prefetcher.take(40, 20) is None
+        assert prefetcher.wait_for_sync()
+        assert app.git_manager.pulls == 1
+        assert prefetcher.take(40, 20) is None
+        assert prefetcher.wait_for_sync()
+        assert app.git_manager.pulls == 2
+
+        # With the background thread running at depth 0, it does the pull
+        app = make_app(tmp_dir)
+        prefetcher = SessionPrefetcher(app, depth=0, cache_dir=cache_dir)
+        prefetcher.start()
+        try:
+            assert prefetcher.wait_for_sync(timeout=5)
+            assert app.git_manager.pulls == 1
+            assert prefetcher.take(40, 20) is None
+            assert prefetcher.wait_for_sync(timeout=5)
+            assert app.git_manager.pulls == 2
+        finally:
+            prefetcher.stop()
+
+        # Without Git sync nothing is pulled or waited for
+        app = make_app(tmp_dir)
+        prefetcher = SessionPrefetcher(app, depth=0, cache_dir=cache_dir, sync_git=False)
+        assert prefetcher.take(40, 20) is None
+        assert prefetcher.wait_for_sync()
+        assert app.git_manager.pulls == 0
+    print("✅ Session prefetcher test passed")
+
+
+if __name__ == "__main__":
+    test_session_prefetcher()
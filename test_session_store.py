@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Test script for the session store (one directory per session, manifest index, LRU pruning)
+"""
+
+import os
+import tempfile
+
+from src.gentexter_mode.session_store import SessionStore
+
+WORDS = [("marché", "Markt", ""), ("placard", "Schrank", "pla.kaʁ")]
+
+
+def write_audio(path, size):
+    with open(path, 'wb') as f:
+        f.write(b'\xff' * size)
+    with open(os.path.splitext(path)[0] + '.srt', 'w', encoding='utf-8') as f:
+        f.write("1\n00:00:00,000 --> 00:00:01,000\nClaire se réveilla.\n\n")
+
+
+def test_session_store():
+    with tempfile.TemporaryDirectory() as store_dir:
+        store = SessionStore(store_dir, max_mb=0.25)
+        assert store.last_session_id() is None
+
+        # Audio generated into a reserved session stays in place
+        first = store.reserve()
+        write_audio(store.audio_path(first), 100 * 1024)
+        store.save("Claire se réveilla tôt.", WORDS, store.audio_path(first), "French", first)
+
+        # Audio from elsewhere (e.g., the prefetch buffer) moves in with its cues
+        source = os.path.join(store_dir, "prefetched.mp3")
+        write_audio(source, 100 * 1024)
+        second = store.save("Paul l'attendait au marché.", WORDS, source, "French")['id']
+        assert not os.path.exists(source)
+        assert store.last_session_id() == second
+
+        session = store.load(first)
+        assert session['story'] == "Claire se réveilla tôt."
+        assert session['selected_words'] == WORDS
+        assert session['srt_path'] and os.path.exists(session['audio_path'])
+        assert [entry['id'] for entry in store.recent()] == [first, second]
+
+        # Another instance sees the same sessions through the manifest
+        other = SessionStore(store_dir, max_mb=0.25)
+        assert other.last_session_id() == first
+
+        # Over the limit, the least recently opened session is pruned
+        third_source = os.path.join(store_dir, "third.mp3")
+        write_audio(third_source, 100 * 1024)
+        third = other.save("Ils partirent samedi.", WORDS[:1], third_source, "French")['id']
+        print(f"Sessions: {[entry['id'] for entry in other.recent()]}, {other.stats()}")
+        assert [entry['id'] for entry in other.recent()] == [third, first]
+        assert not os.path.exists(store.directory(second))
+        assert store.last_session_id() == third
+        assert store.load(second) is None
+
+        # A lost manifest is rebuilt from the session directories
+        os.remove(store.manifest_path)
+        rebuilt = SessionStore(store_dir, max_mb=0.25)
+        assert {entry['id'] for entry in rebuilt.recent()} == {first, third}
+        assert rebuilt.load(third)['selected_words'] == WORDS[:1]
+    print("✅ Session store test passed")
+
+
+if __name__ == "__main__":
+    test_session_store()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Test script for the streaming SRT parser and its transcript cache
+"""
+
+import os
+import tempfile
+
+from src.shared.srt_parser import parse_srt_time, iter_srt_segments, load_transcript
+
+SAMPLE_SRT = """1
+00:00:00,000 --> 00:00:02,500
+Bonjour à tous.
+
+2
+00:00:02,500 --> 00:00:05,120
+Aujourd'hui on parle
+de vélo.
+
+3
+00:01:05,000 --> 00:01:07,000
+42
+"""
+
+
+def test_srt_parser():
+    assert parse_srt_time("01:02:03,450") == 3723.45
+    assert parse_srt_time("00:00:01.5") == 1.5
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        srt_path = os.path.join(tmp_dir, "sample.srt")
+        with open(srt_path, "w", encoding="utf-8") as f:
+            f.write(SAMPLE_SRT)
+
+        segments = list(iter_srt_segments(srt_path))
+        assert [seg['idx'] for seg in segments] == [1, 2, 3]
+        assert segments[1]['text'] == "Aujourd'hui on parle de vélo."
+        assert segments[2]['text'] == "42"  # A numeric line inside a cue is text
+
+        cache_dir = os.path.join(tmp_dir, "cache")
+        first = load_transcript(srt_path, cache_dir=cache_dir)
+        assert len(os.listdir(cache_dir)) == 1
+        cached = load_transcript(srt_path, cache_dir=cache_dir)
+        assert cached.segments() == first.segments() == segments
+        print(f"Parsed {len(first)} segments: {first.texts()}")
+
+
+if __name__ == "__main__":
+    test_srt_parser()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test script for the streaming story -> TTS pipeline (sentence chunking and part order)
+"""
+
+import os
+import random
+import tempfile
+import time
+
+from src.gentexter_mode.audio_generator import sentence_cues
+from src.gentexter_mode.mp3_tools import audio_frames
+from src.gentexter_mode.story_pipeline import SentenceChunker, StoryAudioPipeline
+from src.shared.srt_parser import iter_srt_segments, write_srt
+
+STORY = ("Claire se réveilla tôt. « Tu viens ? » demanda Paul. Elle prit son manteau et sortit ! "
+         "Le marché était plein de monde… Ils achetèrent du pain, des fleurs et du fromage. "
+         "Puis ils rentrèrent lentement à la maison.")
+
+
+class FakeTextGenerator:
+    def stream_story(self, vocab_list, language, word_count):
+        for i in range(0, len(STORY), 7):
+            yield STORY[i:i + 7]
+
+
+def fake_frames(text):
+    """Two MPEG-1 Layer III frames whose payload identifies the text."""
+    frame = b'\xff\xfb\x90\x64' + bytes([len(text) % 256]) * 413
+    return frame * 2
+
+
+class FakeAudioGenerator:
+    def synthesize(self, text, voice=None):
+        time.sleep(random.uniform(0, 0.02))  # Parts finish out of order
+        return b'ID3\x04\x00\x00\x00\x00\x00\x00' + fake_frames(text)
+
+
+def test_story_pipeline():
+    chunker = SentenceChunker(first_chunk_chars=30, chunk_chars=60)
+    chunks = []
+    for i in range(0, len(STORY), 5):
+        chunks.extend(chunker.feed(STORY[i:i + 5]))
+    tail = chunker.flush()
+    if tail:
+        chunks.append(tail)
+
+    print(f"Chunks: {chunks}")
+    assert chunks[0] == "Claire se réveilla tôt. « Tu viens ? »"
+    assert " ".join(chunks) == STORY
+    assert all(chunk[-1] in ".!?…»" for chunk in chunks)
+    assert all(len(chunk) >= 60 for chunk in chunks[1:-1])
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        audio_path = os.path.join(out_dir, "story.mp3")
+        pipeline = StoryAudioPipeline(FakeTextGenerator(), FakeAudioGenerator(),
+                                      first_chunk_chars=20, chunk_chars=60)
+        result = pipeline.run([("marché", "Markt", "")], audio_path)
+        with open(audio_path, 'rb') as f:
+            audio, _ = audio_frames(f.read())
+        
+        # Sentence cues cover the audio without gaps and survive an SRT round trip
+        cues = sentence_cues(result.chunks, result.chunk_durations)
+        srt_path = os.path.join(out_dir, "story.srt")
+        write_srt(cues, srt_path)
+        parsed = list(iter_srt_segments(srt_path))
+
+    assert result.story == STORY
+    assert result.audio_error is None and result.audio_path == audio_path
+    assert audio == b"".join(fake_frames(chunk) for chunk in result.chunks)
+    assert len(result.chunk_durations) == len(result.chunks)
+    assert result.first_audio_seconds is not None
+    assert [cue['text'] for cue in cues][:3] == ["Claire se réveilla tôt.", "« Tu viens ? »", "demanda Paul."]
+    assert " ".join(cue['text'] for cue in cues) == STORY
+    assert all(a['end'] == b['start'] for a, b in zip(cues, cues[1:]))
+    assert abs(cues[-1]['end'] - sum(result.chunk_durations)) < 1e-6
+    assert [seg['text'] for seg in parsed] == [cue['text'] for cue in cues]
+    assert all(abs(seg['start'] - cue['start']) < 0.001 for seg, cue in zip(parsed, cues))
+    print("✅ Story pipeline test passed")
+
+
+if __name__ == "__main__":
+    test_story_pipeline()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test script for story repair (targeted rewrites of paragraphs that miss vocabulary words)
+"""
+
+import os
+import re
+import tempfile
+from types import SimpleNamespace
+
+from src.gentexter_mode import orchestrator
+from src.gentexter_mode.orchestrator import VocabularyApp
+from src.gentexter_mode.story_pipeline import SentenceChunker, replace_in_chunks
+from src.gentexter_mode.text_generator import TextGenerator
+from src.shared.translation_cache import TranslationCache
+
+PARAGRAPHS = [
+    "Claire se réveilla avant le lever du soleil. Elle avait rendez-vous au marché avec son vieil ami "
+    "Paul, qui l'attendait près de la fontaine. Ils parlèrent longtemps de la carte qu'il avait trouvée, "
+    "puis ils décidèrent de partir le samedi suivant.",
+    "Pendant toute la semaine, Claire ne pensa qu'à cette carte. Au travail, elle regardait par la "
+    "fenêtre et imaginait la colline, la rivière et la petite croix rouge. Le samedi, elle prit son "
+    "manteau et rejoignit Paul devant la gare.",
+]
+STORY = "\n\n".join(PARAGRAPHS)
+
+
+class FakeClient:
+    def __init__(self):
+        self.prompts = []
+
+    def chat_completion(self, model, messages, max_tokens, temperature):
+        prompt = messages[-1]["content"]
+        self.prompts.append(prompt)
+        words = [word.split(" (")[0] for word in re.search(r"words: (.*)", prompt).group(1).split(", ")]
+        paragraph = prompt.split("\n\n")[1]
+        if prompt.startswith("Here is a paragraph"):
+            # The first paragraph loses "fontaine", so its rewrite must be rejected
+            content = f"{paragraph.replace('la fontaine', 'la gare')} Il ouvrit le {words[0]}."
+        else:
+            content = f"Elle pensa au {words[0]}."
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def test_story_repair():
+    generator = TextGenerator.__new__(TextGenerator)
+    generator.client = FakeClient()
+    vocab = [("fontaine", "Brunnen", ""), ("placard", "Schrank", ""), ("grenier", "Dachboden", "")]
+
+    repair = generator.repair_story(STORY, vocab)
+    print(f"Repaired story: {repair['story']}")
+    assert repair['coverage']['coverage_percentage'] == 100
+    assert repair['requests'] == 3  # Two paragraph rewrites, one insertion
+
+    # The first paragraph is kept, the second one rewritten and then extended
+    repaired = repair['story'].split("\n\n")
+    assert repaired[0] == PARAGRAPHS[0]
+    assert repaired[1] == f"{PARAGRAPHS[1]} Il ouvrit le grenier. Elle pensa au placard."
+    assert [old for old, _ in repair['replacements']] == [PARAGRAPHS[1], f"{PARAGRAPHS[1]} Il ouvrit le grenier."]
+
+    # Only the chunks of the changed paragraph change
+    chunker = SentenceChunker(first_chunk_chars=60, chunk_chars=120)
+    chunks = chunker.feed(STORY) + [chunker.flush()]
+    repaired_chunks = list(chunks)
+    assert all(replace_in_chunks(repaired_chunks, old, new) for old, new in repair['replacements'])
+    print(f"Chunks: {len(chunks)} -> {len(repaired_chunks)}")
+    assert " ".join(repaired_chunks).split() == repair['story'].split()
+    assert repaired_chunks[:-1] == chunks[:-1]
+
+    # Complete stories are left alone
+    assert generator.repair_story(PARAGRAPHS[0], vocab[:1])['requests'] == 0
+
+    # Lemmas are looked up for the session's language, whatever it is
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = TranslationCache(os.path.join(tmp_dir, "cache.sqlite3"))
+        cache.set("analysis", "hablaban", "es", "de", "", {"root_word": "hablar"})
+        cache.set("analysis", "parlaient", "fr", "de", "", {"root_word": "parler"})
+        lemmatizers = []
+        app = VocabularyApp.__new__(VocabularyApp)
+        app.text_generator = SimpleNamespace(
+            repair_story=lambda story, words, language, lemmatize: lemmatizers.append(lemmatize) or
+            {'story': story, 'coverage': None, 'replacements': [], 'requests': 0})
+        get_cache = orchestrator.get_cache
+        orchestrator.get_cache = lambda: cache
+        try:
+            app._repair_story("Hablaban.", [("hablar", "sprechen", "")], "Spanish")
+            app._repair_story("Ils parlaient.", [("parler", "sprechen", "")], "French")
+            assert lemmatizers[0]("hablaban") == "hablar" and lemmatizers[0]("parlaient") == "parlaient"
+            assert lemmatizers[1]("parlaient") == "parler"
+        finally:
+            orchestrator.get_cache = get_cache
+            cache.close()
+    print("✅ Story repair test passed")
+
+
+if __name__ == "__main__":
+    test_story_repair()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Test script for full-text search over transcriptions (FTS5 index, re-indexing, accents)
+"""
+
+import os
+import tempfile
+
+from src.shared import srt_parser
+from src.shared.transcript_search import TranscriptSearchIndex, build_match_query
+
+LESSON = """1
+00:00:01,000 --> 00:00:03,000
+Bonjour à tous.
+
+2
+00:00:03,500 --> 00:00:06,250
+L'élève ouvre son cahier.
+"""
+
+STORY = """1
+00:00:00,000 --> 00:00:02,000
+Il était une fois un roi.
+
+2
+00:01:10,000 --> 00:01:12,000
+Le roi parlait à un élève.
+"""
+
+
+def write(path, text):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def test_transcript_search():
+    assert build_match_query("l'élève, roi") == '"l"* "élève"* "roi"*'
+    assert build_match_query("?!") == ""
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        corpus_dir = os.path.join(tmp_dir, "transcriptions")
+        os.makedirs(corpus_dir)
+        write(os.path.join(corpus_dir, "lesson.srt"), LESSON)
+        write(os.path.join(corpus_dir, "story.srt"), STORY)
+
+        # Keep the parsed transcripts out of the real cache
+        srt_cache_dir = srt_parser.SRT_CACHE_DIR
+        srt_parser.SRT_CACHE_DIR = os.path.join(tmp_dir, "srt_cache")
+        index = TranscriptSearchIndex(os.path.join(tmp_dir, "search.sqlite3"), corpus_dir)
+        try:
+            assert index.update() == {'indexed': 2, 'unchanged': 0, 'removed': 0}
+            assert index.update() == {'indexed': 0, 'unchanged': 2, 'removed': 0}
+
+            # Accent-free queries match, with the cue and start time used for seeking
+            hits = index.search("eleve")
+            print(f"Hits: {[(os.path.basename(hit.srt_path), hit.cue, hit.start) for hit in hits]}")
+            assert {(os.path.basename(hit.srt_path), hit.cue, hit.start) for hit in hits} == {
+                ("lesson.srt", 1, 3.5), ("story.srt", 1, 70.0)}
+            story_hit = index.search("roi ELEVE")
+            assert len(story_hit) == 1 and story_hit[0].snippet == "Le [roi] parlait à un [élève]."
+            assert index.search("ouv")[0].text == "L'élève ouvre son cahier."
+
+            # A changed file is re-indexed, a deleted one removed
+            write(os.path.join(corpus_dir, "lesson.srt"), LESSON.replace("L'élève ouvre", "Le maître ferme"))
+            os.remove(os.path.join(corpus_dir, "story.srt"))
+            assert index.update() == {'indexed': 1, 'unchanged': 0, 'removed': 1}
+            assert index.search("élève") == []
+            assert index.search("maitre")[0].start == 3.5
+        finally:
+            index.close()
+            srt_parser.SRT_CACHE_DIR = srt_cache_dir
+    print("✅ Transcript search test passed")
+
+
+if __name__ == "__main__":
+    test_transcript_search()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Test script for the persistent translation cache (TTL, LRU eviction, shared instances)
+"""
+
+import os
+import tempfile
+import time
+
+from src.shared.translation_cache import TranslationCache, get_cache
+
+
+def test_translation_cache():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "cache.sqlite3")
+        cache = TranslationCache(db_path, max_entries=10, ttl_days=1)
+
+        # Keys ignore case and surrounding space; the context is hashed
+        cache.set("analysis", "Maison", "fr", "de", "", {"root_word": "maison"})
+        assert cache.get("analysis", " maison ", "fr", "de") == {"root_word": "maison"}
+        assert cache.get("analysis", "maison", "fr", "de", "Une grande maison.") is None
+        assert cache.peek("analysis", "maison", "fr", "de") == {"root_word": "maison"}
+        assert (cache.hits, cache.misses) == (1, 1)
+
+        # Expired entries miss and are deleted
+        cache.set("lemma", "parlait", "fr", "", "", {"root_word": "parler"})
+        cache._conn.execute("UPDATE entries SET created = created - 2 * 86400 WHERE kind = 'lemma'")
+        assert cache.peek("lemma", "parlait", "fr") is None
+        assert cache.get("lemma", "parlait", "fr") is None
+        assert cache.misses == 2 and cache.stats()['entries'] == 1
+
+        # Over capacity, the least recently used entries are evicted first
+        for i in range(9):
+            time.sleep(0.002)
+            cache.set("analysis", f"mot{i}", "fr", "de", "", {"i": i})
+        time.sleep(0.002)
+        assert cache.get("analysis", "maison", "fr", "de") is not None  # Oldest, but just used
+        time.sleep(0.002)
+        for i in (9, 10):
+            cache.set("analysis", f"mot{i}", "fr", "de", "", {"i": i})
+        print(f"Cache stats: {cache.stats()}")
+        assert cache.stats()['entries'] == 10
+        assert cache.peek("analysis", "maison", "fr", "de") is not None
+        assert cache.peek("analysis", "mot0", "fr", "de") is None
+        assert cache.peek("analysis", "mot1", "fr", "de") is None
+        assert cache.peek("analysis", "mot10", "fr", "de") == {"i": 10}
+        cache.close()
+
+        # One shared instance per database file
+        other_path = os.path.join(tmp_dir, "other.sqlite3")
+        shared = get_cache(db_path)
+        assert get_cache(os.path.join(tmp_dir, ".", "cache.sqlite3")) is shared
+        assert get_cache(other_path) is not shared
+        assert shared.peek("analysis", "mot10", "fr", "de") == {"i": 10}
+        shared.close()
+        get_cache(other_path).close()
+    print("✅ Translation cache test passed")
+
+
+if __name__ == "__main__":
+    test_translation_cache()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Test script for the content-addressed TTS cache (keys, LRU eviction, index rebuild)
+"""
+
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+
+from src.gentexter_mode.audio_generator import AudioGenerator
+from src.gentexter_mode.tts_cache import TTSCache
+
+CLIP = b'\xff' * 4000
+
+
+class FakeClient:
+    def __init__(self):
+        self.calls = []
+
+    def speech(self, **kwargs):
+        self.calls.append(kwargs)
+        return SimpleNamespace(content=kwargs['input'].encode('utf-8') + CLIP)
+
+
+def test_tts_cache():
+    # Every synthesis parameter is part of the key
+    key = TTSCache.make_key("Bonjour.", "onyx", "tts-1", 1.0)
+    assert key == TTSCache.make_key("Bonjour.", "onyx", "tts-1", 1.001)
+    assert len({key, TTSCache.make_key("Bonjour !", "onyx", "tts-1", 1.0),
+                TTSCache.make_key("Bonjour.", "nova", "tts-1", 1.0),
+                TTSCache.make_key("Bonjour.", "onyx", "tts-1-hd", 1.0),
+                TTSCache.make_key("Bonjour.", "onyx", "tts-1", 1.25)}) == 5
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = TTSCache(cache_dir, max_mb=0.01)  # Room for two clips
+        os.environ.setdefault('OPENAI_API_KEY', 'test-key')
+        generator = AudioGenerator(cache=cache)
+        generator.client = FakeClient()
+
+        # A repeated request is served from the cache
+        first = generator.synthesize("Bonjour.")
+        assert generator.synthesize("Bonjour.") == first
+        assert len(generator.client.calls) == 1
+        time.sleep(0.01)
+        generator.synthesize("Au revoir.")
+        time.sleep(0.01)
+
+        # The least recently used clip is evicted first
+        generator.synthesize("Bonjour.")
+        time.sleep(0.01)
+        generator.synthesize("Merci.")
+        print(f"TTS cache stats: {cache.stats()}")
+        assert len(generator.client.calls) == 3
+        assert cache.stats()['entries'] == 2
+        assert cache.lookup(TTSCache.make_key("Au revoir.", "onyx", "tts-1", 1.0)) is None
+        assert sorted(os.listdir(cache_dir)) == sorted(f"{TTSCache.make_key(text, 'onyx', 'tts-1', 1.0)}.mp3"
+                                                       for text in ("Bonjour.", "Merci."))
+
+        # A new instance rebuilds the index from the files, in LRU order
+        time.sleep(0.01)
+        cache.lookup(key)
+        reopened = TTSCache(cache_dir, max_mb=0.01)
+        assert list(reopened._entries) == [TTSCache.make_key("Merci.", "onyx", "tts-1", 1.0), key]
+        assert reopened.stats()['size_mb'] == cache.stats()['size_mb']
+        reopened.put(TTSCache.make_key("Salut.", "onyx", "tts-1", 1.0), CLIP)
+        assert reopened.lookup(key) is not None
+        assert reopened.lookup(TTSCache.make_key("Merci.", "onyx", "tts-1", 1.0)) is None
+    print("✅ TTS cache test passed")
+
+
+if __name__ == "__main__":
+    test_tts_cache()
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Test script for token-aware vocabulary coverage (inflection, expressions, spans)
+"""
+
+from src.shared.vocab_coverage import check_coverage
+
+STORY = ("C'était un homme normal. Elle s'est vite fâchée, puis elle dédia sa vie à la musique. "
+         "Ils ont fait de leur mieux ! Il se sentait mal à l'aise devant la foule et jeta un coup d'œil "
+         "au placard. Se rend-il compte ?")
+
+
+def test_vocab_coverage():
+    vocab = [(word, "", "") for word in (
+        "mal", "se fâcher", "dédier à", "faire de son mieux", "mal à l'aise", "la foule",
+        "coup d'oeil", "placard", "tache", "sinon",
+    )]
+    result = check_coverage(STORY, vocab)
+    found = [entry[0] for entry in result['found_words']]
+    missing = [entry[0] for entry in result['missing_words']]
+    print(f"Found: {found}")
+    print(f"Missing: {missing}")
+
+    assert missing == ["tache", "sinon"]
+    assert result['coverage_percentage'] == 80
+
+    # Spans point at the matched words only ("normal" does not contain "mal")
+    spans = result['spans']
+    assert [STORY[start:end] for start, end in spans["mal"]] == ["mal"]
+    assert [STORY[start:end] for start, end in spans["se fâcher"]] == ["s", "fâchée"]
+    assert [STORY[start:end] for start, end in spans["dédier à"]] == ["dédia", "à"]
+    assert [STORY[start:end] for start, end in spans["faire de son mieux"]] == ["fait", "de", "leur", "mieux"]
+    assert [STORY[start:end] for start, end in spans["coup d'oeil"]] == ["coup", "d", "œil"]
+
+    # Expressions do not reach across sentences
+    assert not check_coverage("Il se tut. Fâché, il partit.", [("se fâcher", "", "")])['found_words']
+    print("✅ Vocabulary coverage test passed")
+
+
+if __name__ == "__main__":
+    test_vocab_coverage()
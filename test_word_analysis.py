@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Test script for combined word analysis (schema validation, fallback, cache statistics)
+"""
+
+import json
+import os
+import tempfile
+
+from src.shared.gpt_translator import GPTTranslator, validate_analysis
+from src.shared.translation_cache import TranslationCache
+
+ANALYSIS = {
+    "root_word": "parler",
+    "grammatical_relation": "imperfect, 3rd person singular",
+    "part_of_speech": "verb",
+    "primary_translation": "sprechen",
+    "secondary_translation": None,
+}
+
+
+def test_word_analysis():
+    # Missing optional fields become None; anything malformed is rejected
+    assert validate_analysis(dict(ANALYSIS, root_word=" parler "))["root_word"] == "parler"
+    assert validate_analysis(ANALYSIS)["context_translation"] is None
+    assert validate_analysis(["parler"]) is None
+    assert validate_analysis(dict(ANALYSIS, root_word="  ")) is None
+    assert validate_analysis(dict(ANALYSIS, primary_translation=["sprechen"])) is None
+    assert validate_analysis({key: value for key, value in ANALYSIS.items() if key != "part_of_speech"}) is None
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = TranslationCache(os.path.join(tmp_dir, "cache.sqlite3"))
+        translator = GPTTranslator(api_key="test-key", cache=cache)
+        prompts = []
+
+        def fake_gpt(prompt, max_tokens=200, json_mode=False, **kwargs):
+            prompts.append(prompt)
+            if json_mode:
+                return '{"root_word": "parler", "part_of_speech": 3}'  # Fails the schema
+            if '"root_word"' in prompt:
+                return json.dumps({"root_word": "parler", "grammatical_relation": "imperfect",
+                                   "part_of_speech": "verb"})
+            return json.dumps({"primary_translation": "sprechen", "secondary_translation": None,
+                               "context_translation": None})
+
+        translator._call_gpt = fake_gpt
+
+        # An invalid combined response falls back to separate lemma and translation requests
+        analysis = translator.analyze_word_comprehensive("parlait", "fr", "de", "Il parlait vite.")
+        assert len(prompts) == 3
+        assert (analysis.root_word, analysis.primary_translation) == ("parler", "sprechen")
+        assert cache.peek("analysis", "parlait", "fr", "de", "Il parlait vite.") is None
+
+        # A contextual lookup served by the context-free entry counts as one hit
+        cache.set("analysis", "parlait", "fr", "de", "", ANALYSIS)
+        cache.hits = cache.misses = 0
+        assert translator.analyze_word_combined("parlait", "fr", "de", "Elle parlait.")["root_word"] == "parler"
+        assert translator.analyze_word_combined("chantait", "fr", "de", "Elle chantait.") is None
+        print(f"Cache stats: {cache.stats()}")
+        assert (cache.hits, cache.misses) == (1, 1)
+        cache.close()
+    print("✅ Word analysis test passed")
+
+
+if __name__ == "__main__":
+    test_word_analysis()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Test script for the word timing sidecar (Whisper offsets, binary round trip, stale files)
+"""
+
+import os
+import tempfile
+
+from src.shared.word_timings import WordTimings, sidecar_path, write_sidecar
+
+SEGMENTS = [
+    {"text": " Le chat et le chien.", "words": [
+        {"word": " Le", "start": 0.0, "end": 0.2},
+        {"word": " chat", "start": 0.2, "end": 0.6},
+        {"word": " et", "start": 0.6, "end": 0.7},
+        {"word": " le", "start": 0.7, "end": 0.8},
+        {"word": " chien.", "start": 0.8, "end": 1.3},
+    ]},
+    {"text": " Ils jouent\ndehors.", "words": [
+        {"word": " Ils", "start": 2.0, "end": 2.2},
+        {"word": " ", "start": 2.2, "end": 2.2},  # Empty tokens are skipped
+        {"word": " jouent", "start": 2.2, "end": 2.6},
+        {"word": " ailleurs", "start": 2.6, "end": 2.7},  # Not in the text
+        {"word": " dehors.", "start": 2.7, "end": 3.1},
+    ]},
+]
+
+
+def test_word_timings():
+    timings = WordTimings.from_whisper_segments(SEGMENTS)
+    assert len(timings) == 8
+    # Offsets point into the displayed line; the repeated "le" is found after "et"
+    assert timings.word_location(3) == (0, 11, 2)
+    assert timings.word_location(4) == (0, 14, 6)
+    assert timings.word_location(7) == (1, 11, 7)
+    assert timings.word_at(0.65) == 2 and timings.word_at(1.6) == -1 and timings.word_at(2.9) == 7
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        srt_path = os.path.join(tmp_dir, "lesson.srt")
+        assert sidecar_path(srt_path) == os.path.join(tmp_dir, "lesson.words")
+
+        # The binary sidecar loads back identically
+        assert write_sidecar(SEGMENTS, srt_path) == 8
+        loaded = WordTimings.load(sidecar_path(srt_path))
+        for column in ('starts', 'ends', 'segments', 'offsets', 'lengths'):
+            assert getattr(loaded, column) == getattr(timings, column)
+
+        # Truncated or foreign files are rejected
+        with open(sidecar_path(srt_path), 'r+b') as f:
+            f.truncate(40)
+        assert WordTimings.load(sidecar_path(srt_path)) is None
+        assert WordTimings.load(os.path.join(tmp_dir, "missing.words")) is None
+
+        # A transcription without word timings removes the stale sidecar
+        assert write_sidecar([{"text": " Bonjour.", "words": []}], srt_path) == 0
+        assert not os.path.exists(sidecar_path(srt_path))
+    print("✅ Word timings test passed")
+
+
+if __name__ == "__main__":
+    test_word_timings()